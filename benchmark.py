@@ -0,0 +1,288 @@
+"""
+Benchmarks of building and using boards at scale
+
+Runs headless on the offscreen Qt platform and writes the results to a json file,
+by default a new file in the benchmark_results directory. Compare the file of a previous release to catch regressions.
+
+    python benchmark.py
+    python benchmark.py --sizes 10 100 --overlays 0 1000 --output benchmark.json
+    python benchmark.py --compare previous.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+
+# run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+
+
+BOARDS = {
+    "hexagon": QHexagonboard,
+    "rectangle": QRectangleboard,
+}
+
+# keyword arguments of the board per render mode
+MODES = {
+    "items": {},
+    "batched": {"batched": True},
+    "chunked": {"chunked": True},
+}
+
+# per item boards larger than this number of tiles take too long and too much memory to benchmark by default
+MAXIMUM_ITEM_TILES = 300 * 300
+
+# directory of the result files without an --output, kept out of the repository
+RESULTS_DIRECTORY = "benchmark_results"
+
+
+def create_overlays(rows, columns, number_of_positions, seed = 1):
+    """
+    Returns overlays with number_of_positions random positions in total, spread over 4 overlays
+    """
+
+    generator = random.Random(seed)
+    number_of_positions = min(number_of_positions, rows * columns)
+    positions = [[(index // columns) + 1, (index % columns) + 1] for index in generator.sample(range(rows * columns), number_of_positions)]
+
+    styles = [
+        ("block", QtGui.QBrush(QtGui.QColor(0,0,0,255)), ""),
+        ("cover", "", QtGui.QPen(QtGui.QColor(0,0,0), 3, QtCore.Qt.DashLine)),
+        ("ally", QtGui.QBrush(QtGui.QColor(0,255,0,100)), ""),
+        ("enemy", QtGui.QBrush(QtGui.QColor(255,0,0,100)), ""),
+    ]
+
+    overlays = []
+    for number, (name, brush, pen) in enumerate(styles):
+        overlays.append({
+            "Name": name,
+            "Brush": brush,
+            "Pen": pen,
+            "Positions": positions[number::len(styles)],
+        })
+
+    return overlays
+
+
+def measure(function, repeat = 1):
+    """
+    Runs the function repeat times and returns the fastest and the median time in seconds
+    """
+
+    times = []
+    for run in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times), statistics.median(times)
+
+
+def click(board, position):
+    """
+    Sends a left mouse click at the scene position to the board and applies the repaints
+    """
+
+    point = QtCore.QPointF(board.mapFromScene(position))
+    event = QtGui.QMouseEvent(QtCore.QEvent.MouseButtonPress, point, QtCore.Qt.LeftButton, QtCore.Qt.LeftButton, QtCore.Qt.NoModifier)
+    board.mousePressEvent(event)
+    board.flush_repaints()
+
+
+def benchmark_board(board_class, mode, rows, columns, number_of_positions, repeat):
+    """
+    Returns the results of all benchmarks of a board of rows and columns
+    """
+
+    results = []
+
+    def record(name, timing, operations = 1):
+        fastest, median = timing
+        results.append({
+            "benchmark": name,
+            "operations": operations,
+            "seconds": fastest,
+            "median_seconds": median,
+        })
+
+    overlays = create_overlays(rows, columns, number_of_positions)
+    generator = random.Random(2)
+
+    def random_tile():
+        return board.get_tile(generator.randint(1, rows), generator.randint(1, columns))
+
+    # build the board, the constructor builds the scene
+    boards = []
+    record("build_board_scene", measure(lambda: boards.append(board_class(rows, columns, overlays = [], **MODES[mode])), 1))
+    board = boards[-1]
+    board.resize(1024, 768)
+    board.show()
+
+    # compile and paint the overlays
+    board.overlays = overlays
+
+    def build_overlays():
+        board.build_overlays()
+        board.flush_repaints()
+
+    record("build_overlays", measure(build_overlays, repeat))
+
+    # select, target and deselect by mouse clicks
+    board_rect = board.get_area_rect(1, rows, 1, columns)
+    outside = board_rect.topLeft() - QtCore.QPointF(50, 50)
+
+    def click_cycle():
+        click(board, board.get_shape_rect(max(rows // 4, 1), max(columns // 4, 1)).center())
+        click(board, board.get_shape_rect(max(3 * rows // 4, 1), max(3 * columns // 4, 1)).center())
+        click(board, outside)
+
+    record("mouse_press_cycle", measure(click_cycle, repeat), 3)
+
+    # line of sight between far apart tiles
+    origin = board.get_tile(1, 1)
+    target = board.get_tile(rows, columns)
+    record("create_line_of_sight", measure(lambda: board.create_line_of_sight(origin, target), repeat))
+
+    # adjacent tiles of random tiles
+    tiles = [random_tile() for number in range(1000)]
+
+    def adjacent_tiles():
+        for tile in tiles:
+            board.get_adjacent_tiles(tile)
+
+    record("get_adjacent_tiles", measure(adjacent_tiles, repeat), len(tiles))
+
+    # repaint random tiles according to their overlays
+    def rebuild_tiles():
+        board.rebuild_tiles(tiles)
+        board.flush_repaints()
+
+    record("rebuild_tiles", measure(rebuild_tiles, repeat), len(tiles))
+
+    board.close()
+    board.deleteLater()
+    QtWidgets.QApplication.processEvents()
+
+    for result in results:
+        result.update({
+            "board": board_class.__name__,
+            "mode": mode,
+            "rows": rows,
+            "columns": columns,
+            "overlay_positions": min(number_of_positions, rows * columns),
+        })
+
+    return results
+
+
+def run(sizes, overlay_counts, boards, modes, repeat, include_large_item_boards = False):
+
+    results = []
+    for name in boards:
+        for mode in modes:
+            for size in sizes:
+                if mode == "items" and size * size > MAXIMUM_ITEM_TILES and include_large_item_boards == False:
+                    continue
+
+                for number_of_positions in overlay_counts:
+                    if number_of_positions > size * size:
+                        continue
+
+                    print(f"{name} {mode} {size}x{size} with {number_of_positions} overlay positions", file = sys.stderr)
+                    results += benchmark_board(BOARDS[name], mode, size, size, number_of_positions, repeat)
+
+    return results
+
+
+def get_key(result):
+    return (result["board"], result["mode"], result["rows"], result["columns"], result["overlay_positions"], result["benchmark"])
+
+
+def compare(results, previous_results, threshold):
+    """
+    Prints the benchmarks that got slower than threshold times the previous result and returns them
+    """
+
+    previous_by_key = {get_key(result): result for result in previous_results}
+
+    regressions = []
+    for result in results:
+        previous = previous_by_key.get(get_key(result))
+        if previous == None or previous["seconds"] == 0:
+            continue
+
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > threshold:
+            regressions.append(result)
+            print(f"slower {ratio:.2f}x: {' '.join(str(value) for value in get_key(result))}", file = sys.stderr)
+
+    return regressions
+
+
+def get_output_path(output = None):
+    """
+    Returns the path to write the results to, a new file named after the time in the results directory without an output
+    """
+
+    if output != None:
+        return output
+
+    os.makedirs(RESULTS_DIRECTORY, exist_ok = True)
+    return os.path.join(RESULTS_DIRECTORY, time.strftime("benchmark-%Y%m%d-%H%M%S.json"))
+
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Benchmarks of building and using boards at scale")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [10, 100, 300, 1000], help = "rows and columns of the boards")
+    parser.add_argument("--overlays", type = int, nargs = "+", default = [0, 100, 10000, 50000], help = "numbers of overlay positions")
+    parser.add_argument("--boards", nargs = "+", default = list(BOARDS), choices = list(BOARDS))
+    parser.add_argument("--modes", nargs = "+", default = list(MODES), choices = list(MODES))
+    parser.add_argument("--repeat", type = int, default = 3, help = "runs per benchmark, the fastest run is kept")
+    parser.add_argument("--large-item-boards", action = "store_true", help = f"also run per item boards over {MAXIMUM_ITEM_TILES} tiles")
+    parser.add_argument("--output", help = f"json file to write the results to, by default a new file in {RESULTS_DIRECTORY}")
+    parser.add_argument("--compare", help = "json file of a previous run to compare with")
+    parser.add_argument("--threshold", type = float, default = 1.5, help = "ratio to the previous run that counts as a regression")
+    arguments = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance()
+    if app == None:
+        app = QtWidgets.QApplication(sys.argv)
+
+    results = run(arguments.sizes, arguments.overlays, arguments.boards, arguments.modes, arguments.repeat, arguments.large_item_boards)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "qt": QtCore.QT_VERSION_STR,
+        "pyqt": QtCore.PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "qt_platform": app.platformName(),
+        "results": results,
+    }
+
+    output_path = get_output_path(arguments.output)
+    with open(output_path, "w") as output:
+        json.dump(report, output, indent = 2)
+
+    print(f"wrote {len(results)} results to {output_path}", file = sys.stderr)
+
+    if arguments.compare != None:
+        with open(arguments.compare) as previous:
+            regressions = compare(results, json.load(previous)["results"], arguments.threshold)
+
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Compact binary file format for boards and their overlays
+
+A board file holds the dimensions and shape of a board and the overlay layers of every tile
+as one packed array of 64 bit layer masks, the same layout as the masks of core.OverlayIndex.
+Opening a file memory maps the masks, so a large map is used without parsing or building position lists;
+pages of the file are only read when the tiles are. Changes to the masks stay in memory.
+Like core this module does not import Qt, styles are stored as plain data (see QGameboard.get_pen_data).
+
+Layout, little endian
+- magic b"PQGB" and the format version (unsigned short) padded to 8 bytes
+- length of the header (unsigned long long)
+- header as utf-8 json: shape, horizontal, rows, columns and per layer the name, pen and brush
+- padding to a multiple of 8 bytes
+- layer mask of every tile (unsigned long long) in the order of the tile indices
+
+    save_board_file("map.pqgb", grid)
+    board_file = load_board_file("map.pqgb")
+    grid = board_file.create_model()
+"""
+
+import sys
+import json
+import mmap
+import array
+import struct
+
+from pyqtgameboards import core
+
+
+MAGIC = b"PQGB"
+VERSION = 1
+
+# magic, version and padding, then the length of the header
+PREFIX = struct.Struct("<4sH2xQ")
+
+# shape names by board model
+SHAPES = {
+    core.HexagonGrid: "hexagon",
+    core.RectangleGrid: "rectangle",
+    core.BoardModel: "board",
+}
+
+
+class BoardFile(object):
+    """
+    An opened board file, the masks are a memory mapped view of the file
+    """
+
+    def __init__(self, shape, horizontal, rows, columns, names, styles, masks, mapping = None):
+
+        self.shape = shape
+        self.horizontal = horizontal
+        self.rows = rows
+        self.columns = columns
+
+        # name and (pen, brush) style data per layer
+        self.names = names
+        self.styles = styles
+
+        # layer mask per tile
+        self.masks = masks
+        self.mapping = mapping
+
+    def create_model(self, styles = None, default_pen = None, default_brush = None):
+        """
+        Returns the board model of the shape of the file with the overlay index of the file,
+        optionally with other styles per layer like the Qt pens and brushes of the style data
+        """
+
+        if self.shape == "hexagon":
+            model = core.HexagonGrid(self.rows, self.columns, self.horizontal)
+        elif self.shape == "rectangle":
+            model = core.RectangleGrid(self.rows, self.columns)
+        else:
+            model = core.BoardModel(self.rows, self.columns)
+
+        model.set_overlay_masks(self.names, styles if styles != None else self.styles, self.masks, default_pen, default_brush)
+
+        return model
+
+    def close(self):
+        """
+        Releases the memory map, the masks can not be used after closing
+        """
+
+        if self.mapping != None:
+            self.masks.release()
+            self.mapping.close()
+            self.mapping = None
+
+
+def save_board_file(path, model, styles = None):
+    """
+    Saves the board model and its overlay index to a board file,
+    with the (pen, brush) style data per layer or the styles of the overlay index when they are plain data
+    """
+
+    overlay_index = model.overlay_index
+    names = overlay_index.names if overlay_index != None else []
+    styles = styles if styles != None else (overlay_index.styles if overlay_index != None else [])
+
+    header = json.dumps({
+        "shape": SHAPES.get(type(model), "board"),
+        "horizontal": getattr(model, "horizontal", True),
+        "rows": model.rows,
+        "columns": model.columns,
+        "layers": [{"name": name, "pen": pen, "brush": brush} for name, (pen, brush) in zip(names, styles)],
+    }).encode("utf-8")
+
+    padding = -(PREFIX.size + len(header)) % 8
+
+    # the masks are written as they are in memory, swapped to little endian on big endian machines
+    masks = array.array("Q")
+    if overlay_index != None:
+        masks.frombytes(memoryview(overlay_index.masks).cast("B"))
+    else:
+        masks = array.array("Q", [0]) * model.count
+
+    if sys.byteorder == "big":
+        masks.byteswap()
+
+    with open(path, "wb") as output:
+        output.write(PREFIX.pack(MAGIC, VERSION, len(header)))
+        output.write(header)
+        output.write(bytes(padding))
+        masks.tofile(output)
+
+
+def load_board_file(path):
+    """
+    Opens a board file, the layer masks are memory mapped instead of read
+    """
+
+    with open(path, "rb") as board_file:
+        magic, version, header_size = PREFIX.unpack(board_file.read(PREFIX.size))
+
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a board file")
+
+        if version > VERSION:
+            raise ValueError(f"{path} has board file version {version}, only up to {VERSION} is supported")
+
+        header = json.loads(board_file.read(header_size).decode("utf-8"))
+
+        count = header["rows"] * header["columns"]
+        offset = PREFIX.size + header_size
+        offset += -offset % 8
+
+        # copy on write, so changing the overlays of a board does not change the file
+        if count > 0:
+            mapping = mmap.mmap(board_file.fileno(), 0, access = mmap.ACCESS_COPY)
+        else:
+            mapping = None
+
+    if mapping == None:
+        masks = array.array("Q")
+
+    elif sys.byteorder == "big":
+        # the masks need to be swapped, so they are read after all
+        masks = array.array("Q", memoryview(mapping)[offset:offset + count * 8].cast("Q"))
+        masks.byteswap()
+        mapping.close()
+        mapping = None
+
+    else:
+        masks = memoryview(mapping)[offset:offset + count * 8].cast("Q")
+
+    names = [layer["name"] for layer in header["layers"]]
+    styles = [(layer["pen"], layer["brush"]) for layer in header["layers"]]
+
+    return BoardFile(header["shape"], header["horizontal"], header["rows"], header["columns"], names, styles, masks, mapping)
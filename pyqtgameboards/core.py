@@ -0,0 +1,769 @@
+"""
+Qt independent core of a gameboard
+
+The board model, the topology of rectangle and hexagon grids and the overlay index.
+This module does not import Qt, so board queries can run in servers and worker processes
+without a QApplication or a scene. The Qt boards in gameboard are views over these models.
+
+    grid = HexagonGrid(rows = 20, columns = 10)
+    grid.build_overlays(overlays)
+    grid.get_adjacent([4, 4])
+    grid.get_line_of_sight([4, 4], [12, 7])
+"""
+
+import array
+
+
+# per tile state flags
+SELECTED = 1
+ADJACENT = 2
+TARGET = 4
+SIGHT = 8
+REACHABLE = 16
+VISIBLE = 32
+
+
+def get_span_indices(spans):
+    """
+    Returns the tile indices of a list of (start, stop, step) ranges of indices,
+    the compact form in which regions of a board are returned
+    """
+
+    indices = []
+    for start, stop, step in spans:
+        indices.extend(range(start, stop, step))
+
+    return indices
+
+
+class BoardModel(object):
+    """
+    Compact model of the tiles of a board of rows and columns.
+
+    Tiles are identified by an integer index, rows and columns start at 1
+    index = (row - 1) * columns + (column - 1)
+    so looking up the coordinates of a tile or the tile at coordinates is constant time.
+
+    Memory per tile
+    - coordinates: nothing, they are computed from the index
+    - state flags: 1 byte
+    - graphics item (per item boards only): 8 bytes for the item list
+      and about 70 bytes for the item to index lookup, next to the graphics item itself
+    A batched 1000 x 1000 board needs about 1 MB, a per item board of the same size about 78 MB
+    before counting the graphics items.
+    """
+
+    __slots__ = ("rows", "columns", "count", "state", "items", "index_by_item", "overlay_index")
+
+    def __init__(self, rows, columns):
+
+        self.rows = rows
+        self.columns = columns
+        self.count = rows * columns
+
+        # per tile state flags (SELECTED, ADJACENT, TARGET, SIGHT, REACHABLE, VISIBLE)
+        self.state = bytearray(self.count)
+
+        # graphics items are only stored by boards that create an item per tile
+        self.items = None
+        self.index_by_item = None
+
+        # overlays per tile, see build_overlays
+        self.overlay_index = None
+
+    def get_index(self, row, column):
+        """
+        Returns the index of the tile at row and column or None if it is outside of the board
+        """
+
+        if row < 1 or column < 1 or row > self.rows or column > self.columns:
+            return None
+
+        return (row - 1) * self.columns + column - 1
+
+    def get_coordinates(self, index):
+
+        row, column = divmod(index, self.columns)
+        return [row + 1, column + 1]
+
+    def get_indices(self, positions):
+        """
+        Returns the indices of a list of [row, column] positions
+        """
+
+        return [self.get_index(coordinates[0], coordinates[1]) for coordinates in positions]
+
+    def get_spans(self, first_row, last_row, first_column, last_column):
+        """
+        Returns the tiles from the first to the last row and column as (start, stop, step) ranges of indices,
+        one per row, see get_span_indices
+        """
+
+        first_row, last_row = max(first_row, 1), min(last_row, self.rows)
+        first_column, last_column = max(first_column, 1), min(last_column, self.columns)
+
+        if first_column > last_column:
+            return []
+
+        return [((row - 1) * self.columns + first_column - 1, (row - 1) * self.columns + last_column, 1) for row in range(first_row, last_row + 1)]
+
+    def set_item(self, index, item):
+
+        if self.items == None:
+            self.items = [None] * self.count
+            self.index_by_item = {}
+
+        self.items[index] = item
+        self.index_by_item[item] = index
+
+    def get_item(self, index):
+
+        if self.items == None or index == None:
+            return None
+
+        return self.items[index]
+
+    def get_item_index(self, item):
+        return self.index_by_item.get(item) if self.index_by_item != None else None
+
+    def set_state(self, indices, flag, enabled = True):
+
+        for index in indices:
+            if enabled == True:
+                self.state[index] |= flag
+            else:
+                self.state[index] &= ~flag
+
+    def has_state(self, index, flag):
+        return self.state[index] & flag != 0
+
+    def get_indices_with_state(self, flag):
+        return [index for index, state in enumerate(self.state) if state & flag]
+
+    def build_overlays(self, overlays, default_pen = None, default_brush = None):
+        """
+        Compiles a list of overlay dictionaries into the overlay index of this board.
+
+        Per overlay
+        - the name of the overlay (Name), overlays without a name are named by their number
+        - the fill / brush of the tile type (Brush),
+        - the pen / line details of the tile type (Pen) and
+        - a list of all the positions of the tile type (Positions)
+        Brushes and pens are only stored, so any style object or "" for none will do.
+        """
+
+        self.overlay_index = self.create_overlay_index(overlays, default_pen, default_brush)
+
+        return self.overlay_index
+
+    def create_overlay_index(self, overlays, default_pen = None, default_brush = None):
+        """
+        Returns a new overlay index of a list of overlay dictionaries like build_overlays,
+        without making it the overlay index of this board. The board is only read,
+        so the index can be built in another thread while the board is in use.
+        """
+
+        overlay_index = OverlayIndex(self.count, default_pen, default_brush)
+
+        for number, overlay in enumerate(overlays):
+            self.add_overlay(overlay, number, overlay_index)
+
+        return overlay_index
+
+    def set_overlay_masks(self, names, styles, masks, default_pen = None, default_brush = None):
+        """
+        Sets the overlay index of this board from the layer bitmask of every tile,
+        like the masks of a board file, with a name and (pen, brush) style per layer.
+        The masks are used as they are, the positions of a layer are only collected when asked for.
+        """
+
+        self.overlay_index = self.create_masked_overlay_index(names, styles, masks, default_pen, default_brush)
+
+        return self.overlay_index
+
+    def create_masked_overlay_index(self, names, styles, masks, default_pen = None, default_brush = None):
+        """
+        Returns a new overlay index of layer bitmasks like set_overlay_masks, without making it the overlay index of this board
+        """
+
+        overlay_index = OverlayIndex(self.count, default_pen, default_brush, masks)
+
+        for name, (pen, brush) in zip(names, styles):
+            layer = overlay_index.add_layer(name, pen, brush)
+            overlay_index.positions[layer] = None
+
+        return overlay_index
+
+    def add_overlay(self, overlay, number = None, overlay_index = None):
+
+        overlay_index = self.overlay_index if overlay_index == None else overlay_index
+        name = overlay.get("Name", number)
+
+        # Get brush
+        brush = overlay.get("Brush", "")
+        if brush == "":
+            brush = None
+
+        # Get pen
+        pen = overlay.get("Pen", "")
+        if pen == "":
+            pen = None
+
+        overlay_index.add_layer(name, pen, brush)
+        overlay_index.add_positions(name, self.get_indices(overlay["Positions"]))
+
+    def get_adjacent(self, coordinates):
+        """
+        Needs overwrite to return the coordinates of the tiles adjacent to the coordinates
+        """
+
+        return NotImplemented
+
+    def get_grid_line(self, origin, target):
+        """
+        Needs overwrite to return the coordinates of the tiles on a line between
+        the origin and target coordinates, in order from the origin
+        """
+
+        return NotImplemented
+
+    def get_line_of_sight(self, origin, target, blocking = ("block",)):
+        """
+        Returns the coordinates of the tiles a line from the origin to the target coordinates touches,
+        in order from the origin. The line stops at the first tile of an overlay named in blocking.
+        """
+
+        line = self.get_grid_line(origin, target)
+        if line == NotImplemented:
+            return NotImplemented
+
+        blocking_mask = self.overlay_index.get_layer_mask(blocking) if self.overlay_index != None else 0
+
+        # the origin may be given as a tuple, the line is made of lists
+        origin_index = self.get_index(origin[0], origin[1])
+
+        line_of_sight = []
+        for coordinates in line:
+            index = self.get_index(coordinates[0], coordinates[1])
+
+            # lines along the ragged edge of a board can pass outside of it
+            if index == None:
+                continue
+
+            line_of_sight.append(coordinates)
+
+            if index != origin_index and self.overlay_index != None and self.overlay_index.masks[index] & blocking_mask:
+                break
+
+        return line_of_sight
+
+    def get_adjacent_indices(self, index):
+        """
+        Returns the indices of the tiles adjacent to the tile at the index
+        """
+
+        return [(row - 1) * self.columns + column - 1 for row, column in self.get_adjacent(self.get_coordinates(index))]
+
+    def get_distance(self, origin, target):
+        """
+        Needs overwrite to return the number of steps between two tiles
+        """
+
+        return NotImplemented
+
+    def get_adjacent_from_offsets(self, coordinates, offsets):
+
+        adjacent = []
+        for offset in offsets:
+            row = coordinates[0] + offset[0]
+            column = coordinates[1] + offset[1]
+
+            if row >= 1 and column >= 1 and row <= self.rows and column <= self.columns:
+                adjacent.append([row, column])
+
+        return adjacent
+
+
+class RectangleGrid(BoardModel):
+    """
+    Board model of a grid of rectangles, tiles share a side with 4 adjacent tiles
+    """
+
+    __slots__ = ()
+
+    # adjacent coordinates
+    adjacent_offset = [
+        [1,0], # top
+        [0,-1], # left
+        [-1,0], # down
+        [0,1], # right
+    ]
+
+    def get_adjacent(self, coordinates):
+        return self.get_adjacent_from_offsets(coordinates, self.adjacent_offset)
+
+    def get_distance(self, origin, target):
+        """
+        Returns the number of steps between two tiles
+        """
+
+        return abs(target[0] - origin[0]) + abs(target[1] - origin[1])
+
+    def get_grid_line(self, origin, target):
+        """
+        Returns the coordinates of every rectangle a line between the centers of the origin
+        and target tile touches (supercover line), in order from the origin.
+        Where the line passes exactly through a corner both rectangles beside the corner are included.
+        """
+
+        row, column = origin
+        row_distance = abs(target[0] - row)
+        column_distance = abs(target[1] - column)
+        row_step = 1 if target[0] > row else -1
+        column_step = 1 if target[1] > column else -1
+
+        line = [[row, column]]
+        row_count = 0
+        column_count = 0
+        while row_count < row_distance or column_count < column_distance:
+
+            # compare where the line crosses the next row and the next column border
+            decision = (1 + 2 * column_count) * row_distance - (1 + 2 * row_count) * column_distance
+
+            if decision == 0:
+                # through the corner
+                line.append([row + row_step, column])
+                line.append([row, column + column_step])
+                row += row_step
+                column += column_step
+                row_count += 1
+                column_count += 1
+
+            elif decision < 0:
+                column += column_step
+                column_count += 1
+
+            else:
+                row += row_step
+                row_count += 1
+
+            line.append([row, column])
+
+        return line
+
+
+class HexagonGrid(BoardModel):
+    """
+    Board model of a grid of hexagons, tiles share a side with 6 adjacent tiles.
+
+    On a horizontal board every other row is offset by half a hexagon, so tiles in the same row
+    are not adjacent and 4 columns look like 8. A vertical board is the same board turned a quarter.
+    For calculations the grid is converted to cube coordinates (q, r, s) with q + r + s = 0,
+    in which the hexagons form a regular grid.
+    """
+
+    __slots__ = ("horizontal",)
+
+    def __init__(self, rows, columns, horizontal = True):
+        super().__init__(rows, columns)
+
+        self.horizontal = horizontal
+
+    def get_adjacent(self, coordinates):
+
+        # adjacent coordinates
+        if self.horizontal == True:
+            if coordinates[0] % 2 == 0:
+                adjacent_offset = [
+                    [-2,0], # top
+                    [-1,-1], # topleft
+                    [1,-1], # leftdown
+                    [2,0], # down
+                    [1,0], # rightdown
+                    [-1,0], # rightup
+                ]
+            else:
+                adjacent_offset = [
+                    [-2,0], # top
+                    [-1,0], # topleft
+                    [1,0], # leftdown
+                    [2,0], # down
+                    [1,1], # rightdown
+                    [-1,1], # rightup
+                ]
+
+        # a vertical board is turned a quarter, so rows and columns swap roles
+        else:
+            if coordinates[1] % 2 == 0:
+                adjacent_offset = [
+                    [0,-2], # left
+                    [-1,-1], # lefttop
+                    [-1,1], # righttop
+                    [0,2], # right
+                    [0,1], # rightdown
+                    [0,-1], # leftdown
+                ]
+            else:
+                adjacent_offset = [
+                    [0,-2], # left
+                    [0,-1], # lefttop
+                    [0,1], # righttop
+                    [0,2], # right
+                    [1,1], # rightdown
+                    [1,-1], # leftdown
+                ]
+
+        return self.get_adjacent_from_offsets(coordinates, adjacent_offset)
+
+    def get_distance(self, origin, target):
+        """
+        Returns the number of steps between two tiles
+        """
+
+        origin_q, origin_r, origin_s = self.get_cube_coordinates(origin[0], origin[1])
+        target_q, target_r, target_s = self.get_cube_coordinates(target[0], target[1])
+
+        return max(abs(target_q - origin_q), abs(target_r - origin_r), abs(target_s - origin_s))
+
+    def get_cube_coordinates(self, row, column):
+        """
+        Returns the cube coordinates (q, r, s) of the tile at row and column
+        """
+
+        if self.horizontal == True:
+            q = 2 * column + (row % 2)
+            r = (row - q) // 2
+        else:
+            q = 2 * row + (column % 2)
+            r = (column - q) // 2
+
+        return q, r, -q - r
+
+    def get_grid_coordinates(self, q, r):
+        """
+        Returns the row and column of the tile at the cube coordinates q and r
+        """
+
+        if self.horizontal == True:
+            row = 2 * r + q
+            column = (q - (row % 2)) // 2
+        else:
+            column = 2 * r + q
+            row = (q - (column % 2)) // 2
+
+        return [row, column]
+
+    def round_cube(self, q, r, s):
+        """
+        Rounds fractional cube coordinates to the cube coordinates of the nearest hexagon
+        """
+
+        rounded_q = round(q)
+        rounded_r = round(r)
+        rounded_s = round(s)
+
+        # reset the component with the largest rounding error so q + r + s stays 0
+        q_difference = abs(rounded_q - q)
+        r_difference = abs(rounded_r - r)
+        s_difference = abs(rounded_s - s)
+
+        if q_difference > r_difference and q_difference > s_difference:
+            rounded_q = -rounded_r - rounded_s
+        elif r_difference > s_difference:
+            rounded_r = -rounded_q - rounded_s
+        else:
+            rounded_s = -rounded_q - rounded_r
+
+        return rounded_q, rounded_r, rounded_s
+
+    def get_grid_line(self, origin, target):
+        """
+        Returns the coordinates of the hexagons on a line between the origin and target tile,
+        in order from the origin, by interpolating their cube coordinates
+        """
+
+        origin_q, origin_r, origin_s = self.get_cube_coordinates(origin[0], origin[1])
+        target_q, target_r, target_s = self.get_cube_coordinates(target[0], target[1])
+
+        distance = max(abs(target_q - origin_q), abs(target_r - origin_r), abs(target_s - origin_s))
+
+        line = [[origin[0], origin[1]]]
+        for step in range(1, distance + 1):
+            fraction = step / distance
+
+            # nudge the line so it never runs exactly along the edge between two hexagons
+            q = origin_q + (target_q - origin_q) * fraction + 1e-6
+            r = origin_r + (target_r - origin_r) * fraction + 1e-6
+            s = origin_s + (target_s - origin_s) * fraction - 2e-6
+
+            q, r, s = self.round_cube(q, r, s)
+            line.append(self.get_grid_coordinates(q, r))
+
+        return line
+
+
+class OverlayIndex(object):
+    """
+    Index of the overlays that apply to every tile of a board.
+
+    Every overlay is a layer with its own bit, the layers of a tile are kept as a bitmask
+    so checking if a tile is in an overlay is a single bit test.
+    The resulting pen and brush of a combination of layers is resolved once and cached,
+    later layers paint over earlier ones like they were applied in order.
+
+    Memory per tile is 8 bytes for the bitmask, which allows up to 64 layers,
+    plus a set entry per position of an overlay.
+    The bitmasks can also be given, for example memory mapped from a board file,
+    the positions of those layers are then collected from the bitmasks on first use.
+    """
+
+    __slots__ = ("count", "default_style", "names", "layer_by_name", "styles", "positions", "versions", "masks", "style_by_mask", "history")
+
+    def __init__(self, count, default_pen, default_brush, masks = None):
+
+        self.count = count
+        self.default_style = (default_pen, default_brush)
+
+        # per layer
+        self.names = []
+        self.layer_by_name = {}
+        self.styles = []
+        self.positions = []
+
+        # raised on every change of a layer, so caches know when a layer changed
+        self.versions = []
+
+        # per tile
+        self.masks = masks if masks != None else array.array("Q", [0]) * count
+
+        # pen and brush per combination of layers
+        self.style_by_mask = {0: self.default_style}
+
+        # records the masks of tiles before they change, see history.EditHistory
+        self.history = None
+
+    def add_layer(self, name, pen = None, brush = None):
+
+        if name in self.layer_by_name:
+            raise ValueError(f"overlay {name} already exists")
+
+        if len(self.names) == 64:
+            raise ValueError("an overlay index holds up to 64 overlays")
+
+        self.layer_by_name[name] = len(self.names)
+        self.names.append(name)
+        self.styles.append((pen, brush))
+        self.positions.append(set())
+        self.versions.append(0)
+
+        return self.layer_by_name[name]
+
+    def get_layer_mask(self, names):
+        """
+        Returns the bitmask of the layers with the given names, unknown names are ignored
+        """
+
+        mask = 0
+        for name in names:
+            if name in self.layer_by_name:
+                mask |= 1 << self.layer_by_name[name]
+
+        return mask
+
+    def add_positions(self, name, indices):
+        """
+        Adds tiles to a layer and returns the indices of the tiles that were not in it yet
+        """
+
+        layer = self.layer_by_name[name]
+        bit = 1 << layer
+        positions = self.positions[layer]
+
+        history = self.history
+
+        changed = []
+        for index in indices:
+            if self.masks[index] & bit == 0:
+                if history != None:
+                    history.record(index, self.masks[index])
+
+                self.masks[index] |= bit
+                changed.append(index)
+
+                if positions != None:
+                    positions.add(index)
+
+        if len(changed) > 0:
+            self.versions[layer] += 1
+
+        return changed
+
+    def remove_positions(self, name, indices):
+        """
+        Removes tiles from a layer and returns the indices of the tiles that were in it
+        """
+
+        layer = self.layer_by_name[name]
+        bit = 1 << layer
+        positions = self.positions[layer]
+
+        history = self.history
+
+        changed = []
+        for index in indices:
+            if self.masks[index] & bit != 0:
+                if history != None:
+                    history.record(index, self.masks[index])
+
+                self.masks[index] &= ~bit
+                changed.append(index)
+
+                if positions != None:
+                    positions.discard(index)
+
+        if len(changed) > 0:
+            self.versions[layer] += 1
+
+        return changed
+
+    def apply_deltas(self, deltas):
+        """
+        Applies a batch of (name, index, entered) deltas, a tile enters the layer when entered is True
+        and leaves it otherwise. Only the last delta of a tile and layer in the batch counts and
+        layers that do not exist yet are added without a style.
+        Returns the set of indices of the tiles that changed and the set of names of the layers that changed.
+        """
+
+        # the last delta per layer and tile
+        final = {}
+        for name, index, entered in deltas:
+            final[(name, index)] = entered
+
+        entering = {}
+        leaving = {}
+        for (name, index), entered in final.items():
+            if entered == True:
+                entering.setdefault(name, []).append(index)
+            else:
+                leaving.setdefault(name, []).append(index)
+
+        changed = set()
+        changed_names = set()
+        for name in set(entering) | set(leaving):
+            if name not in self.layer_by_name:
+                self.add_layer(name)
+
+            changed_indices = self.add_positions(name, entering.get(name, [])) + self.remove_positions(name, leaving.get(name, []))
+            if len(changed_indices) > 0:
+                changed.update(changed_indices)
+                changed_names.add(name)
+
+        return changed, changed_names
+
+    def set_masks(self, indices, masks):
+        """
+        Sets the layer masks of tiles at once, like undo and redo do, and returns the bitmask of the layers that changed
+        """
+
+        changed_mask = 0
+        for index, mask in zip(indices, masks):
+            difference = self.masks[index] ^ mask
+            if difference == 0:
+                continue
+
+            self.masks[index] = mask
+            changed_mask |= difference
+
+            for layer, positions in enumerate(self.positions):
+                if positions != None and difference & (1 << layer):
+                    if mask & (1 << layer):
+                        positions.add(index)
+                    else:
+                        positions.discard(index)
+
+        for layer in range(len(self.names)):
+            if changed_mask & (1 << layer):
+                self.versions[layer] += 1
+
+        return changed_mask
+
+    def get_versions(self, names):
+        """
+        Returns the versions of the layers with the given names, which change when one of them changes
+        """
+
+        return tuple(self.versions[self.layer_by_name[name]] for name in names if name in self.layer_by_name)
+
+    def get_indices(self, names):
+        """
+        Returns the set of indices of the tiles in any of the layers with the given names
+        """
+
+        indices = set()
+        for name in names:
+            if name in self.layer_by_name:
+                indices |= self.get_positions(self.layer_by_name[name])
+
+        return indices
+
+    def get_positions(self, layer):
+        """
+        Returns the set of indices of the tiles in a layer
+        """
+
+        # layers given as bitmasks are collected on first use
+        if self.positions[layer] == None:
+            self.positions[layer] = set(self.get_masked_indices(1 << layer))
+
+        return self.positions[layer]
+
+    def get_masked_indices(self, mask = None):
+        """
+        Returns the indices of the tiles in any of the layers of the mask, by default in any layer, in order.
+        Blocks of tiles without layers are compared at once and skipped, so sparse overlays are found quickly.
+        """
+
+        mask = (1 << 64) - 1 if mask == None else mask
+        masks = self.masks
+
+        block = 4096
+        empty = bytes(block * 8)
+        raw = memoryview(masks).cast("B")
+
+        indices = []
+        for start in range(0, self.count, block):
+            end = min(start + block, self.count)
+
+            if raw[start * 8:end * 8] == empty[:(end - start) * 8]:
+                continue
+
+            for index in range(start, end):
+                if masks[index] & mask != 0:
+                    indices.append(index)
+
+        return indices
+
+    def get_style(self, index):
+        """
+        Returns the resolved pen and brush of a tile
+        """
+
+        mask = self.masks[index]
+
+        style = self.style_by_mask.get(mask)
+        if style == None:
+            style = self.resolve_style(mask)
+            self.style_by_mask[mask] = style
+
+        return style
+
+    def resolve_style(self, mask):
+
+        pen, brush = self.default_style
+
+        for layer, (layer_pen, layer_brush) in enumerate(self.styles):
+            if mask & (1 << layer):
+                pen = layer_pen if layer_pen != None else pen
+                brush = layer_brush if layer_brush != None else brush
+
+        return pen, brush
@@ -0,0 +1,256 @@
+"""
+Export of boards to images without showing them
+
+The scene of a board is rendered straight into a PNG or SVG file, no window or display is needed
+(set QT_QPA_PLATFORM=offscreen on a machine without one). Large images are rendered in strips of rows
+that are compressed into the PNG file one after the other, so an image of any height only needs
+the memory of one strip. On a chunked board only the chunks of the strip being rendered are created.
+Layers on the scene of the board, like units, fog of war and heatmaps, are exported with it.
+
+export_board_files renders many board files at once, each in a worker process that opens one board at a time.
+
+    board.export_png("map.png", scale = 4)
+    board.export_png("thumbnail.png", image_size = 256)
+    board.export_svg("map.svg")
+    export_board_files(paths, "thumbnails", image_size = 256, processes = 4)
+"""
+
+import os
+import math
+import zlib
+import struct
+import multiprocessing
+
+from PyQt5 import QtCore, QtGui, QtWidgets, QtSvg
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def get_export_rect(board, rect = None):
+
+    """
+    Returns the scene rect of the board to export, the whole board with room for the pen of the tiles by default
+    """
+
+    if rect != None:
+        return QtCore.QRectF(rect)
+
+    return board.get_area_rect(1, board.rows, 1, board.columns).adjusted(-1, -1, 1, 1)
+
+def get_export_scale(rect, scale = 1.0, image_size = None):
+
+    """
+    Returns the scale of scene units to pixels, image_size sets the longest side of the image instead
+    """
+
+    if image_size != None:
+        return image_size / max(rect.width(), rect.height(), 1)
+
+    return scale
+
+def get_strips(board, rect, scale, strip_height):
+
+    """
+    Yields the top, the height and the scene rect of the strips of at most strip_height pixels of the scene rect of the board.
+    On a chunked board the chunks of every strip are created before it is rendered,
+    when all strips are done the chunks of the views of the board are restored.
+    """
+
+    height = max(math.ceil(rect.height() * scale), 1)
+
+    try:
+        for top in range(0, height, strip_height):
+            pixels = min(strip_height, height - top)
+            strip_rect = QtCore.QRectF(rect.left(), rect.top() + top / scale, rect.width(), pixels / scale)
+
+            if board.chunked == True and board.board_item != None:
+                board.board_item.update_chunks([strip_rect], 0)
+
+            yield top, pixels, strip_rect
+
+    finally:
+        board.update_chunks()
+
+def render_image(board, rect, width, height, background = None):
+
+    """
+    Returns an image of width x height pixels of the scene rect of the board
+    """
+
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(background if background != None else QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    board.scene.render(painter, QtCore.QRectF(0, 0, width, height), rect, QtCore.Qt.IgnoreAspectRatio)
+    painter.end()
+
+    return image
+
+def export_png(board, path, scale = 1.0, image_size = None, rect = None, background = None, strip_pixels = 1 << 24):
+
+    """
+    Writes the board (or a scene rect of it) to a PNG file at scale pixels per scene unit, or with image_size
+    pixels on its longest side, on a transparent or background color. Images of more than strip_pixels pixels
+    are rendered and written in strips of rows. Returns the size of the image.
+    """
+
+    rect = get_export_rect(board, rect)
+    scale = get_export_scale(rect, scale, image_size)
+
+    width = max(math.ceil(rect.width() * scale), 1)
+    height = max(math.ceil(rect.height() * scale), 1)
+    strip_height = max(strip_pixels // width, 1)
+
+    # an image of one strip is saved by Qt
+    if height <= strip_height:
+        for top, pixels, strip_rect in get_strips(board, rect, scale, strip_height):
+            if not render_image(board, strip_rect, width, pixels, background).save(path, "PNG"):
+                raise OSError(f"could not write {path}")
+
+        return QtCore.QSize(width, height)
+
+    with open(path, "wb") as file:
+        write_png_header(file, width, height)
+        compressor = zlib.compressobj(6)
+
+        for top, pixels, strip_rect in get_strips(board, rect, scale, strip_height):
+            image = render_image(board, strip_rect, width, pixels, background)
+            write_png_chunk(file, b"IDAT", compressor.compress(get_png_lines(image)))
+
+        write_png_chunk(file, b"IDAT", compressor.flush())
+        write_png_chunk(file, b"IEND", b"")
+
+    return QtCore.QSize(width, height)
+
+def export_svg(board, path, scale = 1.0, rect = None, title = None):
+
+    """
+    Writes the board (or a scene rect of it) to an SVG file at scale units per scene unit, returns the size
+    """
+
+    rect = get_export_rect(board, rect)
+    width = max(math.ceil(rect.width() * scale), 1)
+    height = max(math.ceil(rect.height() * scale), 1)
+
+    generator = QtSvg.QSvgGenerator()
+    generator.setFileName(path)
+    generator.setSize(QtCore.QSize(width, height))
+    generator.setViewBox(QtCore.QRect(0, 0, width, height))
+    generator.setTitle(title if title != None else os.path.splitext(os.path.basename(path))[0])
+
+    painter = QtGui.QPainter()
+    if not painter.begin(generator):
+        raise OSError(f"could not write {path}")
+
+    # a chunked board is rendered in strips of a row of chunks, so only those chunks exist at a time
+    strip_height = height
+    if board.chunked == True and board.board_item != None:
+        strip_height = max(math.ceil(height * board.board_item.chunk_size / board.rows), 1)
+
+    for top, pixels, strip_rect in get_strips(board, rect, scale, strip_height):
+        target = QtCore.QRectF(0, top, width, pixels)
+        painter.setClipRect(target)
+        board.scene.render(painter, target, strip_rect, QtCore.Qt.IgnoreAspectRatio)
+
+    painter.end()
+
+    return QtCore.QSize(width, height)
+
+def write_png_chunk(file, chunk_type, data):
+
+    if chunk_type == b"IDAT" and len(data) == 0:
+        return
+
+    file.write(struct.pack(">I", len(data)))
+    file.write(chunk_type)
+    file.write(data)
+    file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+
+def write_png_header(file, width, height):
+
+    # 8 bits per channel rgba, no interlacing
+    file.write(PNG_SIGNATURE)
+    write_png_chunk(file, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+
+def get_png_lines(image):
+
+    """
+    Returns the lines of an image as PNG scanlines, unfiltered rgba pixels behind a filter byte
+    """
+
+    image = image.convertToFormat(QtGui.QImage.Format_RGBA8888)
+    line_bytes = image.width() * 4
+    data = image.constBits().asstring(image.sizeInBytes())
+
+    return b"".join(b"\x00" + data[line * image.bytesPerLine():line * image.bytesPerLine() + line_bytes] for line in range(image.height()))
+
+def export_board_file(job):
+
+    """
+    Opens a board file and exports it to the output paths of the job, runs in the worker processes of export_board_files
+    """
+
+    path, outputs, options = job
+
+    # the board module imports this one
+    from pyqtgameboards import gameboard
+
+    application = QtWidgets.QApplication.instance()
+    if application == None:
+        application = QtWidgets.QApplication([])
+
+    try:
+        board = gameboard.open_board_file(path, options.get("size", 4), chunked = True)
+    except Exception as error:
+        return path, error
+
+    try:
+        for output in outputs:
+            if output.lower().endswith(".svg"):
+                export_svg(board, output, options.get("scale", 1.0))
+            else:
+                export_png(board, output, options.get("scale", 1.0), options.get("image_size"), background = options.get("background"))
+
+        result = path, outputs
+
+    except Exception as error:
+        result = path, error
+
+    # free the board before the next one
+    board_file = board.board_file
+    board.deleteLater()
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    board_file.close()
+
+    return result
+
+def initialize_worker():
+
+    # workers have no display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+def export_board_files(paths, output_directory, formats = ("png",), scale = 1.0, image_size = None, size = 4, background = None, processes = None, boards_per_process = 50):
+
+    """
+    Exports board files to images of the formats (png, svg) in the output directory, named after the board files,
+    in processes worker processes (the number of cpus by default). A worker renders one board at a time and
+    is replaced after boards_per_process boards, so the memory in use stays bounded.
+    Yields (path, output paths) per board file in the order they finish, or (path, exception) when it failed.
+    """
+
+    os.makedirs(output_directory, exist_ok = True)
+
+    jobs = []
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        outputs = [os.path.join(output_directory, f"{name}.{image_format}") for image_format in formats]
+        jobs.append((path, outputs, {"scale": scale, "image_size": image_size, "size": size, "background": background}))
+
+    # Qt does not survive a fork, the workers start a new interpreter
+    context = multiprocessing.get_context("spawn")
+
+    with context.Pool(processes, initializer = initialize_worker, maxtasksperchild = boards_per_process) as pool:
+        for result in pool.imap_unordered(export_board_file, jobs):
+            yield result
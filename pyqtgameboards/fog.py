@@ -0,0 +1,216 @@
+"""
+Fog of war over a gameboard
+
+QFogLayer keeps what every faction sees as a visibility.Vision and draws the fog of the shown faction
+as one mask image over the board, instead of an overlay style on every unseen tile.
+The mask has a pixel per tile (two on the shifted axis of a hexagon board) and is scaled over the board,
+smoothly so the edge of the fog is soft. When a source of sight moves only the pixels of the tiles
+that became visible or hidden are changed and their area is updated.
+
+    fog = QFogLayer(board, faction = "blue")
+    fog.set_source("blue", "scout", 10, 10, radius = 6)
+    fog.track_units(units, lambda unit: unit.data["faction"], radius = 6)
+"""
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from pyqtgameboards import visibility
+
+
+class QFogLayer(QtWidgets.QGraphicsObject):
+    """
+    Graphics item over the tiles (and units) of a board with the grid geometry of a rectangle or hexagon board,
+    it adds itself to the scene of the board
+    """
+
+    def __init__(self, board, faction = None, blocking = ("block",)):
+        QtWidgets.QGraphicsObject.__init__(self)
+
+        self.board = board
+        self.blocking = blocking
+
+        # vision per faction, the fog of the shown faction is drawn
+        self.visions = {}
+        self.faction = faction
+
+        # opacity of the fog over tiles that were never seen and over tiles that were seen before but not now
+        self.unexplored_alpha = 255
+        self.explored_alpha = 140
+
+        self.setup_mask()
+
+        # over the tiles and the units, without catching the mouse
+        self.setZValue(20)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        board.scene.addItem(self)
+
+    def setup_mask(self):
+
+        # a pixel per tile, two on the shifted axis of a hexagon board
+        self.pixel_grid = self.board.grid_geometry.get_pixel_grid()
+
+        self.mask = QtGui.QImage(self.pixel_grid.width, self.pixel_grid.height, QtGui.QImage.Format_Alpha8)
+        self.mask.fill(0)
+
+        bits = self.mask.bits()
+        bits.setsize(self.mask.sizeInBytes())
+        self.pixels = memoryview(bits)
+        self.line = self.mask.bytesPerLine()
+
+        self.rect = QtCore.QRectF(*self.pixel_grid.get_rect())
+
+        self.redraw()
+
+    def boundingRect(self):
+        return self.rect
+
+    def get_vision(self, faction):
+
+        """
+        Returns the visibility.Vision of a faction
+        """
+
+        if faction not in self.visions:
+            self.visions[faction] = visibility.Vision(self.board.model, self.blocking)
+
+        return self.visions[faction]
+
+    def set_source(self, faction, key, row, column, radius):
+
+        """
+        Moves or adds a source of sight of a faction, like a unit, and updates the fog of the tiles that changed
+        """
+
+        changed = self.get_vision(faction).set_source(key, [row, column], radius)
+
+        if faction == self.faction:
+            self.update_tiles(changed)
+
+    def remove_source(self, faction, key):
+
+        changed = self.get_vision(faction).remove_source(key)
+
+        if faction == self.faction:
+            self.update_tiles(changed)
+
+    def refresh(self):
+
+        """
+        Calculates the fields of view of all sources again, call after blocking overlays changed
+        """
+
+        for faction, vision in self.visions.items():
+            changed = vision.refresh()
+
+            if faction == self.faction:
+                self.update_tiles(changed)
+
+    def show_faction(self, faction):
+
+        """
+        Shows the fog of another faction, or no fog for None
+        """
+
+        self.faction = faction
+        self.redraw()
+
+    def track_units(self, unit_layer, get_faction, radius):
+
+        """
+        Makes the units of a units.QUnitLayer sources of sight of the faction get_faction returns for a unit,
+        their fields of view follow them tile by tile while they move
+        """
+
+        def unit_moved(unit):
+            faction = get_faction(unit)
+            if faction != None:
+                self.set_source(faction, unit, unit.row, unit.column, radius)
+
+        def unit_removed(unit):
+            faction = get_faction(unit)
+            if faction != None:
+                self.remove_source(faction, unit)
+
+        for unit in unit_layer.units:
+            unit_moved(unit)
+
+        unit_layer.unit_moved.connect(unit_moved)
+        unit_layer.unit_removed.connect(unit_removed)
+
+    def get_alpha(self, vision, index):
+
+        if vision == None:
+            return 0
+
+        if vision.counts[index] > 0:
+            return 0
+
+        return self.explored_alpha if vision.is_explored(index) else self.unexplored_alpha
+
+    def set_tile_alpha(self, index, alpha):
+
+        row, column = divmod(index, self.board.columns)
+        x, y = self.pixel_grid.get_tile_pixel(row + 1, column + 1)
+        x_pixels = self.pixel_grid.x_pixels
+
+        for line in range(y, y + self.pixel_grid.y_pixels):
+            start = line * self.line + x
+            self.pixels[start:start + x_pixels] = bytes([alpha]) * x_pixels
+
+        return x, y
+
+    def update_tiles(self, indices):
+
+        """
+        Changes the pixels of the tiles in the mask and updates their area once
+        """
+
+        vision = self.visions.get(self.faction) if self.faction != None else None
+
+        left = top = None
+        for index in indices:
+            x, y = self.set_tile_alpha(index, self.get_alpha(vision, index))
+
+            if left == None:
+                left, top, right, bottom = x, y, x, y
+            else:
+                left, top, right, bottom = min(left, x), min(top, y), max(right, x), max(bottom, y)
+
+        if left != None:
+            # a pixel more around the tiles for the smooth edge
+            self.update(QtCore.QRectF(*self.pixel_grid.get_rect(
+                left - 1,
+                top - 1,
+                right - left + self.pixel_grid.x_pixels + 2,
+                bottom - top + self.pixel_grid.y_pixels + 2,
+            )))
+
+    def redraw(self):
+
+        """
+        Draws the whole mask again
+        """
+
+        if self.faction == None:
+            self.mask.fill(0)
+
+        # only the explored tiles, which include the visible ones, are cleared out of the fog
+        else:
+            vision = self.get_vision(self.faction)
+            self.mask.fill(self.unexplored_alpha)
+
+            for byte_index, byte in enumerate(vision.explored):
+                if byte != 0:
+                    for index in range(byte_index * 8, min(byte_index * 8 + 8, self.board.model.count)):
+                        if vision.is_explored(index):
+                            self.set_tile_alpha(index, self.get_alpha(vision, index))
+
+        self.update()
+
+    def paint(self, painter, option, widget = None):
+
+        if self.faction == None:
+            return
+
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.drawImage(self.rect, self.mask)
@@ -1,13 +1,67 @@
-import sys, math
+import sys, math, time
+import array
+import weakref
 import collections
+import functools
+import concurrent.futures
+import contextlib
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from pyqtgameboards import core
+from pyqtgameboards import boardfile
+from pyqtgameboards import export
+from pyqtgameboards import geometry
+from pyqtgameboards import history
+from pyqtgameboards import pathfinding
+from pyqtgameboards import profiling
+from pyqtgameboards import visibility
+
+
+# level of detail of batched and chunked boards, by the size of a tile on screen
+DETAIL_FILL = 0 # only the fill of the tiles, drawn from a cached image while panning
+DETAIL_SIMPLE = 1 # thin solid outlines, drawn from a cached image while panning
+DETAIL_FULL = 2 # the pens and brushes as they are
+
+# what dragging with the left mouse button selects
+SELECT_TILE = 0 # clicks select a tile and target, as before
+SELECT_RECT = 1 # dragging selects the tiles within a rubber band rect
+SELECT_LASSO = 2 # dragging selects the tiles within a free lasso shape
+
 
 class QGameboard(QtWidgets.QGraphicsView):
-    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True):
+
+    # sends the profiling.BoardStats of the board while profiling is enabled
+    stats_updated = QtCore.pyqtSignal(object)
+
+    # receives lists of overlay deltas, also from other threads, see queue_overlay_deltas
+    overlay_deltas = QtCore.pyqtSignal(object)
+
+    # progress (done, total steps) and end of an asynchronous build, see build_board_scene_async
+    build_progress = QtCore.pyqtSignal(int, int)
+    build_ready = QtCore.pyqtSignal()
+
+    # indices of the tiles repainted by flush_repaints, only sent while connected, see minimap
+    tiles_repainted = QtCore.pyqtSignal(object)
+
+    # (start, stop, step) ranges of the indices of the tiles of a new area selection, see select_area
+    area_selected = QtCore.pyqtSignal(object)
+
+    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True, batched = False, chunked = False, board_file = None, asynchronous = False, shared_board = None):
         QtWidgets.QGraphicsView.__init__(self)
 
+        # a view of another board shares its model, overlays and scene, see create_view
+        self.shared_board = shared_board
+        if shared_board != None:
+            rows, columns, size, overlays, horizontal = shared_board.rows, shared_board.columns, shared_board.size, shared_board.overlays, shared_board.horizontal
+            relative, batched, chunked, board_file = shared_board.relative, shared_board.batched, shared_board.chunked, shared_board.board_file
+            asynchronous = False
+
+        # a board file gives the dimensions and the overlays of the board, see boardfile
+        self.board_file = board_file
+        if board_file != None:
+            rows, columns, horizontal = board_file.rows, board_file.columns, board_file.horizontal
+
         # set board parameters
         self.rows = rows
         self.columns = columns
@@ -15,6 +69,9 @@ class QGameboard(QtWidgets.QGraphicsView):
         self.overlays = overlays
         self.horizontal = horizontal
         self.relative = relative
+        self.batched = batched
+        self.chunked = chunked
+        self.asynchronous = asynchronous
 
         # default parameters
         self.deltaF = 1.0
@@ -23,13 +80,95 @@ class QGameboard(QtWidgets.QGraphicsView):
         self.center = None
         self.shiftfocus = QtCore.QPointF(0, 0)
 
-        self.map_coordinates_by_tile = {}
-        self.map_tile_by_coordinates = {}
-
-        # build board and set to this widget
-        self.scene = QtWidgets.QGraphicsScene()
-        self.build_board_scene()
+        # compact model of the tiles, lookups in both directions are constant time
+        self.model = self.create_model() if shared_board == None else shared_board.model
+        self.overlay_index = None
+
+        # positions of the tiles in the scene and the shape every tile is a copy of, see build_board_scene
+        self.grid_geometry = None
+        self.unit_shape = None
+
+        # paths over the model, with the movement cost per overlay name (None is impassable)
+        self.pathfinder = pathfinding.Pathfinder(self.model, {"block": None}) if shared_board == None else shared_board.pathfinder
+
+        # single graphics item drawing all tiles when the board is batched,
+        # or the chunks of a chunked board
+        self.board_item = None
+
+        # a chunked board only creates the chunks of chunk_size x chunk_size tiles in view,
+        # plus chunk_margin chunks around the view
+        self.chunk_size = 32
+        self.chunk_margin = 1
+
+        # tiles smaller than these sizes on screen (in pixels) are filled only or drawn simplified
+        self.detail_level = DETAIL_FULL
+        self.detail_tile_sizes = [4, 12]
+
+        # the level of detail of the tiles of a per item board, the most detailed of its views
+        self.item_detail_level = DETAIL_FULL
+
+        # pen and brush changes are collected per tile and applied once per frame
+        self.pending_repaints = {}
+        self.repaint_count = 0
+        self.coalesced_repaint_count = 0
+        self.repaint_timer = QtCore.QTimer(self)
+        self.repaint_timer.setSingleShot(True)
+        self.repaint_timer.setInterval(16) # about 60 frames per second
+        self.repaint_timer.timeout.connect(self.flush_repaints)
+
+        # times phases and frames while profiling is enabled, see enable_profiling
+        self.profiler = None
+
+        # undo and redo of overlay edits while the history is enabled, see enable_history
+        self.history = None if shared_board == None else shared_board.history
+
+        # overlay deltas are collected for delta_window milliseconds and then applied
+        # in slices of at most delta_budget milliseconds, so the event loop keeps running
+        self.pending_deltas = collections.deque()
+        self.delta_window = 16
+        self.delta_budget = 8
+        self.delta_timer = QtCore.QTimer(self)
+        self.delta_timer.setSingleShot(True)
+        self.delta_timer.timeout.connect(self.apply_pending_deltas)
+        self.overlay_deltas.connect(self.queue_overlay_deltas)
+
+        # brush per selection state, a tile in several states shows the last one
+        self.state_brushes = collections.OrderedDict([
+            (core.VISIBLE, QtGui.QBrush(QtGui.QColor(255,255,0,40))),
+            (core.REACHABLE, QtGui.QBrush(QtGui.QColor(0,0,255,40))),
+            (core.SIGHT, QtGui.QBrush(QtGui.QColor(50,50,50,100))),
+            (core.TARGET, QtGui.QBrush(QtGui.QColor(255,255,0,100))),
+            (core.ADJACENT, QtGui.QBrush(QtGui.QColor(0,0,255,100))),
+            (core.SELECTED, QtGui.QBrush(QtGui.QColor(0,0,255,255))),
+        ])
+
+        # an asynchronous build adds the tiles in slices of build_budget milliseconds,
+        # the board only reacts to the mouse and overlay deltas when it is ready
+        self.ready = False
+        self.build_budget = 10
+        self.build_timer = None
+        self.build_future = None
+
+        # selection state of the tiles in this view, the model holds the state of all views of the board together
+        self.tile_states = {}
+
+        # build board and set to this widget, or share the scene of the board this is a view of
+        if shared_board != None:
+            self.share_board_scene(shared_board)
+        else:
+            self.views = QBoardViews(self)
+            self.scene = QtWidgets.QGraphicsScene(self)
+            if self.asynchronous == True:
+                self.build_board_scene_async()
+            else:
+                self.build_board_scene()
         self.setScene(self.scene)
+        self.update_detail_level()
+
+        # chunks follow the view while scrolling, a method keeps no reference to the view in the connection
+        if self.chunked == True:
+            self.horizontalScrollBar().valueChanged.connect(self.scrolled)
+            self.verticalScrollBar().valueChanged.connect(self.scrolled)
 
         # selections and stuff
         self.selected_tile = None
@@ -38,17 +177,44 @@ class QGameboard(QtWidgets.QGraphicsView):
         self.line_of_sight = None
         self.colliding_items = None
 
+        # movement range and field of view shown around the selected tile, None to leave them out
+        self.movement_points = None
+        self.sight_radius = None
+        self.reachable_tiles = []
+        self.visible_tiles = []
+
+        # tile under the mouse, tracked while mouse tracking is enabled
+        self.hovered_tile = None
+
+        # area selected by dragging a rect or lasso when the selection mode is not SELECT_TILE,
+        # kept as index ranges and drawn as its outline instead of repainting every tile in it
+        self.selection_mode = SELECT_TILE
+        self.area_spans = []
+        self.area_shape = None
+        self.area_points = None
+        self.area_pen = QtGui.QPen(QtGui.QColor(0,0,255), 2, QtCore.Qt.DashLine)
+        self.area_pen.setCosmetic(True)
+        self.area_brush = QtGui.QBrush(QtGui.QColor(0,0,255,40))
+
     def mousePressEvent(self, event):
 
+        # tiles and overlays of an asynchronous build may not exist yet
+        if self.ready == False:
+            return
+
+        # start dragging an area
+        if self.selection_mode != SELECT_TILE and event.button() == QtCore.Qt.LeftButton:
+            self.area_points = [self.mapToScene(event.pos())]
+            return
+
         # store current selected tile
         current_selected_tile = self.selected_tile
 
         # get position (of pixel clicked)
         position = self.mapToScene(event.pos())
-        # print(f"tile selected at position {position}")
 
         # associated tile graphic_item
-        new_selected_tile = self.scene.itemAt(position, QtGui.QTransform())
+        new_selected_tile = self.get_tile_at(position)
 
         # if clicked outside of map, remove selection of current selected tile
         if new_selected_tile == None and current_selected_tile != None:
@@ -72,6 +238,68 @@ class QGameboard(QtWidgets.QGraphicsView):
 
             self.selection_adjacent_tiles()
 
+    def mouseMoveEvent(self, event):
+
+        # without mouse tracking enabled, move events only arrive while a button is pressed
+        position = self.mapToScene(event.pos())
+        hovered_tile = self.get_tile_at(position)
+
+        if hovered_tile != self.hovered_tile:
+            self.hover_change(hovered_tile)
+
+        if self.area_points != None:
+            self.drag_area(event.pos())
+
+        QtWidgets.QGraphicsView.mouseMoveEvent(self, event)
+
+    def mouseReleaseEvent(self, event):
+
+        # select the dragged area
+        if self.area_points != None and event.button() == QtCore.Qt.LeftButton:
+            self.drag_area(event.pos())
+            self.area_points = None
+
+            if self.area_shape != None:
+                self.select_area(self.area_shape)
+
+            return
+
+        QtWidgets.QGraphicsView.mouseReleaseEvent(self, event)
+
+    def drag_area(self, view_position):
+
+        """
+        Follows the mouse while dragging a rubber band rect or lasso
+        """
+
+        position = self.mapToScene(view_position)
+
+        if self.selection_mode == SELECT_RECT:
+            self.area_shape = QtGui.QPolygonF(QtCore.QRectF(self.area_points[0], position).normalized())
+
+        # the lasso gets a corner every few pixels on screen
+        elif (self.mapFromScene(self.area_points[-1]) - view_position).manhattanLength() >= 4:
+            self.area_points.append(position)
+            self.area_shape = QtGui.QPolygonF(self.area_points) if len(self.area_points) >= 3 else None
+
+        self.viewport().update()
+
+    def drawForeground(self, painter, rect):
+
+        # the selected area is drawn as its outline
+        if self.area_shape != None:
+            painter.setPen(self.area_pen)
+            painter.setBrush(self.area_brush)
+            painter.drawPolygon(self.area_shape)
+
+    def hover_change(self, hovered_tile):
+        """
+        Called when the mouse moves onto another tile (or off the board with None),
+        overwrite to show information of the hovered tile
+        """
+
+        self.hovered_tile = hovered_tile
+
     def selection_removal(self, current_selected_tile):
         """
         Sets and paints a new selection when there is none yet.
@@ -83,8 +311,14 @@ class QGameboard(QtWidgets.QGraphicsView):
         # add the adjacent tiles
         tiles += self.get_adjacent_tiles(current_selected_tile)
 
+        # add the movement range and field of view
+        tiles += self.reachable_tiles + self.visible_tiles
+        self.reachable_tiles = []
+        self.visible_tiles = []
+
         # remove selection
         self.selected_tile = None
+        self.set_tiles_state(tiles, core.SELECTED | core.ADJACENT | core.REACHABLE | core.VISIBLE, False)
 
         # rebuild the tiles
         self.rebuild_tiles(tiles)
@@ -92,11 +326,15 @@ class QGameboard(QtWidgets.QGraphicsView):
     def selection_new(self, new_selected_tile):
             
         # paint the new tile
-        selectbrush = QtGui.QBrush(QtGui.QColor(0,0,255,255))
+        selectbrush = self.state_brushes[core.SELECTED]
         self.paint_graphic_items([new_selected_tile], brush = selectbrush)
 
         # make new tile the selected tile
         self.selected_tile = new_selected_tile
+        self.set_tiles_state([new_selected_tile], core.SELECTED)
+
+        # paint movement range and field of view
+        self.selection_ranges()
 
         # paint adjacent tiles
 
@@ -104,13 +342,50 @@ class QGameboard(QtWidgets.QGraphicsView):
 
         # get adjacent tiles
         adjacent_tiles = self.get_adjacent_tiles(self.selected_tile)
+        self.set_tiles_state(adjacent_tiles, core.ADJACENT)
 
         # paint adjacent tiles
-        adjacent_brush = QtGui.QBrush(QtGui.QColor(0,0,255,100))
+        adjacent_brush = self.state_brushes[core.ADJACENT]
         self.paint_graphic_items(adjacent_tiles, brush = adjacent_brush)
 
         return adjacent_tiles
 
+    def selection_ranges(self):
+
+        """
+        Paints the tiles within movement_points of the selected tile and the tiles in view
+        within sight_radius of it, each when set
+        """
+
+        coordinates = self.get_tile_grid_location(self.selected_tile)
+        selected_index = self.get_tile_index(self.selected_tile)
+
+        if self.sight_radius != None:
+            visible = visibility.get_field_of_view(self.model, coordinates, self.sight_radius)
+            visible.discard(selected_index)
+
+            self.visible_tiles = [self.model_tile(index) for index in visible]
+            self.set_tiles_state(self.visible_tiles, core.VISIBLE)
+            self.paint_graphic_items(self.visible_tiles, brush = self.state_brushes[core.VISIBLE])
+
+        if self.movement_points != None:
+            reachable = self.pathfinder.get_reachable(coordinates, self.movement_points)
+            reachable.discard(selected_index)
+
+            self.reachable_tiles = [self.model_tile(index) for index in reachable]
+            self.set_tiles_state(self.reachable_tiles, core.REACHABLE)
+            self.paint_graphic_items(self.reachable_tiles, brush = self.state_brushes[core.REACHABLE])
+
+    def ranges_removal(self):
+
+        # reset the movement range and field of view
+        tiles = self.reachable_tiles + self.visible_tiles
+        self.reachable_tiles = []
+        self.visible_tiles = []
+
+        self.set_tiles_state(tiles, core.REACHABLE | core.VISIBLE, False)
+        self.rebuild_tiles(tiles)
+
     def target_removal(self):
 
         # reset target tile
@@ -118,14 +393,14 @@ class QGameboard(QtWidgets.QGraphicsView):
         self.target_tile = None
         
         # remove any line of sight
-        if self.line_of_sight != None:
-            self.scene.removeItem(self.line_of_sight)
-            self.line_of_sight = None
+        self.line_of_sight = None
 
         # remove any colliding items
         if self.colliding_items != None:
             tiles_to_reset += self.colliding_items
-        
+
+        self.set_tiles_state(tiles_to_reset, core.TARGET | core.SIGHT, False)
+
         # repaint tiles
         self.rebuild_tiles(tiles_to_reset)
 
@@ -133,7 +408,8 @@ class QGameboard(QtWidgets.QGraphicsView):
 
         # set the new tile as the target tile and paint it accordingly
         self.target_tile = new_selected_tile
-        target_brush = QtGui.QBrush(QtGui.QColor(255,255,0,100))
+        self.set_tiles_state([new_selected_tile], core.TARGET)
+        target_brush = self.state_brushes[core.TARGET]
         self.paint_graphic_item(new_selected_tile, brush = target_brush)
 
         # Create a new line of sight between the selected tile and the target tile
@@ -143,7 +419,8 @@ class QGameboard(QtWidgets.QGraphicsView):
             )
 
         # paint the colliding items that the line of sight goes through
-        collide_brush = QtGui.QBrush(QtGui.QColor(50,50,50,100))
+        self.set_tiles_state(self.colliding_items, core.SIGHT)
+        collide_brush = self.state_brushes[core.SIGHT]
         self.paint_graphic_items(self.colliding_items, brush = collide_brush)
 
     def target_switch(self, new_selected_tile):
@@ -151,6 +428,92 @@ class QGameboard(QtWidgets.QGraphicsView):
         self.target_removal()
         self.target_new(new_selected_tile)
 
+    def select_area(self, polygon):
+
+        """
+        Selects the tiles with their center within the polygon in scene coordinates
+        and returns them as (start, stop, step) ranges of tile indices, see core.get_span_indices
+        """
+
+        points = [(point.x(), point.y()) for point in polygon]
+
+        if self.grid_geometry != None:
+            spans = self.grid_geometry.get_spans_in_polygon(points)
+
+        # without a grid geometry every tile is checked
+        else:
+            spans = []
+            for index in range(self.model.count):
+                if polygon.containsPoint(self.get_shape_rect(*self.model.get_coordinates(index)).center(), QtCore.Qt.OddEvenFill):
+                    spans.append((index, index + 1, 1))
+
+        self.set_area(spans, QtGui.QPolygonF(polygon))
+        return spans
+
+    def select_grid_area(self, first_row, last_row, first_column, last_column):
+
+        """
+        Selects the tiles from the first to the last row and column and returns them as ranges of tile indices
+        """
+
+        spans = self.model.get_spans(first_row, last_row, first_column, last_column)
+        self.set_area(spans, QtGui.QPolygonF(self.get_spans_rect(spans)))
+        return spans
+
+    def set_area(self, spans, shape):
+
+        self.area_spans = spans
+        self.area_shape = shape
+        self.viewport().update()
+        self.area_selected.emit(spans)
+
+    def clear_area(self):
+
+        self.area_spans = []
+        self.area_shape = None
+        self.viewport().update()
+
+    def get_area_indices(self):
+
+        """
+        Returns the indices of the tiles in the selected area
+        """
+
+        return core.get_span_indices(self.area_spans)
+
+    def paint_area(self, pen = None, brush = None):
+
+        """
+        Sets the pen and / or brush of all tiles in the selected area at once
+        """
+
+        self.check_ready()
+        self.set_spans_style(self.area_spans, pen, brush)
+
+    def enable_profiling(self, interval = 500):
+
+        """
+        Starts timing the phases of the board and the paint time of every frame,
+        returns the profiling.BoardStats that are also sent with stats_updated every interval milliseconds
+        """
+
+        if self.profiler == None:
+            self.profiler = profiling.BoardProfiler(self, interval)
+            self.profiler.enable()
+
+        return self.profiler.stats
+
+    def disable_profiling(self):
+
+        """
+        Stops profiling, the board runs its methods without timing again
+        """
+
+        if self.profiler != None:
+            self.profiler.disable()
+            self.profiler.deleteLater()
+            self.profiler = None
+
     def wheelEvent(self, event):
 
         # get delta of mousewheel scroll, default is 120 pixels, we devide by 1200 to return 0.10 to get the zoom factor
@@ -158,6 +521,108 @@ class QGameboard(QtWidgets.QGraphicsView):
         self.deltaF = 1 + float(delta.y() / 1200)
         self.scale(self.deltaF, self.deltaF)
 
+        self.update_detail_level()
+        self.update_chunks()
+
+    def get_detail_level(self, transform = None):
+
+        """
+        Returns the level of detail for the size of a tile on screen at the current zoom,
+        or at the zoom of the transform of a painter
+        """
+
+        transform = self.transform() if transform == None else transform
+        tile_size = self.size * self.scalemanual * math.hypot(transform.m11(), transform.m12())
+
+        if tile_size < self.detail_tile_sizes[0]:
+            return DETAIL_FILL
+
+        if tile_size < self.detail_tile_sizes[1]:
+            return DETAIL_SIMPLE
+
+        return DETAIL_FULL
+
+    def update_detail_level(self):
+
+        """
+        Switches the level of detail when the zoom crossed a tier, call after changing the transform of the view.
+        Only the way the tiles are painted changes, the scene is left as is.
+        """
+
+        detail_level = self.get_detail_level()
+        if detail_level != self.detail_level:
+            self.detail_level = detail_level
+
+            # the tiles are cached while any view of the board is zoomed out
+            if self.board_item != None:
+                self.board_item.set_detail_level(min(view.detail_level for view in self.views))
+
+        # the tiles of a per item board are shared by the views, so they get the pen of the most detailed view
+        if self.board_item == None:
+            self.update_item_detail_level(max(view.detail_level for view in self.views))
+
+    def update_item_detail_level(self, detail_level):
+
+        """
+        Sets the pens of all tiles of a per item board to the level of detail, when it changed
+        """
+
+        # the board may still be building, its tiles are added at full detail
+        if detail_level == self.item_detail_level or self.ready == False or self.model.items == None:
+            return
+
+        for view in self.views:
+            view.item_detail_level = detail_level
+
+        # scheduled repaints would overwrite the pens
+        self.flush_repaints()
+
+        for index, tile in enumerate(self.model.items):
+            if tile != None:
+                tile.setPen(self.get_detail_pen(self.overlay_index.get_style(index)[0], detail_level))
+
+    def get_detail_pen(self, pen, detail_level):
+
+        """
+        Returns the pen to draw a tile with at a level of detail
+        """
+
+        # tiles of a few pixels only need their colour
+        if detail_level == DETAIL_FILL:
+            return QtGui.QPen(QtCore.Qt.NoPen)
+
+        # a cosmetic pen is drawn one pixel wide without any dash pattern
+        if detail_level == DETAIL_SIMPLE and pen.style() != QtCore.Qt.NoPen:
+            return QtGui.QPen(pen.color(), 0, QtCore.Qt.SolidLine)
+
+        return pen
+
+    def scrolled(self, value):
+        self.update_chunks()
+
+    def resizeEvent(self, event):
+
+        QtWidgets.QGraphicsView.resizeEvent(self, event)
+        self.update_chunks()
+
+    def showEvent(self, event):
+
+        QtWidgets.QGraphicsView.showEvent(self, event)
+        self.update_chunks()
+
+    def update_chunks(self):
+
+        """
+        Creates the chunks of a chunked board that come into view and releases the ones far out of view
+        """
+
+        if self.chunked != True or self.board_item == None:
+            return
+
+        # the chunks in view of any view of the board are kept
+        rects = [view.mapToScene(view.viewport().rect()).boundingRect() for view in self.views]
+        self.board_item.update_chunks(rects, self.chunk_margin)
+
     def build_board_scene(self):
         """       
         Creates a gameboard of rows and columns of hexagons of a sepecific
@@ -175,224 +640,985 @@ class QGameboard(QtWidgets.QGraphicsView):
         - a list of all the positions of the tile type (Positions)       
         """
 
-        # set focus to center of screen
-        self.center = QtCore.QPointF(self.geometry().width() / 2, self.geometry().height() / 2)
-
+        self.build_geometry()
         self.build_tiles()
         self.build_overlays()
 
-    def build_tiles(self):
+        # show the board as built right away
+        self.flush_repaints()
 
-        #  default white background surrounded by a black 1 width line
-        brush = QtGui.QBrush(QtGui.QColor(255,255,255,255))
-        pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.SolidLine)
-        
-        # Create tiles for all the rows and columns
-        row = 1
-        while row <= self.rows:
+        self.ready = True
+        self.build_ready.emit()
 
-            column = 1
-            while column <= self.columns:
+    def build_geometry(self):
 
-                """
-                maybe add following to seperate method, so this method can be shape agnostic
-                """
+        # set focus to center of screen
+        self.center = QtCore.QPointF(self.geometry().width() / 2, self.geometry().height() / 2)
 
-                tile = self.add_shape_to_scene(row, column, pen, brush)
+        # the tile positions and the unit shape are computed once for all tiles
+        self.grid_geometry = self.create_geometry()
+        if self.grid_geometry != None:
+            self.unit_shape = QtGui.QPolygonF([QtCore.QPointF(x, y) for x, y in self.grid_geometry.unit_points])
 
-                self.map_coordinates_by_tile[tile] = [row, column]
-                self.map_tile_by_coordinates[f"{row}-{column}"] = tile
+    def share_board_scene(self, board):
 
-                column += 1
-            row += 1
+        """
+        Makes this board a view of another board, with its own zoom and selection
+        """
 
-    def build_overlays(self):
+        self.views = board.views
+        self.views.append(self)
 
-        # Create overlays
-        for overlay in self.overlays:
-            
-            # Get brush
-            if overlay["Brush"] != "":
-                brush = overlay["Brush"]
-            else:
-                brush = None
+        self.scene = board.scene
+        self.center = board.center
+        self.grid_geometry = board.grid_geometry
+        self.unit_shape = board.unit_shape
+        self.overlay_index = board.overlay_index
+        self.board_item = board.board_item
+        self.item_detail_level = board.item_detail_level
 
-            # Get pen
-            if overlay["Pen"] != "":
-                pen = overlay["Pen"]
-            else:
-                pen = None
+        # the board may still be building
+        self.ready = board.ready
+        if board.ready == False:
+            board.build_ready.connect(self.share_build_ready)
 
-            # create tile list to paint for this overlay
-            overlay_tiles = []
-            
-            for overlay_coordinates in overlay["Positions"]:
+        # the selection of a closed view is removed from the board, the connection only refers to the state of the view
+        # so a view that is no longer used can be collected
+        self.destroyed.connect(functools.partial(remove_view, self.views, weakref.ref(self), self.tile_states))
 
-                # get position info from the tile list
-                overlay_coordinates_string = f"{overlay_coordinates[0]}-{overlay_coordinates[1]}"
+    def share_build_ready(self):
 
-                # get the respective tile
-                tile = self.map_tile_by_coordinates[overlay_coordinates_string]
-                
-                # move the tile on top of the background tiles
-                tile.setZValue(1)
-                
-                # add to the overlay tiles
-                overlay_tiles.append(tile)
+        self.overlay_index = self.shared_board.overlay_index
+        self.ready = True
+        self.update_chunks()
+        self.build_ready.emit()
 
-            # paint all the respective tiles
-            self.paint_graphic_items(overlay_tiles, pen, brush)
+    def create_view(self):
 
-    def rebuild_tiles(self, tiles):
+        """
+        Returns a new view of this board that shares its model, overlays and scene,
+        with its own zoom and selection. Overlay changes made through any view are seen by all of them.
+        """
 
-        for tile in tiles:
-            self.rebuild_tile(tile)
+        return type(self)(self.rows, self.columns, shared_board = self)
 
-    def rebuild_tile(self, tile):
+    def build_board_scene_async(self):
 
-        tile_coordinates = self.map_coordinates_by_tile[tile]
+        """
+        Builds the board without blocking the event loop, the window shows and stays responsive while building.
 
-        #  default white background surrounded by a black 1 width line
-        brush = QtGui.QBrush(QtGui.QColor(255,255,255,255))
-        pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.SolidLine)
-        
-        # repaint the tile
-        self.paint_graphic_item(tile, pen, brush)
+        The overlays are resolved in a worker thread while the tiles are added to the scene
+        in slices of build_budget milliseconds, with the scene index suspended until all tiles exist.
+        Afterwards the overlay tiles are painted in slices as well.
+        build_progress is emitted after every slice and build_ready when the board is ready.
+        """
 
-        # Create overlays
-        for overlay in self.overlays:
-            
-            # Get brush
-            if overlay["Brush"] != "":
-                brush = overlay["Brush"]
-            else:
-                brush = None
+        self.ready = False
+        self.build_geometry()
 
-            # Get pen
-            if overlay["Pen"] != "":
-                pen = overlay["Pen"]
-            else:
-                pen = None
-          
-            for overlay_coordinates in overlay["Positions"]:
-                if overlay_coordinates == tile_coordinates:
-                                
-                    # repaint the tile
-                    self.paint_graphic_item(tile, pen, brush)
-                    
-                    break
+        # resolve the overlays next to building the tiles
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self.build_future = executor.submit(self.build_overlays_in_background)
+        executor.shutdown(wait = False)
 
-    def get_tiles_grid_location(self, tiles):
+        # batched and chunked boards and boards without a grid geometry create their tiles at once
+        if self.batched == True or self.chunked == True or self.grid_geometry == None:
+            self.build_tiles()
+            self.build_tile_count = 0
+        else:
+            self.scene.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+            self.build_tile_count = self.model.count
 
-        coordinate_list = []
-        for tile in tiles:
-            coordinates = self.get_tile_grid_location(tile)
-            coordinate_list.append(coordinates)
+        self.build_index = 0
+        self.build_overlay_indices = None
+        self.build_overlay_position = 0
 
-        return coordinate_list
+        self.build_timer = QtCore.QTimer(self)
+        self.build_timer.setSingleShot(True)
+        self.build_timer.timeout.connect(self.build_slice)
+        self.build_timer.start(0)
 
-    def get_tile_grid_location(self, tile):
-        for graphics_item in self.map_coordinates_by_tile:
-            if graphics_item == tile:
-                coordinates = self.map_coordinates_by_tile[tile]
-                return coordinates
+    def build_overlays_in_background(self):
 
-    def paint_graphic_items(self, graphic_items, pen = None, brush = None):
+        # runs in a worker thread, the board model is only read,
+        # the new overlay index is set on the board by build_slice in the thread of the board
+        overlay_index = self.create_overlay_index()
+        return overlay_index, overlay_index.get_masked_indices()
 
-        if graphic_items != None:
-            for graphic_item in graphic_items:
-                self.paint_graphic_item(graphic_item, pen, brush)
+    def build_slice(self):
 
-    def paint_graphic_item(self, graphic_item, pen = None, brush = None):
-        if pen != None:
-            graphic_item.setPen(pen)
-        
-        if brush != None:
-            graphic_item.setBrush(brush)
-        
-        graphic_item.update()
+        """
+        Adds tiles to the scene, and afterwards paints overlay tiles, for at most build_budget milliseconds
+        """
 
-    def create_line_of_sight(self, originobject, targetobject):
+        start = time.perf_counter()
 
-        origin_center_x = originobject.boundingRect().center().x()
-        origin_center_y = originobject.boundingRect().center().y()
-        target_center_x = targetobject.boundingRect().center().x()
-        target_center_y = targetobject.boundingRect().center().y()
+        def in_budget():
+            return (time.perf_counter() - start) * 1000 < self.build_budget
 
-        pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.NoPen)
+        #  default white background surrounded by a black 1 width line
+        brush = QtGui.QBrush(QtGui.QColor(255,255,255,255))
+        pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.SolidLine)
 
-        self.line_of_sight = self.scene.addLine(
-            origin_center_x,
-            origin_center_y,
-            target_center_x,
-            target_center_y,
-            pen,
-            )
-        
-        # find all the tiles that are collided with the line of sight
-        colliding_items = (self.scene.collidingItems(self.line_of_sight))
+        while self.build_index < self.build_tile_count and in_budget():
+            for index in range(self.build_index, min(self.build_index + 256, self.build_tile_count)):
+                row, column = self.model.get_coordinates(index)
+                self.model.set_item(index, self.add_shape_to_scene(row, column, pen, brush))
 
-        # delete selected and target tile from list
-        index_selected = colliding_items.index(self.selected_tile)
-        colliding_items.pop(index_selected)
-        index_target = colliding_items.index(self.target_tile)
-        colliding_items.pop(index_target)
+            self.build_index = min(self.build_index + 256, self.build_tile_count)
 
-        # get an array of the coordinates in order to print
-        coordinate_list = self.get_tiles_grid_location(colliding_items)
-        # print(coordinate_list)
+        if self.build_index == self.build_tile_count and self.build_overlay_indices == None:
 
-        return colliding_items
+            # wait for the worker to finish the overlays
+            if not self.build_future.done():
+                self.build_progress.emit(self.build_index, self.build_tile_count)
+                self.build_timer.start(self.build_budget)
+                return
 
-    def get_adjacent_tiles(self, target_tile):
+            overlay_index, self.build_overlay_indices = self.build_future.result()
+            self.build_future = None
+            self.set_overlay_index(overlay_index)
 
-        """
-        Needs overwrite to implement kind of shape
-        """
+        if self.build_overlay_indices != None:
+            while self.build_overlay_position < len(self.build_overlay_indices) and in_budget():
+                indices = self.build_overlay_indices[self.build_overlay_position:self.build_overlay_position + 256]
+                self.rebuild_tiles([self.model_tile(index) for index in indices])
+                self.build_overlay_position += len(indices)
 
-        return NotImplemented
+        total = self.build_tile_count + (len(self.build_overlay_indices) if self.build_overlay_indices != None else 0)
+        done = self.build_index + self.build_overlay_position
+        self.build_progress.emit(done, total)
 
-    def add_shape_to_scene(self, row, column, pen, brush):
+        if self.build_overlay_indices == None or self.build_overlay_position < len(self.build_overlay_indices):
+            self.build_timer.start(0)
+            return
 
-        """
-        Needs overwrite to implement kind of shape
-        """
+        # index the scene again now that all tiles exist
+        self.scene.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+        self.build_overlay_indices = None
+        self.flush_repaints()
 
-        return NotImplemented
+        self.ready = True
 
-class QEmptyboard(QGameboard):
-    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True):
-        super().__init__(rows, columns, size, overlays, horizontal, relative)
+        # the tiles were added at full detail
+        self.update_detail_level()
+        self.build_ready.emit()
 
     def build_tiles(self):
 
         #  default white background surrounded by a black 1 width line
         brush = QtGui.QBrush(QtGui.QColor(255,255,255,255))
         pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.SolidLine)
-       
-        xmax = self.rows * 10 * self.size
-        ymax = self.columns * 10 * self.size
 
-        board = self.add_borders_to_scene(self.rows, self.columns, pen, brush)
+        # a chunked board only draws the chunks in view, which are created when they scroll into view
+        if self.chunked == True:
+            self.board_item = QBoardChunks(self, pen, brush, self.chunk_size)
 
-        unit = self.add_shape_to_scene(2, 5, pen, brush)
-        unit = self.add_shape_to_scene(5, 3, pen, brush)
-        unit = self.add_shape_to_scene(5, 4, pen, brush)
+            # the scene would otherwise only span the chunks created so far
+            self.scene.setSceneRect(self.board_item.rect)
+            return
 
-    def add_borders_to_scene(self, row, column, pen, brush):
+        # a batched board draws all tiles with one graphics item, tiles are created on request
+        if self.batched == True:
+            self.board_item = QBoardItem(self, pen, brush)
+            self.scene.addItem(self.board_item)
+            return
 
-        """
-        Method to easily determine the position of the gameboard
-        """
+        # Create tiles for all the rows and columns
+        row = 1
+        while row <= self.rows:
 
-        # tile size (only perfect squares for now)
-        height = self.size * self.scalemanual * 10
-        width = self.size * self.scalemanual * 10
+            column = 1
+            while column <= self.columns:
 
-    
-        # space between tiles in columns and rows to make a snug fit
-        column_default = self.size * self.scalemanual
-        column_distance = column * column_default
+                """
+                maybe add following to seperate method, so this method can be shape agnostic
+                """
+
+                tile = self.add_shape_to_scene(row, column, pen, brush)
+
+                self.model.set_item(self.model.get_index(row, column), tile)
+
+                column += 1
+            row += 1
+
+    def build_overlays(self):
+
+        """
+        Compiles the overlays into a per tile index and paints the tiles in an overlay
+        with the resulting pen and brush of all overlays they are in
+        """
+
+        self.build_overlay_index()
+
+        # paint all the respective tiles
+        overlay_indices = self.overlay_index.get_masked_indices()
+        self.rebuild_tiles([self.model_tile(index) for index in overlay_indices])
+
+    def build_overlay_index(self):
+
+        self.set_overlay_index(self.create_overlay_index())
+
+    def create_overlay_index(self):
+
+        """
+        Returns a new overlay index of the overlays or the board file, the board itself is left as is
+        """
+
+        #  default white background surrounded by a black 1 width line
+        brush = QtGui.QBrush(QtGui.QColor(255,255,255,255))
+        pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.SolidLine)
+
+        # the overlays of a board file are used as they are, only the styles are converted
+        if self.board_file != None:
+            styles = [(self.create_pen(pen_data), self.create_brush(brush_data)) for pen_data, brush_data in self.board_file.styles]
+            return self.model.create_masked_overlay_index(self.board_file.names, styles, self.board_file.masks, pen, brush)
+
+        # Create overlays
+        return self.model.create_overlay_index(self.overlays, pen, brush)
+
+    def set_overlay_index(self, overlay_index):
+
+        """
+        Makes an overlay index the overlay index of the model and all views of the board
+        """
+
+        self.model.overlay_index = overlay_index
+
+        # all views of the board use the same overlays
+        for view in self.views:
+            view.overlay_index = overlay_index
+            view.overlays = self.overlays
+
+        # steps of the previous overlays do not apply to the new ones
+        if self.history != None:
+            self.history.set_overlay_index(overlay_index)
+
+    def save_board_file(self, path):
+
+        """
+        Saves the dimensions, shape and overlays of the board to a board file, see boardfile.
+        Pens and brushes are saved by their color, width and style.
+        """
+
+        styles = [(self.get_pen_data(pen), self.get_brush_data(brush)) for pen, brush in self.overlay_index.styles]
+        boardfile.save_board_file(path, self.model, styles)
+
+    def export_png(self, path, scale = 1.0, image_size = None, rect = None, background = None):
+
+        """
+        Writes the board to a PNG file without showing it, at scale pixels per scene unit
+        or with image_size pixels on its longest side, see export.export_png. Returns the size of the image.
+        """
+
+        return export.export_png(self, path, scale, image_size, rect, background)
+
+    def export_svg(self, path, scale = 1.0, rect = None):
+
+        """
+        Writes the board to an SVG file without showing it, see export.export_svg
+        """
+
+        return export.export_svg(self, path, scale, rect)
+
+    def get_pen_data(self, pen):
+
+        if pen == None:
+            return None
+
+        return {"color": pen.color().name(QtGui.QColor.HexArgb), "width": pen.widthF(), "style": int(pen.style())}
+
+    def get_brush_data(self, brush):
+
+        if brush == None:
+            return None
+
+        return {"color": brush.color().name(QtGui.QColor.HexArgb), "style": int(brush.style())}
+
+    def create_pen(self, data):
+
+        if data == None:
+            return None
+
+        return QtGui.QPen(QtGui.QColor(data["color"]), data["width"], QtCore.Qt.PenStyle(data["style"]))
+
+    def create_brush(self, data):
+
+        if data == None:
+            return None
+
+        return QtGui.QBrush(QtGui.QColor(data["color"]), QtCore.Qt.BrushStyle(data["style"]))
+
+    def add_overlay_positions(self, name, positions):
+
+        """
+        Adds positions to an overlay and repaints only the tiles that were not in it yet.
+        The overlay index is leading after building the board, the Positions list of the overlay is left as is.
+        """
+
+        with self.edit():
+            changed = self.overlay_index.add_positions(name, self.model.get_indices(positions))
+
+        self.rebuild_tiles([self.model_tile(index) for index in changed])
+
+    def remove_overlay_positions(self, name, positions):
+
+        """
+        Removes positions from an overlay and repaints only the tiles that were in it
+        """
+
+        with self.edit():
+            changed = self.overlay_index.remove_positions(name, self.model.get_indices(positions))
+
+        self.rebuild_tiles([self.model_tile(index) for index in changed])
+
+    def queue_overlay_deltas(self, deltas):
+
+        """
+        Queues a list of (name, [row, column], entered) deltas, the tile enters the overlay when entered is True
+        and leaves it otherwise. The deltas are applied together after delta_window milliseconds.
+        Emit them with the overlay_deltas signal to queue them from another thread.
+        """
+
+        self.pending_deltas.extend(deltas)
+
+        if not self.delta_timer.isActive():
+            self.delta_timer.start(self.delta_window)
+
+    def apply_pending_deltas(self):
+
+        """
+        Applies queued deltas for at most delta_budget milliseconds and continues with the rest on the next event loop pass
+        """
+
+        # the overlays of an asynchronous build may not exist yet
+        if self.ready == False:
+            self.delta_timer.start(self.delta_window)
+            return
+
+        start = time.perf_counter()
+
+        while len(self.pending_deltas) > 0 and (time.perf_counter() - start) * 1000 < self.delta_budget:
+            deltas = [self.pending_deltas.popleft() for number in range(min(256, len(self.pending_deltas)))]
+            self.apply_overlay_deltas(deltas)
+
+        if len(self.pending_deltas) > 0:
+            self.delta_timer.start(0)
+
+    def apply_overlay_deltas(self, deltas):
+
+        """
+        Applies a list of (name, [row, column], entered) deltas right away and repaints only the tiles that changed.
+        When an overlay that blocks the line of sight or has a movement cost changed,
+        the line of sight, movement range and field of view of the selection are calculated again.
+        """
+
+        indexed_deltas = []
+        for name, position, entered in deltas:
+            index = self.model.get_index(position[0], position[1])
+            if index != None:
+                indexed_deltas.append((name, index, entered))
+
+        with self.edit():
+            changed, changed_names = self.overlay_index.apply_deltas(indexed_deltas)
+
+        self.rebuild_tiles([self.model_tile(index) for index in sorted(changed)])
+        self.refresh_selections(changed_names)
+
+    def refresh_selections(self, changed_names):
+
+        """
+        Refreshes the selections of all views of the board when an overlay that blocks the line of sight
+        or has a movement cost is among the changed overlays
+        """
+
+        if len(set(changed_names) & ({"block"} | set(self.pathfinder.costs))) > 0:
+            for view in self.views:
+                view.refresh_selection()
+
+    def enable_history(self, limit = 100):
+
+        """
+        Starts recording overlay edits for undo and redo and returns the history.EditHistory, which keeps the last limit steps.
+        Every call to add_overlay_positions, remove_overlay_positions or apply_overlay_deltas is a step,
+        edits within a with board.edit(name) block are one step together.
+        """
+
+        if self.history == None:
+            edit_history = history.EditHistory(self.overlay_index, limit)
+            for view in self.views:
+                view.history = edit_history
+
+        return self.history
+
+    def disable_history(self):
+
+        if self.history != None:
+            self.history.set_overlay_index(None)
+            for view in self.views:
+                view.history = None
+
+    @contextlib.contextmanager
+    def edit(self, name = ""):
+
+        """
+        Context in which all overlay edits are one undo step, nothing is recorded without a history.
+        When the with block raises, the edits are rolled back and their tiles repainted.
+        """
+
+        self.check_ready()
+
+        if self.history == None:
+            yield
+            return
+
+        self.history.begin(name)
+
+        try:
+            yield
+        except BaseException:
+            self.rebuild_tiles([self.model_tile(index) for index in self.history.rollback()])
+            raise
+
+        self.history.commit()
+
+    def undo(self):
+
+        """
+        Undoes the last edit step and repaints only the tiles it changed, returns the history.EditStep or None
+        """
+
+        self.check_ready()
+
+        step = self.history.undo() if self.history != None else None
+        if step != None:
+            self.repaint_edit_step(step)
+
+        return step
+
+    def redo(self):
+
+        """
+        Redoes the last undone edit step and repaints only the tiles it changed, returns the history.EditStep or None
+        """
+
+        self.check_ready()
+
+        step = self.history.redo() if self.history != None else None
+        if step != None:
+            self.repaint_edit_step(step)
+
+        return step
+
+    def check_ready(self):
+
+        """
+        Raises a RuntimeError while an asynchronous build is running, the overlays can not be changed until build_ready.
+        Overlay deltas are queued instead, see queue_overlay_deltas.
+        """
+
+        if self.ready == False:
+            raise RuntimeError("the board is still building, change its overlays after build_ready")
+
+    def repaint_edit_step(self, step):
+
+        self.rebuild_tiles([self.model_tile(index) for index in step.indices])
+        self.refresh_selections([name for layer, name in enumerate(self.overlay_index.names) if step.mask & (1 << layer)])
+
+    def refresh_selection(self):
+
+        """
+        Calculates the line of sight, movement range and field of view of the selection again
+        """
+
+        if self.selected_tile == None:
+            return
+
+        if self.target_tile != None:
+            self.target_switch(self.target_tile)
+
+        if self.movement_points != None or self.sight_radius != None:
+            self.ranges_removal()
+            self.selection_ranges()
+
+    def rebuild_overlays(self):
+
+        """
+        Compiles the overlays again after changing self.overlays and repaints the tiles that changed.
+        A board opened from a board file takes its overlays from the masks of the file again and repaints every tile.
+        """
+
+        self.check_ready()
+
+        previous_masks = self.overlay_index.masks
+
+        self.build_overlay_index()
+
+        # the new overlay index of a board file shares the masks of the file with the previous one, so changes can not be found
+        if self.board_file != None:
+            changed = range(self.model.count)
+        else:
+            changed = [index for index in range(self.model.count) if self.overlay_index.masks[index] != previous_masks[index]]
+
+        self.rebuild_tiles([self.model_tile(index) for index in changed])
+
+    def rebuild_tiles(self, tiles):
+
+        for tile in tiles:
+            self.rebuild_tile(tile)
+
+    def rebuild_tile(self, tile):
+
+        index = self.get_tile_index(tile)
+
+        # the pen and brush of the overlays of this tile, or the default white background with a black line
+        pen, brush = self.overlay_index.get_style(index)
+
+        # the brush of the selection state of this tile
+        state = self.model.state[index]
+        if state != 0:
+            for flag, state_brush in self.state_brushes.items():
+                if state & flag:
+                    brush = state_brush
+
+        # move tiles in an overlay on top of the background tiles
+        tile.setZValue(1 if self.overlay_index.masks[index] != 0 else 0)
+
+        # repaint the tile
+        self.paint_graphic_item(tile, pen, brush)
+
+    def get_tiles_grid_location(self, tiles):
+
+        coordinate_list = []
+        for tile in tiles:
+            coordinates = self.get_tile_grid_location(tile)
+            coordinate_list.append(coordinates)
+
+        return coordinate_list
+
+    def get_tile(self, row, column):
+        """
+        Returns the tile at the given row and column or None if it is outside of the board
+        """
+
+        if self.board_item != None:
+            return self.board_item.get_tile(row, column)
+
+        return self.model.get_item(self.model.get_index(row, column))
+
+    def get_tile_at(self, position):
+        """
+        Returns the tile at the given scene position or None if there is no tile
+        """
+
+        coordinates = self.get_grid_location_at(position)
+
+        # fall back on searching the scene for shapes without a grid location implementation
+        if coordinates == NotImplemented:
+            if self.board_item != None:
+                return self.board_item.get_tile_at(position)
+
+            return self.scene.itemAt(position, QtGui.QTransform())
+
+        if coordinates == None:
+            return None
+
+        return self.get_tile(coordinates[0], coordinates[1])
+
+    def model_tile(self, index):
+        """
+        Returns the tile of an index of the board model
+        """
+
+        row, column = self.model.get_coordinates(index)
+        return self.get_tile(row, column)
+
+    def get_tile_index(self, tile):
+        """
+        Returns the index of the tile in the board model
+        """
+
+        if isinstance(tile, QBoardTile):
+            return tile.index
+
+        return self.model.get_item_index(tile)
+
+    def get_tile_brush(self, index):
+        """
+        Returns the brush of the tile of an index of the board model, without creating a tile handle
+        """
+
+        if self.board_item != None:
+            return self.board_item.get_tile_brush(index)
+
+        tile = self.model.get_item(index)
+        return tile.brush() if tile != None else None
+
+    def get_tile_grid_location(self, tile):
+
+        index = self.get_tile_index(tile)
+        if index == None:
+            return None
+
+        return self.model.get_coordinates(index)
+
+    def set_tiles_state(self, tiles, flag, enabled = True):
+
+        indices = [self.get_tile_index(tile) for tile in tiles if tile != None]
+
+        for index in indices:
+            state = self.tile_states.get(index, 0)
+            state = state | flag if enabled == True else state & ~flag
+
+            # tiles without state in this view are not stored
+            if state != 0:
+                self.tile_states[index] = state
+            else:
+                self.tile_states.pop(index, None)
+
+            # the state of a tile in the model is the state it has in any of the views of the board
+            for view in self.views:
+                if view is not self:
+                    state |= view.tile_states.get(index, 0)
+
+            self.model.state[index] = state
+
+    def paint_graphic_items(self, graphic_items, pen = None, brush = None):
+
+        if graphic_items != None:
+            for graphic_item in graphic_items:
+                self.paint_graphic_item(graphic_item, pen, brush)
+
+    def paint_graphic_item(self, graphic_item, pen = None, brush = None):
+
+        """
+        Schedules a new pen and / or brush for a tile.
+        All changes to a tile until the next frame are merged, the last pen and brush win,
+        and applied once by flush_repaints.
+        """
+
+        pending = self.pending_repaints.get(graphic_item)
+
+        if pending == None:
+            self.pending_repaints[graphic_item] = [pen, brush]
+
+        else:
+            # the tile was already going to be repainted this frame
+            self.coalesced_repaint_count += 1
+
+            if pen != None:
+                pending[0] = pen
+
+            if brush != None:
+                pending[1] = brush
+
+        if not self.repaint_timer.isActive():
+            self.repaint_timer.start()
+
+    def flush_repaints(self):
+
+        """
+        Applies the scheduled pens and brushes, call directly to apply them before the next frame
+        """
+
+        self.repaint_timer.stop()
+
+        pending_repaints = self.pending_repaints
+        self.pending_repaints = {}
+
+        # tiles of a per item board are drawn with the pen of the level of detail
+        item_detail_level = self.item_detail_level if self.board_item == None else DETAIL_FULL
+
+        for graphic_item, (pen, brush) in pending_repaints.items():
+            if pen != None:
+                graphic_item.setPen(pen if item_detail_level == DETAIL_FULL else self.get_detail_pen(pen, item_detail_level))
+
+            if brush != None:
+                graphic_item.setBrush(brush)
+
+            # a batched board updates all tiles at once below
+            if self.board_item == None:
+                graphic_item.update()
+
+        if self.board_item != None and len(pending_repaints) > 0:
+            self.board_item.update_tiles([tile.index for tile in pending_repaints])
+
+        self.repaint_count += len(pending_repaints)
+
+        # every view of the board shows the repainted tiles
+        if len(pending_repaints) > 0:
+            indices = None
+            for view in self.views:
+                if view.receivers(view.tiles_repainted) > 0:
+                    indices = indices if indices != None else [self.get_tile_index(tile) for tile in pending_repaints]
+                    view.tiles_repainted.emit(indices)
+
+    def set_spans_style(self, spans, pen = None, brush = None):
+
+        """
+        Sets the pen and / or brush of the tiles of (start, stop, step) ranges of tile indices at once.
+        Batched and chunked boards set them a range at a time and update the area once,
+        like any repaint the tiles keep the style until they are rebuilt (add them to an overlay to keep it).
+        """
+
+        self.check_ready()
+
+        # scheduled repaints of these tiles would overwrite the style
+        self.flush_repaints()
+
+        if self.board_item != None:
+            self.board_item.set_spans_style(spans, pen, brush)
+            self.board_item.update_area(self.get_spans_rect(spans))
+
+        else:
+            for index in core.get_span_indices(spans):
+                tile = self.model.get_item(index)
+
+                if pen != None:
+                    tile.setPen(self.get_detail_pen(pen, self.item_detail_level))
+
+                if brush != None:
+                    tile.setBrush(brush)
+
+        self.repaint_count += sum(len(range(start, stop, step)) for start, stop, step in spans)
+
+        # every view of the board shows the repainted tiles
+        indices = None
+        for view in self.views:
+            if view.receivers(view.tiles_repainted) > 0:
+                indices = indices if indices != None else core.get_span_indices(spans)
+                view.tiles_repainted.emit(indices)
+
+    def get_spans_rect(self, spans):
+
+        """
+        Returns the bounding rect of the tiles of (start, stop, step) ranges of tile indices
+        """
+
+        rect = QtCore.QRectF()
+        for start, stop, step in spans:
+            last = stop - 1 - (stop - 1 - start) % step
+            rect = rect.united(self.get_shape_rect(*self.model.get_coordinates(start)))
+            rect = rect.united(self.get_shape_rect(*self.model.get_coordinates(last)))
+
+        return rect
+
+    def create_line_of_sight(self, originobject, targetobject):
+
+        """
+        Returns the tiles between the origin and target tile that the line of sight goes through,
+        in order from the origin
+        """
+
+        origin = self.get_tile_grid_location(originobject)
+        target = self.get_tile_grid_location(targetobject)
+
+        line = self.get_line_of_sight(origin, target)
+        if line == NotImplemented:
+            return []
+
+        # keep the tiles of the line as line of sight and return the tiles in between
+        self.line_of_sight = [self.get_tile(coordinates[0], coordinates[1]) for coordinates in line]
+        colliding_items = [tile for tile in self.line_of_sight if tile != originobject and tile != targetobject]
+
+        return colliding_items
+
+    def get_line_of_sight(self, origin, target, blocking = ("block",)):
+
+        """
+        Returns the coordinates of the tiles a line from the origin to the target coordinates touches,
+        in order from the origin. The line stops at the first tile of an overlay named in blocking.
+        Only the board model is used, so it is cheap enough to call many times without touching the scene.
+        """
+
+        return self.model.get_line_of_sight(origin, target, blocking)
+
+    def get_path(self, origin, target):
+
+        """
+        Returns the coordinates of the cheapest path from the origin to the target coordinates
+        or None if there is none, the movement costs are set on self.pathfinder
+        """
+
+        return self.pathfinder.find_path(origin, target)
+
+    def get_adjacent_tiles(self, target_tile):
+
+        """
+        Returns the tiles adjacent to the tile according to the board model
+        """
+
+        coordinates = self.get_tile_grid_location(target_tile)
+
+        adjacent = self.model.get_adjacent(coordinates)
+        if adjacent == NotImplemented:
+            return NotImplemented
+
+        return [self.get_tile(row, column) for row, column in adjacent]
+
+    def draw_tiles(self, painter, batches, pens, brushes):
+
+        """
+        Draws the tiles of a batched or chunked board at the level of detail of the zoom of the painter,
+        so every view of the board draws them at its own zoom,
+        batches holds the rows and columns of the tiles per (layer, pen index, brush index)
+        """
+
+        detail_level = self.get_detail_level(painter.worldTransform())
+
+        for style in sorted(batches):
+            pen = pens[style[1]]
+            brush = brushes[style[2]]
+
+            # tiles of a few pixels only need their colour, the bounding rect is filled without an outline
+            if detail_level == DETAIL_FILL:
+                for row, column in batches[style]:
+                    painter.fillRect(self.get_shape_rect(row, column), brush)
+
+                continue
+
+            painter.setPen(self.get_detail_pen(pen, detail_level))
+            painter.setBrush(brush)
+
+            for row, column in batches[style]:
+                shape = self.get_shape(row, column)
+
+                if isinstance(shape, QtCore.QRectF):
+                    painter.drawRect(shape)
+                else:
+                    painter.drawPolygon(shape)
+
+    def create_model(self):
+
+        """
+        Overwrite to create the board model with the topology of the kind of shape
+        """
+
+        return core.BoardModel(self.rows, self.columns)
+
+    def create_geometry(self):
+
+        """
+        Overwrite to create the geometry.GridGeometry with the tile positions of the kind of shape,
+        None for a board without one
+        """
+
+        return None
+
+    def add_shape_to_scene(self, row, column, pen, brush):
+
+        """
+        Needs overwrite to implement kind of shape
+        """
+
+        return NotImplemented
+
+    def get_shape(self, row, column):
+
+        """
+        Needs overwrite to implement kind of shape for a batched board,
+        returns the QRectF or QPolygonF of the tile in scene coordinates
+        """
+
+        return NotImplemented
+
+    def get_shape_rect(self, row, column):
+
+        """
+        Returns the bounding rect of the shape of a tile in scene coordinates, empty outside of the board
+        """
+
+        if row < 1 or column < 1 or row > self.rows or column > self.columns:
+            return QtCore.QRectF()
+
+        if self.grid_geometry != None:
+            return QtCore.QRectF(*self.grid_geometry.get_rect(row, column))
+
+        shape = self.get_shape(row, column)
+
+        if isinstance(shape, QtCore.QRectF):
+            return shape
+
+        return shape.boundingRect()
+
+    def get_area_rect(self, first_row, last_row, first_column, last_column):
+
+        """
+        Returns the bounding rect of the tiles from the first to the last row and column
+        """
+
+        # the outer two rows and columns span the whole area, the inner tiles fall within them
+        rect = QtCore.QRectF()
+        outer_rows = {first_row, min(first_row + 1, last_row), max(last_row - 1, first_row), last_row}
+        outer_columns = {first_column, min(first_column + 1, last_column), max(last_column - 1, first_column), last_column}
+
+        for row in outer_rows:
+            for column in range(first_column, last_column + 1):
+                rect = rect.united(self.get_shape_rect(row, column))
+
+        for column in outer_columns:
+            for row in range(first_row, last_row + 1):
+                rect = rect.united(self.get_shape_rect(row, column))
+
+        return rect
+
+    def get_grid_range(self, rect):
+
+        """
+        Returns the first and last row and column of the tiles that could intersect the scene rect,
+        overwrite for a shape specific range, the default is the range of the grid geometry or the whole board
+        """
+
+        if self.grid_geometry != None:
+            return self.grid_geometry.get_grid_range(rect.left(), rect.top(), rect.right(), rect.bottom())
+
+        return 1, self.rows, 1, self.columns
+
+    def get_grid_location_at(self, position):
+
+        """
+        Returns the row and column of the tile at a scene position according to the grid geometry,
+        or None if there is no tile at the position. Needs overwrite for a board without a grid geometry.
+        """
+
+        if self.grid_geometry != None:
+            return self.grid_geometry.get_grid_location(position.x(), position.y())
+
+        return NotImplemented
+
+class QEmptyboard(QGameboard):
+    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True, batched = False, chunked = False, board_file = None, asynchronous = False, shared_board = None):
+        super().__init__(rows, columns, size, overlays, horizontal, relative, batched, chunked, board_file, asynchronous, shared_board)
+
+    def build_tiles(self):
+
+        #  default white background surrounded by a black 1 width line
+        brush = QtGui.QBrush(QtGui.QColor(255,255,255,255))
+        pen = QtGui.QPen(QtGui.QColor(0,0,0), 1, QtCore.Qt.SolidLine)
+       
+        xmax = self.rows * 10 * self.size
+        ymax = self.columns * 10 * self.size
+
+        board = self.add_borders_to_scene(self.rows, self.columns, pen, brush)
+
+        unit = self.add_shape_to_scene(2, 5, pen, brush)
+        unit = self.add_shape_to_scene(5, 3, pen, brush)
+        unit = self.add_shape_to_scene(5, 4, pen, brush)
+
+    def add_borders_to_scene(self, row, column, pen, brush):
+
+        """
+        Method to easily determine the position of the gameboard
+        """
+
+        # tile size (only perfect squares for now)
+        height = self.size * self.scalemanual * 10
+        width = self.size * self.scalemanual * 10
+
+    
+        # space between tiles in columns and rows to make a snug fit
+        column_default = self.size * self.scalemanual
+        column_distance = column * column_default
 
         row_default = self.size * self.scalemanual
         row_distance = row * row_default
@@ -400,12 +1626,9 @@ class QEmptyboard(QGameboard):
         # set screen adjustments
         if self.relative == True:
             # get relative position of tile against center of screen
-            # print(f"center = {self.center}")
 
             screen_offset_x = self.center.x() - ((self.columns / 2) * column_default) + self.shiftfocus.x()
             screen_offset_y = self.center.y() - ((self.rows / 2) * row_default) + self.shiftfocus.y()
-            # print(f"offset x = {screen_offset_x}")
-            # print(f"offset y = {screen_offset_y}")
 
         else:
             # get absolute position of tiles against top and left of screen
@@ -434,240 +1657,254 @@ class QEmptyboard(QGameboard):
         height = self.size * self.scalemanual
         width = self.size * self.scalemanual
 
-    
-        # space between tiles in columns and rows to make a snug fit
-        column_default = self.size * self.scalemanual
-        column_distance = column * column_default
+    
+        # space between tiles in columns and rows to make a snug fit
+        column_default = self.size * self.scalemanual
+        column_distance = column * column_default
+
+        row_default = self.size * self.scalemanual
+        row_distance = row * row_default
+
+        # set screen adjustments
+        if self.relative == True:
+            # get relative position of tile against center of screen
+
+            screen_offset_x = self.center.x() - ((self.columns / 2) * column_default) + self.shiftfocus.x()
+            screen_offset_y = self.center.y() - ((self.rows / 2) * row_default) + self.shiftfocus.y()
+
+        else:
+            # get absolute position of tiles against top and left of screen
+            screen_offset_x = 2 * self.scalemanual
+            screen_offset_y = 2 * self.scalemanual
+
+
+        x = column_distance + screen_offset_x
+        y = row_distance + screen_offset_y
+
+        # We can use the default QRectF object to create a perfectly fine circle
+        circle_shape = QtWidgets.QGraphicsEllipseItem(x, y, width, height)
+
+        # Create the background tile
+        tile = self.scene.addItem(circle_shape)
+        return tile
+
+    def get_adjacent_tiles(self, target_tile):
+        pass
+        
+class QRectangleboard(QGameboard):
+    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True, batched = False, chunked = False, board_file = None, asynchronous = False, shared_board = None):
+        super().__init__(rows, columns, size, overlays, horizontal, relative, batched, chunked, board_file, asynchronous, shared_board)
+
+    def add_shape_to_scene(self, row, column, pen, brush):
+
+        """
+        Method to easily determine the position of a rectangle tile
+        within a gameboard
+        """
+
+        # We can use the default QRectF object to create a perfectly fine square
+        rectangle_shape = self.get_shape(row, column)
+
+        # Create the background tile
+        tile = self.scene.addRect(rectangle_shape, pen, brush)
+        return tile
+
+    def get_shape(self, row, column):
+        return QtCore.QRectF(*self.grid_geometry.get_rect(row, column))
+
+    def get_tile_position(self, row, column):
+
+        """
+        Returns the top left corner of the rectangle tile in scene coordinates
+        """
 
-        row_default = self.size * self.scalemanual
-        row_distance = row * row_default
+        x, y, width, height = self.grid_geometry.get_rect(row, column)
+        return x, y
+
+    def get_screen_offset(self, column_default, row_default):
 
         # set screen adjustments
         if self.relative == True:
             # get relative position of tile against center of screen
-            # print(f"center = {self.center}")
-
             screen_offset_x = self.center.x() - ((self.columns / 2) * column_default) + self.shiftfocus.x()
             screen_offset_y = self.center.y() - ((self.rows / 2) * row_default) + self.shiftfocus.y()
-            # print(f"offset x = {screen_offset_x}")
-            # print(f"offset y = {screen_offset_y}")
 
         else:
             # get absolute position of tiles against top and left of screen
             screen_offset_x = 2 * self.scalemanual
             screen_offset_y = 2 * self.scalemanual
 
+        return screen_offset_x, screen_offset_y
 
-        x = column_distance + screen_offset_x
-        y = row_distance + screen_offset_y
+    def create_model(self):
+        return core.RectangleGrid(self.rows, self.columns)
 
-        # We can use the default QRectF object to create a perfectly fine circle
-        circle_shape = QtWidgets.QGraphicsEllipseItem(x, y, width, height)
+    def create_geometry(self):
 
-        # Create the background tile
-        tile = self.scene.addItem(circle_shape)
-        return tile
+        # tile size (only perfect squares for now), tiles touch so the size is also the space between them
+        tile_size = self.size * self.scalemanual
+        screen_offset_x, screen_offset_y = self.get_screen_offset(tile_size, tile_size)
 
-    def get_adjacent_tiles(self, target_tile):
-        pass
-        
-class QRectangleboard(QGameboard):
-    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True):
-        super().__init__(rows, columns, size, overlays, horizontal, relative)
+        # the geometry places the centers of the tiles, half a tile from the top left corner
+        return geometry.RectangleGeometry(self.rows, self.columns, tile_size, tile_size, screen_offset_x + tile_size / 2, screen_offset_y + tile_size / 2)
+
+class QHexagonboard(QGameboard):
+    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True, batched = False, chunked = False, board_file = None, asynchronous = False, shared_board = None):
+        super().__init__(rows, columns, size, overlays, horizontal, relative, batched, chunked, board_file, asynchronous, shared_board)
 
     def add_shape_to_scene(self, row, column, pen, brush):
 
         """
-        Method to easily determine the position of a rectangle tile
+        Method to easily determine the angle and position of a hexagon tile
         within a gameboard
         """
 
-        # tile size (only perfect squares for now)
-        height = self.size * self.scalemanual
-        width = self.size * self.scalemanual
+        hexagon_shape = self.get_shape(row, column)
 
-    
-        # space between tiles in columns and rows to make a snug fit
-        column_default = self.size * self.scalemanual
-        column_distance = column * column_default
+        # Create the background tile
+        tile = self.scene.addPolygon(hexagon_shape, pen, brush)
+        return tile
 
-        row_default = self.size * self.scalemanual
-        row_distance = row * row_default
+    def get_shape(self, row, column):
+
+        # every hexagon is a copy of the unit hexagon moved to the position of the tile
+        x, y = self.grid_geometry.get_position(row, column)
+        return self.unit_shape.translated(x, y)
+
+    def get_spacing(self):
+
+        """
+        Returns the column distance, row distance and the offset of every other row (horizontal)
+        or column (vertical) between hexagons to make a snug fit.
+        A vertical board is the horizontal board turned a quarter, so rows and columns swap roles.
+        """
+
+        if self.horizontal == True:
+            column_default = (self.size * 1.5) * self.scalemanual
+            row_default = (self.size / 2.353) * self.scalemanual
+            offset = column_default / 2
+
+        else:
+            column_default = (self.size / 2.353) * self.scalemanual
+            row_default = (self.size * 1.5) * self.scalemanual
+            offset = row_default / 2
+
+        return column_default, row_default, offset
+
+    def get_screen_offset(self):
+
+        column_default, row_default, offset = self.get_spacing()
 
         # set screen adjustments
         if self.relative == True:
             # get relative position of tile against center of screen
-            # print(f"center = {self.center}")
-
             screen_offset_x = self.center.x() - ((self.columns / 2) * column_default) + self.shiftfocus.x()
             screen_offset_y = self.center.y() - ((self.rows / 2) * row_default) + self.shiftfocus.y()
-            # print(f"offset x = {screen_offset_x}")
-            # print(f"offset y = {screen_offset_y}")
 
         else:
             # get absolute position of tiles against top and left of screen
             screen_offset_x = 2 * self.scalemanual
             screen_offset_y = 2 * self.scalemanual
 
+        return screen_offset_x, screen_offset_y
 
-        x = column_distance + screen_offset_x
-        y = row_distance + screen_offset_y
+    def get_tile_position(self, row, column):
 
-        # We can use the default QRectF object to create a perfectly fine square
-        rectangle_shape = QtCore.QRectF(x, y, width, height)
+        """
+        Returns the center of the hexagon tile in scene coordinates
+        """
 
-        # Create the background tile
-        tile = self.scene.addRect(rectangle_shape, pen, brush)
-        return tile
+        return self.grid_geometry.get_position(row, column)
 
-    def get_adjacent_tiles(self, target_tile):
-        adjacent_tiles = []
-        coordinates = self.get_tile_grid_location(target_tile)
+    def create_model(self):
+        return core.HexagonGrid(self.rows, self.columns, self.horizontal)
+
+    def create_geometry(self):
 
-        # adjacent coordinates
-        adjacent_offset = [
-            [1,0], # top
-            [0,-1], # left
-            [-1,0], # down
-            [0,1], # right
-        ]
+        column_default, row_default, offset = self.get_spacing()
+        screen_offset_x, screen_offset_y = self.get_screen_offset()
 
+        # tile size
+        radius = (self.size / 2) * self.scalemanual
 
-        for offset in adjacent_offset:
-            adjacent_coordinate = [coordinates[0] + offset[0], coordinates[1] + offset[1]]
-            # print(adjacent_coordinate)
+        return geometry.HexagonGeometry(self.model, radius, column_default, row_default, offset, screen_offset_x, screen_offset_y)
 
-            try:
-                tile = self.map_tile_by_coordinates[f"{adjacent_coordinate[0]}-{adjacent_coordinate[1]}"]
-                adjacent_tiles.append(tile)
-            except:
-                pass
-        
-        return adjacent_tiles
-        
-class QHexagonboard(QGameboard):
-    def __init__(self, rows, columns, size = 4, overlays = [], horizontal = True, relative = True):
-        super().__init__(rows, columns, size, overlays, horizontal, relative)
+def open_board_file(path, size = 4, relative = True, batched = False, chunked = False, asynchronous = False):
+    """
+    Opens a board file and returns a board of its shape with its dimensions and overlays
+    """
 
-    def add_shape_to_scene(self, row, column, pen, brush):
+    board_file = boardfile.load_board_file(path)
 
-        """
-        Method to easily determine the angle and position of a hexagon tile
-        within a gameboard
-        """
-       
-        # tile size
-        radius = (self.size / 2) * self.scalemanual
+    if board_file.shape == "hexagon":
+        board_class = QHexagonboard
+    elif board_file.shape == "rectangle":
+        board_class = QRectangleboard
+    else:
+        raise ValueError(f"board files of shape {board_file.shape} can not be opened as a board")
 
-        if self.horizontal == True:
-            # set the angle of the hexagon
-            angle = 0
-        
-            # space between tiles in columns and rows to make a snug fit
-            column_default = (self.size * 1.5) * self.scalemanual
-            column_offset = column_default / 2
+    return board_class(board_file.rows, board_file.columns, size, [], board_file.horizontal, relative, batched, chunked, board_file, asynchronous)
 
-            column_distance_even = column * column_default
-            column_distance_odd = column * column_default + column_offset
+def remove_view(views, reference, tile_states):
+    """
+    Removes a destroyed view, by the weak reference to it, from the views of its board
+    together with the selection state of the view
+    """
 
-            row_default = (self.size / 2.353) * self.scalemanual
-            row_distance = row * row_default
+    views.remove(reference)
+    if len(views) == 0:
+        return
 
-            # set screen adjustments
-            if self.relative == True:
-                # get relative position of tile against center of screen
-                # print(f"center = {self.center}")
+    # the tiles keep the state they have in the other views
+    board = views[0]
+    for index in tile_states:
+        state = 0
+        for other_view in views:
+            state |= other_view.tile_states.get(index, 0)
+        board.model.state[index] = state
 
-                screen_offset_x = self.center.x() - ((self.columns / 2) * column_default) + self.shiftfocus.x()
-                screen_offset_y = self.center.y() - ((self.rows / 2) * row_default) + self.shiftfocus.y()
-                # print(f"offset x = {screen_offset_x}")
-                # print(f"offset y = {screen_offset_y}")
+    board.rebuild_tiles([board.model_tile(index) for index in tile_states])
+    tile_states.clear()
 
-            else:
-                # get absolute position of tiles against top and left of screen
-                screen_offset_x = 2 * self.scalemanual
-                screen_offset_y = 2 * self.scalemanual
+    # the tiles of a per item board get the pen of the most detailed view left
+    if board.board_item == None:
+        board.update_item_detail_level(max(view.detail_level for view in views))
 
-            # if row number is odd, offset the hexes nicely in between the columns of the previous
-            x = column_distance_even + screen_offset_x if (row % 2) == 0 else column_distance_odd + screen_offset_x
-            y = row_distance + screen_offset_y
+class QBoardViews(object):
+    """
+    The views of a board in the order they were created, the first one is the board that owns the scene.
+    The views are held by weak references, so the board does not keep views alive that are no longer used.
+    """
 
+    def __init__(self, board):
+        self.references = [weakref.ref(board)]
 
-        elif self.horizontal == False:
-            """Needs a lot more work"""
-            # set the angle of the hexagon
-            angle = 90
+    def append(self, view):
+        self.references.append(weakref.ref(view))
 
-            # space between tiles in columns and rows to make a snug fit
-            column_default = 3 * self.scalemanual
-            column_distance = column * column_default
+    def remove(self, reference):
 
-            row_default = 2.5 * self.scalemanual
-            row_offset = 1.5 * self.scalemanual
-            row_distance_even = row * row_default
-            row_distance_odd = row * row_default + row_offset
+        # the reference of a destroyed view, references of collected views are removed along
+        self.references = [other for other in self.references if other is not reference and other() is not None]
 
-            # set screen adjustments
-            if self.relative == True:
-                # get relative position of tile against center of screen
-                # print(f"center = {self.center}")
-                
-                screen_offset_x = self.center.x() - ((self.columns / 2) * (2 * self.scalemanual))
-                screen_offset_y = self.center.y() - ((self.rows / 2) * (2 * self.scalemanual))
-                # print(f"offset x = {screen_offset_x}")
-                # print(f"offset y = {screen_offset_y}")
+    def get_views(self):
 
-            else:
-                # get absolute position of tiles against top and left of screen
-                screen_offset_x = 2 * self.scalemanual
-                screen_offset_y = 2 * self.scalemanual
+        """
+        Returns the views that are still alive
+        """
 
-            # if row number is odd, offset the hexes nicely in between the columns of the previous
-            x = column_distance + screen_offset_x
-            y = row_distance_even + screen_offset_y if (column % 2) == 0 else row_distance_odd + screen_offset_x
+        views = [reference() for reference in self.references]
+        return [view for view in views if view is not None]
 
-        hexagon_shape = QHexagonShape(x, y, radius, angle)
+    def __iter__(self):
+        return iter(self.get_views())
 
-        # Create the background tile
-        tile = self.scene.addPolygon(hexagon_shape, pen, brush)
-        return tile
+    def __len__(self):
+        return len(self.get_views())
 
-    def get_adjacent_tiles(self, target_tile):
-        adjacent_tiles = []
-        coordinates = self.get_tile_grid_location(target_tile)
+    def __getitem__(self, number):
+        return self.get_views()[number]
 
-        # adjacent coordinates
-        if coordinates[0] % 2 == 0:
-            adjacent_offset = [
-                [-2,0], # top
-                [-1,-1], # topleft
-                [1,-1], # leftdown
-                [2,0], # down
-                [1,0], # rightdown
-                [-1,0], # rightup
-            ]
-        else:
-            adjacent_offset = [
-                [-2,0], # top
-                [-1,0], # topleft
-                [1,0], # leftdown
-                [2,0], # down
-                [1,1], # rightdown
-                [-1,1], # rightup
-            ]
-
-        for offset in adjacent_offset:
-            adjacent_coordinate = [coordinates[0] + offset[0], coordinates[1] + offset[1]]
-            # print(adjacent_coordinate)
-
-            try:
-                tile = self.map_tile_by_coordinates[f"{adjacent_coordinate[0]}-{adjacent_coordinate[1]}"]
-                adjacent_tiles.append(tile)
-            except:
-                pass
-        
-        return adjacent_tiles
-        
 class QHexagonShape(QtGui.QPolygonF):
     """
     polygon with number of sides, a radius, angle of the first point
@@ -706,6 +1943,486 @@ class QHexagonShape(QtGui.QPolygonF):
             # add side to polygon
             self.append(QtCore.QPointF(x, y)) 
 
+class QBoardTiles(object):
+    """
+    The tile lookups shared by the batched QBoardItem and the chunked QBoardChunks,
+    which keep the pen, brush and layer of the tiles themselves and hand out QBoardTile handles
+    """
+
+    def get_tile(self, row, column):
+
+        index = self.board.model.get_index(row, column)
+        if index == None:
+            return None
+
+        return QBoardTile(self, index)
+
+    def get_tile_at(self, position):
+
+        # only the tiles around the position are candidates
+        first_row, last_row, first_column, last_column = self.board.get_grid_range(QtCore.QRectF(position, position))
+
+        found_tile = None
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                shape = self.board.get_shape(row, column)
+
+                if isinstance(shape, QtCore.QRectF):
+                    hit = shape.contains(position)
+                else:
+                    hit = shape.containsPoint(position, QtCore.Qt.OddEvenFill)
+
+                if hit == True:
+                    tile = self.get_tile(row, column)
+
+                    # overlapping tiles, the top layer wins
+                    if found_tile == None or tile.zValue() >= found_tile.zValue():
+                        found_tile = tile
+
+        return found_tile
+
+    def get_style_index(self, styles, style):
+
+        for index, known_style in enumerate(styles):
+            if known_style == style:
+                return index
+
+        styles.append(style)
+        return len(styles) - 1
+
+    def get_shape_rect(self, row, column):
+        return self.board.get_shape_rect(row, column)
+
+class QBoardItem(QBoardTiles, QtWidgets.QGraphicsItem):
+    """
+    Single graphics item that draws all the tiles of a batched board
+    instead of adding a graphics item per tile to the scene.
+
+    The pen, brush and layer (z value) of every tile are kept in compact arrays,
+    each distinct pen and brush is only stored once.
+    Only the tiles within the exposed rect are painted.
+    """
+
+    def __init__(self, board, pen, brush):
+        QtWidgets.QGraphicsItem.__init__(self)
+
+        self.board = board
+        self.count = board.rows * board.columns
+
+        # distinct pens and brushes, tiles refer to them by index
+        self.pens = [pen]
+        self.brushes = [brush]
+
+        # style and layer of every tile
+        self.tile_pens = array.array("I", [0]) * self.count
+        self.tile_brushes = array.array("I", [0]) * self.count
+        self.tile_layers = bytearray(self.count)
+
+        # room for the pen around the tiles
+        self.margin = pen.widthF()
+
+        # only paint the exposed part of the board
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)
+
+        self.rect = self.get_board_rect()
+
+    def get_board_rect(self):
+        return self.board.get_area_rect(1, self.board.rows, 1, self.board.columns)
+
+    def boundingRect(self):
+        return self.rect.adjusted(-self.margin, -self.margin, self.margin, self.margin)
+
+    def paint(self, painter, option, widget = None):
+
+        first_row, last_row, first_column, last_column = self.board.get_grid_range(option.exposedRect)
+
+        # gather the exposed tiles per layer, pen and brush so the painter only switches style when needed
+        batches = {}
+        for row in range(first_row, last_row + 1):
+            index = (row - 1) * self.board.columns + first_column - 1
+
+            for column in range(first_column, last_column + 1):
+                style = (self.tile_layers[index], self.tile_pens[index], self.tile_brushes[index])
+                batches.setdefault(style, []).append((row, column))
+                index += 1
+
+        self.board.draw_tiles(painter, batches, self.pens, self.brushes)
+
+    def set_tile_pen(self, index, pen):
+
+        # make room for wider pens
+        if pen.widthF() > self.margin:
+            self.prepareGeometryChange()
+            self.margin = pen.widthF()
+
+        self.tile_pens[index] = self.get_style_index(self.pens, pen)
+
+    def set_tile_brush(self, index, brush):
+        self.tile_brushes[index] = self.get_style_index(self.brushes, brush)
+
+    def set_spans_style(self, spans, pen = None, brush = None):
+
+        if pen != None:
+            # make room for wider pens
+            if pen.widthF() > self.margin:
+                self.prepareGeometryChange()
+                self.margin = pen.widthF()
+
+            pen_index = self.get_style_index(self.pens, pen)
+
+        if brush != None:
+            brush_index = self.get_style_index(self.brushes, brush)
+
+        # a range of tiles at a time
+        for start, stop, step in spans:
+            count = len(range(start, stop, step))
+
+            if pen != None:
+                self.tile_pens[start:stop:step] = array.array("I", [pen_index]) * count
+
+            if brush != None:
+                self.tile_brushes[start:stop:step] = array.array("I", [brush_index]) * count
+
+    def update_area(self, rect):
+        self.update(rect.adjusted(-self.margin, -self.margin, self.margin, self.margin))
+
+    def get_tile_pen(self, index):
+        return self.pens[self.tile_pens[index]]
+
+    def get_tile_brush(self, index):
+        return self.brushes[self.tile_brushes[index]]
+
+    def get_tile_layer(self, index):
+        return self.tile_layers[index]
+
+    def set_tile_layer(self, index, layer):
+        self.tile_layers[index] = layer
+
+    def set_detail_level(self, detail_level):
+
+        # zoomed out the painted tiles are cached as an image that is reused while panning,
+        # at full detail the cache would be redrawn for every zoom step and take most memory
+        if detail_level != DETAIL_FULL:
+            self.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+        else:
+            self.setCacheMode(QtWidgets.QGraphicsItem.NoCache)
+
+        self.update()
+
+    def update_tile(self, index):
+        self.update_tiles([index])
+
+    def update_tiles(self, indices):
+
+        # one update for the area of all tiles
+        rect = QtCore.QRectF()
+        for index in indices:
+            row, column = self.board.model.get_coordinates(index)
+            rect = rect.united(self.get_shape_rect(row, column))
+
+        self.update(rect.adjusted(-self.margin, -self.margin, self.margin, self.margin))
+
+class QBoardChunks(QBoardTiles):
+    """
+    The chunks of a chunked board, for boards too large to draw or even store per tile.
+
+    The board is split in chunks of chunk_size x chunk_size tiles and a QBoardChunk graphics item
+    is only created for the chunks in view, chunks far out of view are released again.
+    Only the graphics items depend on the size of the view: the chunks store just the tiles that differ
+    from the default pen, brush and layer, but the state and overlay masks of the board model are still
+    kept for every tile (about 9 bytes per tile), so memory and startup time do grow with the board.
+    Tiles are returned as QBoardTile handles like on a batched board, also when their chunk does not exist.
+    """
+
+    def __init__(self, board, pen, brush, chunk_size = 32):
+
+        self.board = board
+        self.chunk_size = chunk_size
+        self.chunk_rows = math.ceil(board.rows / chunk_size)
+        self.chunk_columns = math.ceil(board.columns / chunk_size)
+
+        # distinct pens and brushes, tiles refer to them by index
+        self.pens = [pen]
+        self.brushes = [brush]
+
+        # style and layer of the tiles that differ from the defaults
+        self.tile_pens = {}
+        self.tile_brushes = {}
+        self.tile_layers = {}
+
+        # room for the pen around the tiles
+        self.margin = pen.widthF()
+
+        # created chunk items by chunk row and chunk column
+        self.chunks = {}
+
+        self.rect = board.get_area_rect(1, board.rows, 1, board.columns)
+
+    def get_chunk_range(self, rect, margin = 0):
+
+        """
+        Returns the first and last chunk row and column that intersect the scene rect,
+        widened by margin chunks, or None if the rect misses the board
+        """
+
+        first_row, last_row, first_column, last_column = self.board.get_grid_range(rect)
+        if first_row > last_row or first_column > last_column:
+            return None
+
+        return (
+            max((first_row - 1) // self.chunk_size - margin, 0),
+            min((last_row - 1) // self.chunk_size + margin, self.chunk_rows - 1),
+            max((first_column - 1) // self.chunk_size - margin, 0),
+            min((last_column - 1) // self.chunk_size + margin, self.chunk_columns - 1),
+        )
+
+    def get_chunk_key(self, index):
+
+        row, column = divmod(index, self.board.columns)
+        return row // self.chunk_size, column // self.chunk_size
+
+    def update_chunks(self, rects, margin = 1):
+
+        """
+        Creates the chunks within margin chunks of the scene rects (of the views of the board) and releases the chunks
+        further away than margin + 1 of all of them, so scrolling back and forth does not recreate them
+        """
+
+        create_ranges = [self.get_chunk_range(rect, margin) for rect in rects]
+        keep_ranges = [self.get_chunk_range(rect, margin + 1) for rect in rects]
+
+        def in_range(key, chunk_range):
+            return chunk_range != None and chunk_range[0] <= key[0] <= chunk_range[1] and chunk_range[2] <= key[1] <= chunk_range[3]
+
+        # release chunks out of range
+        for key in list(self.chunks):
+            if not any(in_range(key, keep_range) for keep_range in keep_ranges):
+                self.board.scene.removeItem(self.chunks.pop(key))
+
+        # create chunks that came into range
+        for create_range in create_ranges:
+            if create_range == None:
+                continue
+
+            for chunk_row in range(create_range[0], create_range[1] + 1):
+                for chunk_column in range(create_range[2], create_range[3] + 1):
+                    if (chunk_row, chunk_column) not in self.chunks:
+                        chunk = QBoardChunk(self, chunk_row, chunk_column)
+                        self.board.scene.addItem(chunk)
+                        self.chunks[(chunk_row, chunk_column)] = chunk
+
+    def set_tile_style(self, tile_styles, index, style_index):
+
+        # tiles with the default style are not stored
+        if style_index == 0:
+            tile_styles.pop(index, None)
+        else:
+            tile_styles[index] = style_index
+
+    def set_tile_pen(self, index, pen):
+
+        # make room for wider pens
+        if pen.widthF() > self.margin:
+            self.margin = pen.widthF()
+            for chunk in self.chunks.values():
+                chunk.update_rect()
+
+        self.set_tile_style(self.tile_pens, index, self.get_style_index(self.pens, pen))
+
+    def set_tile_brush(self, index, brush):
+        self.set_tile_style(self.tile_brushes, index, self.get_style_index(self.brushes, brush))
+
+    def set_spans_style(self, spans, pen = None, brush = None):
+
+        # make room for wider pens
+        if pen != None and pen.widthF() > self.margin:
+            self.margin = pen.widthF()
+            for chunk in self.chunks.values():
+                chunk.update_rect()
+
+        for tile_styles, styles, style in [(self.tile_pens, self.pens, pen), (self.tile_brushes, self.brushes, brush)]:
+            if style == None:
+                continue
+
+            style_index = self.get_style_index(styles, style)
+
+            # tiles with the default style are not stored
+            for start, stop, step in spans:
+                if style_index == 0:
+                    for index in range(start, stop, step):
+                        tile_styles.pop(index, None)
+                else:
+                    tile_styles.update(dict.fromkeys(range(start, stop, step), style_index))
+
+    def update_area(self, rect):
+
+        for chunk in self.chunks.values():
+            if chunk.boundingRect().intersects(rect):
+                chunk.update()
+
+    def get_tile_pen(self, index):
+        return self.pens[self.tile_pens.get(index, 0)]
+
+    def get_tile_brush(self, index):
+        return self.brushes[self.tile_brushes.get(index, 0)]
+
+    def get_tile_layer(self, index):
+        return self.tile_layers.get(index, 0)
+
+    def set_tile_layer(self, index, layer):
+        self.set_tile_style(self.tile_layers, index, layer)
+
+    def set_detail_level(self, detail_level):
+
+        for chunk in self.chunks.values():
+            chunk.set_detail_level(detail_level)
+
+    def update_tile(self, index):
+        self.update_tiles([index])
+
+    def update_tiles(self, indices):
+
+        # one update per created chunk for the area of its tiles, tiles of other chunks are drawn when their chunk is created
+        rects = {}
+        for index in indices:
+            key = self.get_chunk_key(index)
+            if key in self.chunks:
+                row, column = self.board.model.get_coordinates(index)
+                rects[key] = rects.get(key, QtCore.QRectF()).united(self.get_shape_rect(row, column))
+
+        for key, rect in rects.items():
+            self.chunks[key].update(rect.adjusted(-self.margin, -self.margin, self.margin, self.margin))
+
+class QBoardChunk(QtWidgets.QGraphicsItem):
+    """
+    Graphics item that draws the tiles of one chunk of a chunked board,
+    their styles are kept by the QBoardChunks of the board
+    """
+
+    def __init__(self, chunks, chunk_row, chunk_column):
+        QtWidgets.QGraphicsItem.__init__(self)
+
+        self.chunks = chunks
+        self.board = chunks.board
+
+        # rows and columns of the tiles in this chunk
+        self.first_row = chunk_row * chunks.chunk_size + 1
+        self.last_row = min(self.first_row + chunks.chunk_size - 1, self.board.rows)
+        self.first_column = chunk_column * chunks.chunk_size + 1
+        self.last_column = min(self.first_column + chunks.chunk_size - 1, self.board.columns)
+
+        # only paint the exposed part of the chunk, border tiles of other chunks are cut off at its edge
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setFlag(QtWidgets.QGraphicsItem.ItemClipsToShape)
+
+        self.rect = self.board.get_area_rect(self.first_row, self.last_row, self.first_column, self.last_column)
+        self.margin = chunks.margin
+
+        self.set_detail_level(self.board.detail_level)
+
+    def set_detail_level(self, detail_level):
+
+        # zoomed out the painted tiles are cached as an image that is reused while panning,
+        # at full detail the cache would be redrawn for every zoom step and take most memory
+        if detail_level != DETAIL_FULL:
+            self.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+        else:
+            self.setCacheMode(QtWidgets.QGraphicsItem.NoCache)
+
+        self.update()
+
+    def update_rect(self):
+
+        if self.chunks.margin != self.margin:
+            self.prepareGeometryChange()
+            self.margin = self.chunks.margin
+
+    def boundingRect(self):
+        return self.rect.adjusted(-self.margin, -self.margin, self.margin, self.margin)
+
+    def paint(self, painter, option, widget = None):
+
+        first_row, last_row, first_column, last_column = self.board.get_grid_range(option.exposedRect)
+
+        # the tiles of this chunk and the border tiles of the neighbouring chunks,
+        # which are drawn again when they are on a higher layer as they overlap the tiles of this chunk
+        first_row = max(first_row, self.first_row - 1, 1)
+        last_row = min(last_row, self.last_row + 1, self.board.rows)
+        first_column = max(first_column, self.first_column - 1, 1)
+        last_column = min(last_column, self.last_column + 1, self.board.columns)
+
+        tile_layers = self.chunks.tile_layers
+        tile_pens = self.chunks.tile_pens
+        tile_brushes = self.chunks.tile_brushes
+
+        # gather the exposed tiles per layer, pen and brush so the painter only switches style when needed
+        batches = {}
+        for row in range(first_row, last_row + 1):
+            index = (row - 1) * self.board.columns + first_column - 1
+            inner_row = row >= self.first_row and row <= self.last_row
+
+            for column in range(first_column, last_column + 1):
+                layer = tile_layers.get(index, 0)
+
+                if layer > 0 or (inner_row and column >= self.first_column and column <= self.last_column):
+                    style = (layer, tile_pens.get(index, 0), tile_brushes.get(index, 0))
+                    batches.setdefault(style, []).append((row, column))
+
+                index += 1
+
+        self.board.draw_tiles(painter, batches, self.chunks.pens, self.chunks.brushes)
+
+class QBoardTile(object):
+    """
+    Lightweight handle to a tile of a QBoardItem or QBoardChunks.
+    Supports the pen, brush and z value methods of a tile graphics item
+    so the board can paint it the same way.
+    Handles are created on request, two handles to the same tile are equal.
+    """
+
+    __slots__ = ("board_item", "index")
+
+    def __init__(self, board_item, index):
+        self.board_item = board_item
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, QBoardTile) and other.board_item is self.board_item and other.index == self.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    def __repr__(self):
+        return f"QBoardTile{self.coordinates()}"
+
+    def coordinates(self):
+        return self.board_item.board.model.get_coordinates(self.index)
+
+    def pen(self):
+        return self.board_item.get_tile_pen(self.index)
+
+    def setPen(self, pen):
+        self.board_item.set_tile_pen(self.index, pen)
+
+    def brush(self):
+        return self.board_item.get_tile_brush(self.index)
+
+    def setBrush(self, brush):
+        self.board_item.set_tile_brush(self.index, brush)
+
+    def zValue(self):
+        return self.board_item.get_tile_layer(self.index)
+
+    def setZValue(self, z):
+        self.board_item.set_tile_layer(self.index, int(z))
+
+    def boundingRect(self):
+        row, column = self.coordinates()
+        return self.board_item.get_shape_rect(row, column)
+
+    def update(self):
+        self.board_item.update_tile(self.index)
+
 def test_empty_board():
 
     app()
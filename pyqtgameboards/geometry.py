@@ -0,0 +1,319 @@
+"""
+Qt independent geometry of the tiles of a board
+
+All tiles of a board are the same unit shape moved to the position of the tile,
+so the shape is computed once per board and the positions of all rows and columns are computed
+at once as arrays. Placing a tile is then two lookups without any trigonometry,
+and the geometry converts scene positions back to rows and columns exactly.
+Like core this module does not import Qt.
+
+    geometry = HexagonGeometry(grid, radius = 20, column_spacing = 60, row_spacing = 17, shift = 30)
+    geometry.get_position(4, 4)
+    geometry.get_grid_location(250.0, 80.0)
+    geometry.get_pixel_grid().get_tile_pixel(4, 4)
+"""
+
+import array
+import math
+
+
+class GridGeometry(object):
+    """
+    Positions of the tiles of a board of rows and columns in scene coordinates.
+
+    The center of the tile at row and column is
+        x = x_by_column[column] + x_shift_by_row[row % 2]
+        y = y_by_row[row] + y_shift_by_column[column % 2]
+    so every other row (or column) can be shifted, like on a hexagon board.
+    The unit shape is given by its corner points around the center of a tile.
+    """
+
+    def __init__(self, rows, columns, column_spacing, row_spacing, origin_x, origin_y, unit_points, x_shift = 0, y_shift = 0):
+
+        self.rows = rows
+        self.columns = columns
+        self.column_spacing = column_spacing
+        self.row_spacing = row_spacing
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+
+        # positions of all rows and columns, index 0 is left unused as rows and columns start at 1
+        self.x_by_column = array.array("d", [origin_x + column * column_spacing for column in range(columns + 1)])
+        self.y_by_row = array.array("d", [origin_y + row * row_spacing for row in range(rows + 1)])
+
+        # shift of even and odd rows and columns
+        self.x_shift_by_row = (0, x_shift)
+        self.y_shift_by_column = (0, y_shift)
+
+        # corner points of the unit shape around the center and their bounding box
+        self.unit_points = unit_points
+        self.unit_left = min(x for x, y in unit_points)
+        self.unit_top = min(y for x, y in unit_points)
+        self.unit_right = max(x for x, y in unit_points)
+        self.unit_bottom = max(y for x, y in unit_points)
+
+    def get_position(self, row, column):
+        """
+        Returns the center of the tile at row and column
+        """
+
+        return self.x_by_column[column] + self.x_shift_by_row[row % 2], self.y_by_row[row] + self.y_shift_by_column[column % 2]
+
+    def get_positions(self, first_row = 1, last_row = None, first_column = 1, last_column = None):
+        """
+        Returns two arrays with the x and y of the centers of the tiles from the first to the last row and column,
+        in the order of the tile indices, by default of the whole board
+        """
+
+        last_row = self.rows if last_row == None else last_row
+        last_column = self.columns if last_column == None else last_column
+
+        x_by_column = self.x_by_column[first_column:last_column + 1]
+        y_by_row = self.y_by_row
+
+        # the x of a row only depends on whether the row is even or odd, the y of a column on the same for the column
+        x_by_parity = [array.array("d", [x + shift for x in x_by_column]) for shift in self.x_shift_by_row]
+        y_shifts = array.array("d", [self.y_shift_by_column[column % 2] for column in range(first_column, last_column + 1)])
+
+        xs = array.array("d")
+        ys = array.array("d")
+        for row in range(first_row, last_row + 1):
+            xs.extend(x_by_parity[row % 2])
+            ys.extend(array.array("d", [y_by_row[row] + shift for shift in y_shifts]))
+
+        return xs, ys
+
+    def get_rect(self, row, column):
+        """
+        Returns the bounding box of the tile at row and column as left, top, width and height
+        """
+
+        x, y = self.get_position(row, column)
+        return x + self.unit_left, y + self.unit_top, self.unit_right - self.unit_left, self.unit_bottom - self.unit_top
+
+    def get_grid_range(self, left, top, right, bottom):
+        """
+        Returns the first and last row and column of the tiles that could intersect the rect
+        """
+
+        # widen the rect by the unit shape and the shifts to catch partially covered tiles
+        first_row = math.floor((top - self.unit_bottom - max(self.y_shift_by_column) - self.origin_y) / self.row_spacing)
+        last_row = math.ceil((bottom - self.unit_top - min(self.y_shift_by_column) - self.origin_y) / self.row_spacing)
+        first_column = math.floor((left - self.unit_right - max(self.x_shift_by_row) - self.origin_x) / self.column_spacing)
+        last_column = math.ceil((right - self.unit_left - min(self.x_shift_by_row) - self.origin_x) / self.column_spacing)
+
+        return max(first_row, 1), min(last_row, self.rows), max(first_column, 1), min(last_column, self.columns)
+
+    def get_grid_location(self, x, y):
+        """
+        Needs overwrite to convert a scene position to the row and column of the tile under it
+        """
+
+        return NotImplemented
+
+    def contains(self, row, column, x, y):
+        """
+        Returns if the position is within the (convex) shape of the tile at row and column, edges included
+        """
+
+        center_x, center_y = self.get_position(row, column)
+        x -= center_x
+        y -= center_y
+
+        # the position is on the same side of every edge
+        sides = set()
+        for number, (start_x, start_y) in enumerate(self.unit_points):
+            end_x, end_y = self.unit_points[(number + 1) % len(self.unit_points)]
+
+            cross = (end_x - start_x) * (y - start_y) - (end_y - start_y) * (x - start_x)
+            if cross != 0:
+                sides.add(cross > 0)
+
+        return len(sides) <= 1
+
+    def get_spans_in_polygon(self, points):
+        """
+        Returns the tiles with their center within the polygon of (x, y) points (odd even rule)
+        as (start, stop, step) ranges of tile indices, see core.get_span_indices.
+
+        The polygon is crossed row by row, so the time depends on the rows and corners of the polygon
+        instead of the number of tiles in it.
+        """
+
+        if len(points) < 3:
+            return []
+
+        first_row, last_row, first_column, last_column = self.get_grid_range(
+            min(x for x, y in points), min(y for x, y in points), max(x for x, y in points), max(y for x, y in points))
+        edges = list(zip(points, points[1:] + points[:1]))
+
+        # with shifted columns the even and odd columns of a row are at another height and are crossed apart
+        parities = [None] if self.y_shift_by_column[1] == 0 else [0, 1]
+
+        spans = []
+        for row in range(first_row, last_row + 1):
+            x_origin = self.origin_x + self.x_shift_by_row[row % 2]
+            row_start = (row - 1) * self.columns - 1
+
+            for parity in parities:
+                y = self.y_by_row[row] + (self.y_shift_by_column[parity] if parity != None else 0)
+
+                # x of the edges crossing the height of the centers, in order
+                crossings = []
+                for (start_x, start_y), (end_x, end_y) in edges:
+                    if (start_y <= y) != (end_y <= y):
+                        crossings.append(start_x + (y - start_y) * (end_x - start_x) / (end_y - start_y))
+                crossings.sort()
+
+                # the centers between every pair of crossings are within the polygon
+                for left, right in zip(crossings[0::2], crossings[1::2]):
+                    first = max(math.ceil((left - x_origin) / self.column_spacing), 1)
+                    last = min(math.floor((right - x_origin) / self.column_spacing), self.columns)
+                    step = 1
+
+                    if parity != None:
+                        first += (first - parity) % 2
+                        step = 2
+
+                    if first <= last:
+                        spans.append((row_start + first, row_start + last + 1, step))
+
+        return spans
+
+    def get_spans_in_rect(self, left, top, right, bottom):
+        """
+        Returns the tiles with their center within the rect as (start, stop, step) ranges of tile indices
+        """
+
+        return self.get_spans_in_polygon([(left, top), (right, top), (right, bottom), (left, bottom)])
+
+    def get_pixel_grid(self):
+        """
+        Returns the PixelGrid of an image with a pixel per tile over the board, like the fog and heatmap layers draw
+        """
+
+        return PixelGrid(self)
+
+    def in_board(self, row, column):
+        return row >= 1 and column >= 1 and row <= self.rows and column <= self.columns
+
+
+class PixelGrid(object):
+    """
+    Size and place of an image over a board with a pixel per tile, scaled over the tiles.
+
+    Shifted rows (or columns) are half a tile apart, so on that axis the image gets two pixels per tile
+    and a tile covers the two pixels at its center. The image then is a pixel longer than the tiles on that axis.
+    """
+
+    def __init__(self, geometry):
+
+        self.x_pixels = 2 if geometry.x_shift_by_row[1] != 0 else 1
+        self.y_pixels = 2 if geometry.y_shift_by_column[1] != 0 else 1
+
+        self.width = geometry.columns * self.x_pixels + self.x_pixels - 1
+        self.height = geometry.rows * self.y_pixels + self.y_pixels - 1
+
+        # a pixel is a tile (or half a tile) wide and high, the image starts at the edge of the first tile
+        self.pixel_width = geometry.column_spacing / self.x_pixels
+        self.pixel_height = geometry.row_spacing / self.y_pixels
+        self.left = geometry.x_by_column[1] - geometry.column_spacing / 2
+        self.top = geometry.y_by_row[1] - geometry.row_spacing / 2
+
+    def get_tile_pixel(self, row, column):
+        """
+        Returns the x and y of the top left pixel of the tile at row and column,
+        shifted by a pixel on the odd rows (or columns) counted from 0
+        """
+
+        x = (column - 1) * self.x_pixels + (1 if self.x_pixels == 2 and row % 2 == 1 else 0)
+        y = (row - 1) * self.y_pixels + (1 if self.y_pixels == 2 and column % 2 == 1 else 0)
+
+        return x, y
+
+    def get_rect(self, x = 0, y = 0, width = None, height = None):
+        """
+        Returns the scene rect of an area of pixels as left, top, width and height, by default of the whole image
+        """
+
+        width = self.width if width == None else width
+        height = self.height if height == None else height
+
+        return self.left + x * self.pixel_width, self.top + y * self.pixel_height, width * self.pixel_width, height * self.pixel_height
+
+
+class RectangleGeometry(GridGeometry):
+    """
+    Geometry of a board of rectangles that touch each other
+    """
+
+    def __init__(self, rows, columns, width, height, origin_x, origin_y):
+
+        unit_points = [(-width / 2, -height / 2), (width / 2, -height / 2), (width / 2, height / 2), (-width / 2, height / 2)]
+        super().__init__(rows, columns, width, height, origin_x, origin_y, unit_points)
+
+    def get_grid_location(self, x, y):
+
+        # tiles span from half a tile before their center up to half a tile after it
+        row = math.floor((y - self.origin_y) / self.row_spacing + 0.5)
+        column = math.floor((x - self.origin_x) / self.column_spacing + 0.5)
+
+        if not self.in_board(row, column):
+            return None
+
+        return [row, column]
+
+
+class HexagonGeometry(GridGeometry):
+    """
+    Geometry of a board of hexagons, see core.HexagonGrid for the layout of the rows and columns.
+
+    On a horizontal board every odd row is shifted half a column to the right,
+    on a vertical board every odd column is shifted half a row down.
+    """
+
+    def __init__(self, grid, radius, column_spacing, row_spacing, shift, origin_x, origin_y):
+
+        self.grid = grid
+
+        # a horizontal hexagon has a flat top, a vertical hexagon is turned a quarter and has a pointy top
+        angle = 0 if grid.horizontal == True else 90
+        unit_points = []
+        for side in range(6):
+            corner = math.radians(60 * side + angle)
+            unit_points.append((radius * math.cos(corner), radius * math.sin(corner)))
+
+        if grid.horizontal == True:
+            super().__init__(grid.rows, grid.columns, column_spacing, row_spacing, origin_x, origin_y, unit_points, x_shift = shift)
+        else:
+            super().__init__(grid.rows, grid.columns, column_spacing, row_spacing, origin_x, origin_y, unit_points, y_shift = shift)
+
+    def get_grid_location(self, x, y):
+        """
+        Converts a scene position to the row and column of the hexagon under it.
+
+        The position is turned into fractional cube coordinates of the hexagon grid
+        and rounded to the nearest hexagon, so it takes the same time for any board.
+        """
+
+        # position in rows and columns, the rows (horizontal) or columns (vertical) are half hexagons apart
+        row = (y - self.origin_y) / self.row_spacing
+        column = (x - self.origin_x) / self.column_spacing
+
+        if self.grid.horizontal == True:
+            q = 2 * column
+            r = (row - q) / 2
+        else:
+            q = 2 * row
+            r = (column - q) / 2
+
+        q, r, s = self.grid.round_cube(q, r, -q - r)
+
+        # hexagons overlap slightly, so at the edge of the board a neighbour of the nearest hexagon can hold the position
+        for q_offset, r_offset in [(0, 0), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]:
+            row, column = self.grid.get_grid_coordinates(q + q_offset, r + r_offset)
+
+            if self.in_board(row, column) and self.contains(row, column, x, y):
+                return [row, column]
+
+        return None
@@ -0,0 +1,216 @@
+"""
+Heatmaps of values over a gameboard
+
+QHeatmapLayer draws a rows x columns array of numbers, like an influence or threat map, as one image over the board
+instead of an overlay per value. The colors of the tiles are written by numpy straight into the memory
+the image is drawn from, so setting all values costs a few array operations and no Qt call per tile.
+Like the fog of war the image has a pixel per tile (two on the shifted axis of a hexagon board) and is scaled over the board.
+Not a number (nan) leaves a tile uncolored.
+
+This module needs numpy (pip install numpy), the rest of the package does not.
+
+    heatmap = QHeatmapLayer(board, minimum = 0, maximum = 10)
+    heatmap.set_values(threat)
+    heatmap.set_values(threat[4:8, 10:20], row = 5, column = 11)
+"""
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# from cold to hot, half transparent so the tiles stay visible
+DEFAULT_COLORMAP = [
+    (0.0, QtGui.QColor(0,0,255,150)),
+    (0.5, QtGui.QColor(0,255,0,150)),
+    (0.75, QtGui.QColor(255,255,0,150)),
+    (1.0, QtGui.QColor(255,0,0,150)),
+]
+
+
+def get_color_table(colormap):
+
+    """
+    Returns the 256 premultiplied argb colors of a colormap of (position, color) stops between 0 and 1,
+    the first entry is transparent for tiles without a value
+    """
+
+    gradient = QtGui.QLinearGradient(0, 0, 255, 0)
+    for position, color in colormap:
+        gradient.setColorAt(position, QtGui.QColor(color))
+
+    # the gradient is drawn on an image of a line, its pixels are the colors of the values
+    image = QtGui.QImage(255, 1, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(image)
+    painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+    painter.fillRect(0, 0, 255, 1, gradient)
+    painter.end()
+
+    table = numpy.zeros(256, dtype = numpy.uint32)
+    table[1:] = [image.pixel(x, 0) for x in range(255)]
+
+    # pixel returns unpremultiplied colors
+    alpha = table >> 24
+    for shift in [0, 8, 16]:
+        channel = (table >> shift) & 0xff
+        table = (table & ~numpy.uint32(0xff << shift)) | ((channel * alpha // 255) << shift)
+
+    return table
+
+
+class QHeatmapLayer(QtWidgets.QGraphicsObject):
+    """
+    Graphics item over the tiles of a board with the grid geometry of a rectangle or hexagon board,
+    values between minimum and maximum are colored by the colormap. It adds itself to the scene of the board.
+    """
+
+    def __init__(self, board, minimum = 0.0, maximum = 1.0, colormap = DEFAULT_COLORMAP, smooth = True):
+        QtWidgets.QGraphicsObject.__init__(self)
+
+        if numpy == None:
+            raise ImportError("QHeatmapLayer needs numpy, install it with pip install numpy")
+
+        self.board = board
+        self.minimum = minimum
+        self.maximum = maximum
+        self.smooth = smooth
+
+        # the values per tile, row and column 1 is values[0, 0]
+        self.values = numpy.full((board.rows, board.columns), numpy.nan, dtype = numpy.float32)
+        self.color_table = get_color_table(colormap)
+
+        self.setup_image()
+
+        # over the tiles and under the units, without catching the mouse
+        self.setZValue(5)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        board.scene.addItem(self)
+
+    def setup_image(self):
+
+        # a pixel per tile, two on the shifted axis of a hexagon board
+        self.pixel_grid = self.board.grid_geometry.get_pixel_grid()
+        width, height = self.pixel_grid.width, self.pixel_grid.height
+
+        # the image is drawn from the memory of the buffer, the buffer has to live as long as the image
+        self.buffer = numpy.zeros((height, width), dtype = numpy.uint32)
+        self.image = QtGui.QImage(self.buffer.data, width, height, width * 4, QtGui.QImage.Format_ARGB32_Premultiplied)
+
+        self.rect = QtCore.QRectF(*self.pixel_grid.get_rect())
+
+    def boundingRect(self):
+        return self.rect
+
+    def set_values(self, values, row = 1, column = 1):
+
+        """
+        Sets the values of the tiles from a 2d array, the first value is of the tile at row and column
+        and the array covers as many rows and columns as it has. Only the area of those tiles is drawn again.
+        """
+
+        values = numpy.asarray(values, dtype = numpy.float32)
+        if values.ndim != 2:
+            raise ValueError(f"values need 2 dimensions (rows, columns), got {values.ndim}")
+
+        first_row = row - 1
+        first_column = column - 1
+        last_row = first_row + values.shape[0]
+        last_column = first_column + values.shape[1]
+
+        if first_row < 0 or first_column < 0 or last_row > self.board.rows or last_column > self.board.columns:
+            raise ValueError(f"values of {values.shape[0]} x {values.shape[1]} tiles at [{row}, {column}] do not fit on the board")
+
+        self.values[first_row:last_row, first_column:last_column] = values
+        self.draw_tiles(first_row, last_row, first_column, last_column)
+
+    def set_range(self, minimum, maximum):
+
+        """
+        Colors the values between minimum and maximum again, values outside the range get the colors of its ends
+        """
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.draw_tiles(0, self.board.rows, 0, self.board.columns)
+
+    def set_colormap(self, colormap):
+
+        self.color_table = get_color_table(colormap)
+        self.draw_tiles(0, self.board.rows, 0, self.board.columns)
+
+    def clear(self):
+
+        self.values.fill(numpy.nan)
+        self.draw_tiles(0, self.board.rows, 0, self.board.columns)
+
+    def get_colors(self, values):
+
+        """
+        Returns the premultiplied argb colors of an array of values
+        """
+
+        # values to entries 1 to 255 of the color table, nan to the transparent entry 0
+        scale = 254 / (self.maximum - self.minimum) if self.maximum != self.minimum else 0
+        entries = numpy.clip((values - self.minimum) * scale, 0, 254)
+        entries = numpy.where(numpy.isnan(entries), -1, entries + 0.5).astype(numpy.int16) + 1
+
+        return self.color_table[entries]
+
+    def draw_tiles(self, first_row, last_row, first_column, last_column):
+
+        """
+        Writes the colors of the tiles in the rows and columns (counted from 0, last ones excluded) into the image
+        and updates their area once
+        """
+
+        if last_row <= first_row or last_column <= first_column:
+            return
+
+        colors = self.get_colors(self.values[first_row:last_row, first_column:last_column])
+
+        x_pixels, y_pixels = self.pixel_grid.x_pixels, self.pixel_grid.y_pixels
+
+        if x_pixels == 2:
+            write_shifted(self.buffer, colors, first_row, first_column)
+        elif y_pixels == 2:
+            # the same with rows and columns swapped
+            write_shifted(self.buffer.T, colors.T, first_column, first_row)
+        else:
+            self.buffer[first_row:last_row, first_column:last_column] = colors
+
+        # a pixel more around the tiles for the smooth edge
+        self.update(QtCore.QRectF(*self.pixel_grid.get_rect(
+            first_column * x_pixels - 1,
+            first_row * y_pixels - 1,
+            (last_column - first_column) * x_pixels + 2,
+            (last_row - first_row) * y_pixels + 2,
+        )))
+
+    def paint(self, painter, option, widget = None):
+
+        if self.smooth == True:
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+
+        painter.drawImage(self.rect, self.image)
+
+
+def write_shifted(buffer, colors, first_line, first_tile):
+
+    """
+    Writes colors of tiles into the pixels of the lines of a buffer with two pixels per tile,
+    on lines 0, 2, 4 ... the tiles are shifted by one pixel
+    """
+
+    lines, tiles = colors.shape
+    doubled = numpy.repeat(colors, 2, axis = 1)
+
+    for parity in [0, 1]:
+        # the lines of this parity among the lines of the colors
+        start = (parity - first_line) % 2
+        x = first_tile * 2 + (1 if parity == 0 else 0)
+        buffer[first_line + start:first_line + lines:2, x:x + 2 * tiles] = doubled[start::2]
@@ -0,0 +1,281 @@
+"""
+Minimap overview of a gameboard
+
+QMinimap shows the whole board as a small image that is drawn from the tile styles of the board
+instead of from the scene, so it also covers the chunks of a chunked board that were not created.
+On a board with more tiles than pixels only one tile per pixel is drawn.
+The board is split in regions of tiles and only the regions with repainted tiles are drawn again,
+a moment later and in slices of a few milliseconds, so the frames of the board itself are not slowed down.
+The view of the board is shown as a rect on top, clicking or dragging on the minimap moves the view.
+
+    minimap = QMinimap(board, image_size = 200)
+    layout.addWidget(minimap)
+"""
+
+import math
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class QMinimap(QtWidgets.QWidget):
+    """
+    Overview of a board with the grid geometry of a rectangle or hexagon board,
+    the longest side of the image is image_size pixels
+    """
+
+    def __init__(self, board, image_size = 200, parent = None):
+        QtWidgets.QWidget.__init__(self, parent)
+
+        self.board = board
+        self.image_size = image_size
+
+        # a region is region_tiles x region_tiles drawn tiles
+        self.region_tiles = 32
+
+        # repainted regions are drawn render_delay milliseconds after the first change,
+        # in slices of at most render_budget milliseconds
+        self.render_delay = 100
+        self.render_budget = 4
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.timeout.connect(self.render_regions)
+
+        # outline of the view of the board
+        self.view_pen = QtGui.QPen(QtGui.QColor(255,0,0), 2)
+
+        self.image = None
+        self.dirty_regions = {}
+        self.setup_image()
+
+        # follow the tiles and the view of the board
+        board.tiles_repainted.connect(self.add_dirty_tiles)
+        board.build_ready.connect(self.setup_image)
+        for scrollbar in [board.horizontalScrollBar(), board.verticalScrollBar()]:
+            scrollbar.valueChanged.connect(self.update)
+            scrollbar.rangeChanged.connect(self.update)
+        board.viewport().installEventFilter(self)
+
+    def setup_image(self):
+
+        """
+        Creates an empty image for the board and draws all of it again, call after the shape of the board changed
+        """
+
+        self.board_rect = self.board.get_area_rect(1, self.board.rows, 1, self.board.columns)
+        self.scale = self.image_size / max(self.board_rect.width(), self.board_rect.height(), 1)
+
+        width = max(math.ceil(self.board_rect.width() * self.scale), 1)
+        height = max(math.ceil(self.board_rect.height() * self.scale), 1)
+        self.image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        self.image.fill(QtCore.Qt.transparent)
+
+        # with more tiles than pixels only every step-th row and column is drawn, over step x step tiles
+        tile_rect = self.board.get_shape_rect(1, 1)
+        self.tile_pixels = min(tile_rect.width(), tile_rect.height()) * self.scale
+        self.step = math.ceil(1 / self.tile_pixels) if self.tile_pixels > 0 and self.tile_pixels < 1 else 1
+        self.region_size = self.region_tiles * self.step
+
+        self.setFixedSize(width, height)
+        self.invalidate()
+
+    def invalidate(self):
+
+        """
+        Draws the whole board again
+        """
+
+        self.dirty_regions = {}
+        for region_row in range(math.ceil(self.board.rows / self.region_size)):
+            for region_column in range(math.ceil(self.board.columns / self.region_size)):
+                self.dirty_regions[(region_row, region_column)] = None
+
+        self.schedule_render()
+
+    def add_dirty_tiles(self, indices):
+
+        """
+        Marks the regions of repainted tiles to be drawn again
+        """
+
+        columns = self.board.columns
+        region_size = self.region_size
+
+        # tiles close to the edge of a region overlap the neighbouring region
+        border = 2 * self.step
+        last_region_row = (self.board.rows - 1) // region_size
+        last_region_column = (columns - 1) // region_size
+
+        for index in indices:
+            row, column = divmod(index, columns)
+            region_row, row_offset = divmod(row, region_size)
+            region_column, column_offset = divmod(column, region_size)
+
+            self.dirty_regions[(region_row, region_column)] = None
+
+            if row_offset < border and region_row > 0:
+                self.dirty_regions[(region_row - 1, region_column)] = None
+            if row_offset >= region_size - border and region_row < last_region_row:
+                self.dirty_regions[(region_row + 1, region_column)] = None
+            if column_offset < border and region_column > 0:
+                self.dirty_regions[(region_row, region_column - 1)] = None
+            if column_offset >= region_size - border and region_column < last_region_column:
+                self.dirty_regions[(region_row, region_column + 1)] = None
+
+        self.schedule_render()
+
+    def schedule_render(self):
+
+        if len(self.dirty_regions) > 0 and not self.render_timer.isActive():
+            self.render_timer.start(self.render_delay)
+
+    def render_regions(self):
+
+        """
+        Draws the dirty regions on the image until the render budget is spent
+        """
+
+        # a hidden minimap is drawn when it is shown
+        if not self.isVisible():
+            return
+
+        start = time.perf_counter()
+
+        painter = QtGui.QPainter(self.image)
+        painter.scale(self.scale, self.scale)
+        painter.translate(-self.board_rect.left(), -self.board_rect.top())
+
+        while len(self.dirty_regions) > 0 and (time.perf_counter() - start) * 1000 < self.render_budget:
+            region = next(iter(self.dirty_regions))
+            del self.dirty_regions[region]
+            self.render_region(painter, region)
+
+        painter.end()
+        self.update()
+
+        # continue with the next slice after the event loop had its turn
+        if len(self.dirty_regions) > 0:
+            self.render_timer.start(0)
+
+    def get_region_rect(self, first_row, last_row, first_column, last_column):
+
+        # the two outer rows and columns at both corners cover the shifted rows or columns of a hexagon board
+        rect = QtCore.QRectF()
+        for row, column in [(first_row, first_column), (min(first_row + 1, last_row), min(first_column + 1, last_column)),
+                            (max(last_row - 1, first_row), max(last_column - 1, first_column)), (last_row, last_column),
+                            (first_row, last_column), (last_row, first_column)]:
+            rect = rect.united(self.board.get_shape_rect(row, column))
+
+        return rect
+
+    def render_region(self, painter, region):
+
+        board = self.board
+        step = self.step
+
+        first_row = region[0] * self.region_size + 1
+        last_row = min(first_row + self.region_size - 1, board.rows)
+        first_column = region[1] * self.region_size + 1
+        last_column = min(first_column + self.region_size - 1, board.columns)
+
+        # clear the region and draw its tiles and the tiles of the neighbouring regions that reach into it
+        rect = self.get_region_rect(first_row, last_row, first_column, last_column)
+
+        painter.save()
+        painter.setClipRect(rect)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.fillRect(rect, QtCore.Qt.transparent)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+        painter.setPen(QtCore.Qt.NoPen)
+
+        # tiles of several pixels are drawn in their shape, smaller ones as the rect of step x step tiles
+        draw_shapes = step == 1 and self.tile_pixels >= 4
+
+        for row in range(max(first_row - step, 1), min(last_row + step, board.rows) + 1, step):
+            index = (row - 1) * board.columns + max(first_column - step, 1) - 1
+
+            for column in range(max(first_column - step, 1), min(last_column + step, board.columns) + 1, step):
+                brush = board.get_tile_brush(index)
+                index += step
+
+                if brush == None or brush.style() == QtCore.Qt.NoBrush:
+                    continue
+
+                if draw_shapes == True:
+                    shape = board.get_shape(row, column)
+                    painter.setBrush(brush.color())
+
+                    if isinstance(shape, QtCore.QRectF):
+                        painter.drawRect(shape)
+                    else:
+                        painter.drawPolygon(shape)
+
+                else:
+                    tile_rect = board.get_shape_rect(row, column).united(board.get_shape_rect(min(row + step - 1, board.rows), min(column + step - 1, board.columns)))
+                    painter.fillRect(tile_rect, brush.color())
+
+        painter.restore()
+
+    def get_image_offset(self):
+
+        # the image is centered in the widget
+        return QtCore.QPointF((self.width() - self.image.width()) / 2, (self.height() - self.image.height()) / 2)
+
+    def map_to_scene(self, position):
+
+        """
+        Returns the scene position of the board at a position on the minimap
+        """
+
+        offset = self.get_image_offset()
+        return QtCore.QPointF((position.x() - offset.x()) / self.scale + self.board_rect.left(), (position.y() - offset.y()) / self.scale + self.board_rect.top())
+
+    def map_from_scene(self, position):
+
+        """
+        Returns the position on the minimap of a scene position of the board
+        """
+
+        offset = self.get_image_offset()
+        return QtCore.QPointF((position.x() - self.board_rect.left()) * self.scale + offset.x(), (position.y() - self.board_rect.top()) * self.scale + offset.y())
+
+    def get_view_rect(self):
+
+        """
+        Returns the rect of the view of the board on the minimap
+        """
+
+        view_rect = self.board.mapToScene(self.board.viewport().rect()).boundingRect()
+        return QtCore.QRectF(self.map_from_scene(view_rect.topLeft()), self.map_from_scene(view_rect.bottomRight()))
+
+    def paintEvent(self, event):
+
+        painter = QtGui.QPainter(self)
+        painter.drawImage(self.get_image_offset(), self.image)
+
+        painter.setPen(self.view_pen)
+        painter.setBrush(QtCore.Qt.NoBrush)
+        painter.drawRect(self.get_view_rect())
+
+    def showEvent(self, event):
+
+        QtWidgets.QWidget.showEvent(self, event)
+        self.schedule_render()
+
+    def eventFilter(self, watched, event):
+
+        # the view rect follows the size of the board
+        if event.type() == QtCore.QEvent.Resize:
+            self.update()
+
+        return False
+
+    def mousePressEvent(self, event):
+
+        if event.button() == QtCore.Qt.LeftButton:
+            self.board.centerOn(self.map_to_scene(event.pos()))
+
+    def mouseMoveEvent(self, event):
+
+        if event.buttons() & QtCore.Qt.LeftButton:
+            self.board.centerOn(self.map_to_scene(event.pos()))
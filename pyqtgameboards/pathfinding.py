@@ -0,0 +1,319 @@
+"""
+Weighted pathfinding over the board models of pyqtgameboards.core
+
+Movement costs come from the overlays of the board: every overlay can have a cost
+to enter its tiles, None makes its tiles impassable. Tiles in several overlays take the highest cost.
+Like core this module does not import Qt.
+
+    pathfinder = Pathfinder(grid, costs = {"block": None, "cover": 3})
+    pathfinder.find_path([4, 4], [12, 7])
+"""
+
+import array
+import heapq
+import itertools
+
+
+INFINITE = float("inf")
+
+
+class Pathfinder(object):
+    """
+    A* paths, Dijkstra distances and flow fields over a board model.
+
+    Distance and flow fields towards a goal are cached, so many units can path to the same goal
+    by following the flow field. The cache is only cleared when an overlay with a movement cost changes.
+    """
+
+    def __init__(self, model, costs = {"block": None}, default_cost = 1):
+
+        self.model = model
+        self.costs = dict(costs)
+        self.default_cost = default_cost
+
+        # movement cost per combination of overlays of an overlay index
+        self.cost_by_mask = {}
+        self.cost_overlay_index = None
+
+        # distance and flow fields per goal index
+        self.fields = {}
+        self.fields_key = None
+
+    def set_cost(self, name, cost):
+        """
+        Sets the cost to enter the tiles of an overlay, None makes them impassable
+        """
+
+        self.costs[name] = cost
+        self.cost_by_mask = {}
+        self.fields = {}
+
+    def get_cost(self, index):
+        """
+        Returns the cost to enter the tile at the index, None if it is impassable
+        """
+
+        overlay_index = self.model.overlay_index
+        if overlay_index == None:
+            return self.default_cost
+
+        mask = overlay_index.masks[index]
+        if mask == 0:
+            return self.default_cost
+
+        # the layers of a rebuilt overlay index can differ
+        if overlay_index is not self.cost_overlay_index:
+            self.cost_by_mask = {}
+            self.cost_overlay_index = overlay_index
+
+        if mask not in self.cost_by_mask:
+            self.cost_by_mask[mask] = self.resolve_cost(mask)
+
+        return self.cost_by_mask[mask]
+
+    def resolve_cost(self, mask):
+
+        cost = self.default_cost
+        for layer, name in enumerate(self.model.overlay_index.names):
+            if mask & (1 << layer) and name in self.costs:
+
+                if self.costs[name] == None:
+                    return None
+
+                cost = max(cost, self.costs[name])
+
+        return cost
+
+    def get_minimum_cost(self):
+
+        costs = [cost for cost in self.costs.values() if cost != None]
+        return min(costs + [self.default_cost])
+
+    def find_path(self, origin, target):
+        """
+        Returns the coordinates of the cheapest path from the origin to the target, both included,
+        or None when the target can not be reached
+        """
+
+        origin_index = self.model.get_index(origin[0], origin[1])
+        target_index = self.model.get_index(target[0], target[1])
+
+        if origin_index == None or target_index == None or self.get_cost(target_index) == None:
+            return None
+
+        # the number of steps times the cheapest step never overestimates the cost
+        minimum_cost = self.get_minimum_cost()
+        target_coordinates = self.model.get_coordinates(target_index)
+
+        def estimate(index):
+            return self.model.get_distance(self.model.get_coordinates(index), target_coordinates) * minimum_cost
+
+        costs = {origin_index: 0}
+        previous = {origin_index: None}
+        order = itertools.count()
+        queue = [(estimate(origin_index), next(order), origin_index)]
+
+        while len(queue) > 0:
+            _, _, index = heapq.heappop(queue)
+
+            if index == target_index:
+                return [self.model.get_coordinates(step) for step in self.trace_path(previous, index)]
+
+            for adjacent in self.model.get_adjacent_indices(index):
+                step_cost = self.get_cost(adjacent)
+                if step_cost == None:
+                    continue
+
+                cost = costs[index] + step_cost
+                if cost < costs.get(adjacent, INFINITE):
+                    costs[adjacent] = cost
+                    previous[adjacent] = index
+                    heapq.heappush(queue, (cost + estimate(adjacent), next(order), adjacent))
+
+        return None
+
+    def trace_path(self, previous, index):
+
+        path = []
+        while index != None:
+            path.append(index)
+            index = previous[index]
+
+        path.reverse()
+        return path
+
+    def get_distances(self, origin, maximum_cost = None):
+        """
+        Returns a dictionary of index to the cost of the cheapest path from the origin (Dijkstra),
+        only including tiles up to the maximum cost
+        """
+
+        origin_index = self.model.get_index(origin[0], origin[1])
+        if origin_index == None:
+            return {}
+
+        distances = {origin_index: 0}
+        order = itertools.count()
+        queue = [(0, next(order), origin_index)]
+
+        while len(queue) > 0:
+            distance, _, index = heapq.heappop(queue)
+
+            if distance > distances[index]:
+                continue
+
+            for adjacent in self.model.get_adjacent_indices(index):
+                step_cost = self.get_cost(adjacent)
+                if step_cost == None:
+                    continue
+
+                cost = distance + step_cost
+                if maximum_cost != None and cost > maximum_cost:
+                    continue
+
+                if cost < distances.get(adjacent, INFINITE):
+                    distances[adjacent] = cost
+                    heapq.heappush(queue, (cost, next(order), adjacent))
+
+        return distances
+
+    def get_reachable(self, origin, movement_points):
+        """
+        Returns the set of indices of the tiles that can be reached from the origin
+        with the movement points, including the origin.
+
+        With whole movement costs the tiles are kept in a bucket per cost instead of a heap,
+        so every tile is handled once without sorting. The loop over the tiles is pure Python on purpose,
+        like core the pathfinding needs no numpy, and a movement range covers few tiles.
+        """
+
+        # infinite and not a number costs are not whole either
+        costs = [cost for cost in self.costs.values() if cost != None] + [self.default_cost]
+        if any(not float(cost).is_integer() or cost < 1 for cost in costs) or not float(movement_points).is_integer():
+            return set(self.get_distances(origin, movement_points))
+
+        origin_index = self.model.get_index(origin[0], origin[1])
+        if origin_index == None:
+            return set()
+
+        distances = {origin_index: 0}
+        buckets = [[] for cost in range(int(movement_points) + 1)]
+        buckets[0].append(origin_index)
+
+        for distance, bucket in enumerate(buckets):
+            for index in bucket:
+
+                # a cheaper way to this tile was found after it was added
+                if distances[index] < distance:
+                    continue
+
+                for adjacent in self.model.get_adjacent_indices(index):
+                    step_cost = self.get_cost(adjacent)
+                    if step_cost == None:
+                        continue
+
+                    cost = distance + int(step_cost)
+                    if cost <= movement_points and cost < distances.get(adjacent, INFINITE):
+                        distances[adjacent] = cost
+                        buckets[cost].append(adjacent)
+
+        return set(distances)
+
+    def get_distance_field(self, goal):
+        """
+        Returns an array with per tile index the cost of the cheapest path to the goal,
+        infinite for tiles that can not reach it
+        """
+
+        return self.get_fields(goal)[0]
+
+    def get_flow_field(self, goal):
+        """
+        Returns an array with per tile index the index of the next tile on the cheapest path to the goal,
+        -1 for the goal itself and tiles that can not reach it
+        """
+
+        return self.get_fields(goal)[1]
+
+    def follow_flow_field(self, origin, goal):
+        """
+        Returns the coordinates of the path from the origin to the goal along the cached flow field
+        or None when the goal can not be reached, like find_path also when either end is outside of the board
+        """
+
+        index = self.model.get_index(origin[0], origin[1])
+        goal_index = self.model.get_index(goal[0], goal[1])
+
+        if index == None or goal_index == None or self.get_cost(goal_index) == None:
+            return None
+
+        distance_field, flow_field = self.get_fields(goal)
+
+        if distance_field[index] == INFINITE:
+            return None
+
+        path = [index]
+        while index != goal_index:
+            index = flow_field[index]
+            path.append(index)
+
+        return [self.model.get_coordinates(index) for index in path]
+
+    def get_fields(self, goal):
+        """
+        Returns the cached distance and flow field towards the goal, raises a ValueError for a goal outside of the board
+        """
+
+        goal_index = self.model.get_index(goal[0], goal[1])
+        if goal_index == None:
+            raise ValueError(f"goal {list(goal)} is outside of the board")
+
+        self.check_fields()
+
+        if goal_index not in self.fields:
+            self.fields[goal_index] = self.build_fields(goal_index)
+
+        return self.fields[goal_index]
+
+    def check_fields(self):
+
+        # fields stay valid until an overlay with a movement cost changes
+        overlay_index = self.model.overlay_index
+        versions = overlay_index.get_versions(self.costs) if overlay_index != None else ()
+        key = (overlay_index, versions)
+
+        if key != self.fields_key:
+            self.fields = {}
+            self.fields_key = key
+
+    def build_fields(self, goal_index):
+
+        distance_field = array.array("d", [INFINITE]) * self.model.count
+        flow_field = array.array("l", [-1]) * self.model.count
+
+        # walk back from the goal, entering a tile costs the cost of the tile
+        distance_field[goal_index] = 0
+        order = itertools.count()
+        queue = [(0, next(order), goal_index)]
+
+        while len(queue) > 0:
+            distance, _, index = heapq.heappop(queue)
+
+            if distance > distance_field[index]:
+                continue
+
+            step_cost = self.get_cost(index)
+            if step_cost == None:
+                continue
+
+            for adjacent in self.model.get_adjacent_indices(index):
+                if self.get_cost(adjacent) == None:
+                    continue
+
+                cost = distance + step_cost
+                if cost < distance_field[adjacent]:
+                    distance_field[adjacent] = cost
+                    flow_field[adjacent] = index
+                    heapq.heappush(queue, (cost, next(order), adjacent))
+
+        return distance_field, flow_field
@@ -0,0 +1,248 @@
+"""
+Opt-in profiling of a gameboard
+
+While profiling is enabled the phases of a board (building tiles and overlays, repainting tiles,
+line of sight, selections) are timed, the tiles repainted per frame are counted and the paint time
+of every frame is measured. The numbers are kept in a BoardStats object and sent with the
+stats_updated signal of the board, QProfilerOverlay shows them on top of the board.
+A board that is not profiled runs its own methods and paints its frames without any timing.
+
+    stats = board.enable_profiling()
+    overlay = QProfilerOverlay(board)
+    board.stats_updated.connect(print)
+"""
+
+import time
+import collections
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+# methods of the board that are timed while profiling
+PHASES = [
+    "build_board_scene",
+    "build_tiles",
+    "build_overlays",
+    "rebuild_overlays",
+    "add_overlay_positions",
+    "remove_overlay_positions",
+    "apply_overlay_deltas",
+    "rebuild_tiles",
+    "flush_repaints",
+    "selection_new",
+    "selection_removal",
+    "target_new",
+    "target_removal",
+    "create_line_of_sight",
+    "get_adjacent_tiles",
+    "update_chunks",
+]
+
+
+class PhaseStats(object):
+    """
+    Number of calls and the time spent in a phase
+    """
+
+    __slots__ = ("calls", "total", "last", "maximum")
+
+    def __init__(self):
+
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+
+        self.calls += 1
+        self.total += seconds
+        self.last = seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def get_average(self):
+        return self.total / self.calls if self.calls > 0 else 0.0
+
+    def as_dict(self):
+        return {"calls": self.calls, "total": self.total, "last": self.last, "maximum": self.maximum, "average": self.get_average()}
+
+
+class BoardStats(object):
+    """
+    Live numbers of a profiled board, times are in seconds
+    """
+
+    def __init__(self, frame_window = 60):
+
+        # time per phase by method name
+        self.phases = collections.OrderedDict()
+
+        # paint time of the last frames
+        self.frames = 0
+        self.frame_times = collections.deque(maxlen = frame_window)
+
+        # tiles repainted since the last frame and per frame over the last frames
+        self.repainted_tiles = 0
+        self.repainted_tiles_per_frame = collections.deque(maxlen = frame_window)
+
+        # counted when the stats are reported
+        self.scene_items = 0
+        self.chunks = 0
+
+    def add_phase(self, name, seconds):
+
+        if name not in self.phases:
+            self.phases[name] = PhaseStats()
+
+        self.phases[name].add(seconds)
+
+    def add_frame(self, seconds):
+
+        self.frames += 1
+        self.frame_times.append(seconds)
+        self.repainted_tiles_per_frame.append(self.repainted_tiles)
+        self.repainted_tiles = 0
+
+    def get_frame_time(self):
+        return sum(self.frame_times) / len(self.frame_times) if len(self.frame_times) > 0 else 0.0
+
+    def get_repainted_tiles_per_frame(self):
+        return sum(self.repainted_tiles_per_frame) / len(self.repainted_tiles_per_frame) if len(self.repainted_tiles_per_frame) > 0 else 0.0
+
+    def reset(self):
+        self.__init__(self.frame_times.maxlen)
+
+    def as_dict(self):
+
+        return {
+            "phases": {name: phase.as_dict() for name, phase in self.phases.items()},
+            "frames": self.frames,
+            "frame_time": self.get_frame_time(),
+            "repainted_tiles_per_frame": self.get_repainted_tiles_per_frame(),
+            "scene_items": self.scene_items,
+            "chunks": self.chunks,
+        }
+
+    def __str__(self):
+
+        lines = [
+            f"frame {self.get_frame_time() * 1000:.1f} ms, {self.frames} frames",
+            f"repainted tiles per frame {self.get_repainted_tiles_per_frame():.1f}",
+            f"scene items {self.scene_items}, chunks {self.chunks}",
+        ]
+
+        for name, phase in self.phases.items():
+            lines.append(f"{name} {phase.last * 1000:.2f} ms (max {phase.maximum * 1000:.2f} ms, {phase.calls} calls)")
+
+        return "\n".join(lines)
+
+
+class BoardProfiler(QtCore.QObject):
+    """
+    Times the phases of a board by putting a timed version of the phase methods on the board
+    and its frames with an event filter on the viewport of the board, both are removed again
+    when profiling is disabled so the board runs its own methods and paints untimed.
+    """
+
+    def __init__(self, board, interval = 500):
+        QtCore.QObject.__init__(self, board)
+
+        self.board = board
+        self.stats = BoardStats()
+
+        # stats are reported with the stats_updated signal of the board every interval
+        self.report_timer = QtCore.QTimer(board)
+        self.report_timer.setInterval(interval)
+        self.report_timer.timeout.connect(self.report)
+
+        # repainted tiles are counted by the board
+        self.repaint_count = board.repaint_count
+
+    def enable(self):
+
+        for name in PHASES:
+            setattr(self.board, name, self.create_timed_method(name, getattr(self.board, name)))
+
+        # the repaint timer calls the method it was connected to, which is the untimed one
+        self.board.repaint_timer.timeout.disconnect()
+        self.board.repaint_timer.timeout.connect(self.board.flush_repaints)
+
+        self.board.viewport().installEventFilter(self)
+        self.report_timer.start()
+
+    def disable(self):
+
+        self.report_timer.stop()
+        self.board.viewport().removeEventFilter(self)
+
+        for name in PHASES:
+            if name in self.board.__dict__:
+                delattr(self.board, name)
+
+        self.board.repaint_timer.timeout.disconnect()
+        self.board.repaint_timer.timeout.connect(self.board.flush_repaints)
+
+    def create_timed_method(self, name, method):
+
+        stats = self.stats
+
+        def timed_method(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            stats.add_phase(name, time.perf_counter() - start)
+            return result
+
+        return timed_method
+
+    def eventFilter(self, watched, event):
+
+        if event.type() != QtCore.QEvent.Paint or watched is not self.board.viewport():
+            return False
+
+        # paint the frame here to time it, the event is handled then
+        start = time.perf_counter()
+        self.board.viewportEvent(event)
+        self.add_frame(time.perf_counter() - start)
+
+        return True
+
+    def add_frame(self, seconds):
+
+        # tiles repainted since the previous frame
+        self.stats.repainted_tiles += self.board.repaint_count - self.repaint_count
+        self.repaint_count = self.board.repaint_count
+
+        self.stats.add_frame(seconds)
+
+    def report(self):
+
+        self.stats.scene_items = len(self.board.scene.items())
+        self.stats.chunks = len(self.board.board_item.chunks) if self.board.chunked == True and self.board.board_item != None else 0
+
+        self.board.stats_updated.emit(self.stats)
+
+
+class QProfilerOverlay(QtWidgets.QLabel):
+    """
+    Small panel in the top left corner of a profiled board that shows its live stats
+    """
+
+    def __init__(self, board):
+        QtWidgets.QLabel.__init__(self, board.viewport())
+
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white; padding: 4px;")
+        self.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.move(4, 4)
+
+        board.stats_updated.connect(self.show_stats)
+
+        if board.profiler != None:
+            self.show_stats(board.profiler.stats)
+
+        self.show()
+
+    def show_stats(self, stats):
+
+        self.setText(str(stats))
+        self.adjustSize()
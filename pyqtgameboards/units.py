@@ -0,0 +1,292 @@
+"""
+Units and tokens on top of a gameboard
+
+QUnitLayer is a single graphics item over the tiles of a board that draws all units,
+instead of a graphics item or overlay per unit. Units with the same look share one cached pixmap
+and are drawn together with one call per pixmap.
+Moving units follow their path of tiles driven by a single timer of the layer: every frame
+all moving units take their step and the area they moved over is updated at once.
+
+    units = QUnitLayer(board)
+    knight = units.add_unit(3, 4, QtGui.QColor(0,0,255))
+    units.move_unit_to(knight, 12, 9)
+    units.unit_arrived.connect(print)
+"""
+
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Unit(object):
+    """
+    A unit at a tile of the board, x and y are its center in scene coordinates
+    which are between two tiles while it moves
+    """
+
+    __slots__ = ("row", "column", "x", "y", "pixmap", "path", "progress", "data")
+
+    def __init__(self, row, column, x, y, pixmap, data = None):
+
+        self.row = row
+        self.column = column
+        self.x = x
+        self.y = y
+        self.pixmap = pixmap
+
+        # the [row, column] tiles still to move to and the part of the way to the first of them
+        self.path = []
+        self.progress = 0.0
+
+        # anything the game wants to keep with the unit
+        self.data = data
+
+    def is_moving(self):
+        return len(self.path) > 0
+
+    def __repr__(self):
+        return f"Unit[{self.row}, {self.column}]"
+
+
+class QUnitLayer(QtWidgets.QGraphicsObject):
+    """
+    Graphics item that draws and moves all units of a board, it adds itself to the scene of the board
+    """
+
+    # the unit reached the last tile of its path
+    unit_arrived = QtCore.pyqtSignal(object)
+
+    # the unit entered a tile, also when it was added, or was removed
+    unit_moved = QtCore.pyqtSignal(object)
+    unit_removed = QtCore.pyqtSignal(object)
+
+    def __init__(self, board, unit_scale = 0.7):
+        QtWidgets.QGraphicsObject.__init__(self)
+
+        self.board = board
+        self.units = []
+
+        # units per tile index
+        self.units_by_index = {}
+
+        # units are unit_scale times the size of a tile
+        tile_rect = board.get_shape_rect(1, 1)
+        self.unit_size = max(int(min(tile_rect.width(), tile_rect.height()) * unit_scale), 1)
+
+        # pixmap per color or given pixmap, shared by all units with the same look
+        self.pixmaps = {}
+
+        # moving units move speed tiles per second, driven by one timer for all of them
+        self.speed = 4.0
+        self.moving_units = set()
+        self.last_tick = None
+        self.animation_timer = QtCore.QTimer(self)
+        self.animation_timer.setInterval(16) # about 60 frames per second
+        self.animation_timer.timeout.connect(self.animate)
+
+        self.rect = board.get_area_rect(1, board.rows, 1, board.columns)
+        margin = self.unit_size / 2
+        self.rect.adjust(-margin, -margin, margin, margin)
+
+        # on top of the tiles, without catching the mouse
+        self.setZValue(10)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)
+        board.scene.addItem(self)
+
+    def boundingRect(self):
+        return self.rect
+
+    def get_pixmap(self, color = None, pixmap = None):
+
+        """
+        Returns the cached pixmap of the unit size for a color (drawn as a round token) or for a given pixmap
+        """
+
+        key = pixmap.cacheKey() if pixmap != None else QtGui.QColor(color).rgba()
+
+        cached = self.pixmaps.get(key)
+        if cached != None:
+            return cached
+
+        if pixmap != None:
+            cached = pixmap.scaled(self.unit_size, self.unit_size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+
+        else:
+            cached = QtGui.QPixmap(self.unit_size, self.unit_size)
+            cached.fill(QtCore.Qt.transparent)
+
+            painter = QtGui.QPainter(cached)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(QtGui.QPen(QtGui.QColor(0,0,0), max(self.unit_size / 12, 1)))
+            painter.setBrush(QtGui.QColor(color))
+            inset = max(self.unit_size / 12, 1)
+            painter.drawEllipse(QtCore.QRectF(inset, inset, self.unit_size - 2 * inset, self.unit_size - 2 * inset))
+            painter.end()
+
+        self.pixmaps[key] = cached
+        return cached
+
+    def get_center(self, row, column):
+        return self.board.get_shape_rect(row, column).center()
+
+    def get_unit_rect(self, unit):
+
+        half = self.unit_size / 2
+        return QtCore.QRectF(unit.x - half, unit.y - half, self.unit_size, self.unit_size)
+
+    def add_unit(self, row, column, color = QtGui.QColor(0,0,255), pixmap = None, data = None):
+
+        """
+        Adds a unit at the tile of a color or with a pixmap and returns it
+        """
+
+        center = self.get_center(row, column)
+        unit = Unit(row, column, center.x(), center.y(), self.get_pixmap(color, pixmap), data)
+
+        self.units.append(unit)
+        self.units_by_index.setdefault(self.board.model.get_index(row, column), []).append(unit)
+        self.update(self.get_unit_rect(unit))
+        self.unit_moved.emit(unit)
+
+        return unit
+
+    def remove_unit(self, unit):
+
+        self.update(self.get_unit_rect(unit))
+        self.units.remove(unit)
+        self.moving_units.discard(unit)
+        self.units_by_index[self.board.model.get_index(unit.row, unit.column)].remove(unit)
+        self.unit_removed.emit(unit)
+
+    def get_units_at(self, row, column):
+
+        """
+        Returns the units at a tile, moving units are at the tile they left until they reach the next one
+        """
+
+        return list(self.units_by_index.get(self.board.model.get_index(row, column), []))
+
+    def move_unit(self, unit, path):
+
+        """
+        Moves the unit along a path of [row, column] tiles, a path starting at the tile of the unit skips it.
+        A unit that is moving already first finishes its step to the next tile.
+        """
+
+        path = [list(coordinates) for coordinates in path]
+        if len(path) > 0 and path[0] == [unit.row, unit.column]:
+            path = path[1:]
+
+        if unit.is_moving():
+            if path[:1] != unit.path[:1]:
+                path = unit.path[:1] + path
+        else:
+            unit.progress = 0.0
+
+        unit.path = path
+
+        if len(path) > 0:
+            self.moving_units.add(unit)
+
+            if not self.animation_timer.isActive():
+                self.last_tick = time.perf_counter()
+                self.animation_timer.start()
+
+    def move_unit_to(self, unit, row, column):
+
+        """
+        Moves the unit along the cheapest path to the tile, see board.get_path, returns the path or None.
+        The path of a moving unit starts at the tile it is moving to.
+        """
+
+        origin = unit.path[0] if unit.is_moving() else [unit.row, unit.column]
+
+        path = self.board.get_path(origin, [row, column])
+        if path != None:
+            self.move_unit(unit, path)
+
+        return path
+
+    def animate(self):
+
+        """
+        Moves every moving unit the distance of the time since the last frame and updates the area they moved over once.
+        The signals are emitted after all units moved, so their slots can move, add and remove units.
+        """
+
+        now = time.perf_counter()
+        steps = (now - self.last_tick) * self.speed
+        self.last_tick = now
+
+        dirty_rect = QtCore.QRectF()
+        moved = []
+        arrived = []
+
+        for unit in list(self.moving_units):
+            dirty_rect = dirty_rect.united(self.get_unit_rect(unit))
+
+            unit.progress += steps
+            if unit.progress >= 1 and len(unit.path) > 0:
+                moved.append(unit)
+
+            while unit.progress >= 1 and len(unit.path) > 0:
+                unit.progress -= 1
+                self.set_unit_tile(unit, *unit.path.pop(0))
+
+            if len(unit.path) == 0:
+                unit.progress = 0.0
+                center = self.get_center(unit.row, unit.column)
+                arrived.append(unit)
+
+            else:
+                # between the current and the next tile of the path
+                start = self.get_center(unit.row, unit.column)
+                end = self.get_center(*unit.path[0])
+                center = start + (end - start) * unit.progress
+
+            unit.x = center.x()
+            unit.y = center.y()
+            dirty_rect = dirty_rect.united(self.get_unit_rect(unit))
+
+        for unit in arrived:
+            self.moving_units.discard(unit)
+
+        if len(self.moving_units) == 0:
+            self.animation_timer.stop()
+
+        self.update(dirty_rect)
+
+        # a unit that entered several tiles this frame is reported once, at the tile it is at now
+        for unit in moved:
+            self.unit_moved.emit(unit)
+
+        for unit in arrived:
+            self.unit_arrived.emit(unit)
+
+    def set_unit_tile(self, unit, row, column):
+
+        # unit_moved is emitted by animate once all units moved
+        self.units_by_index[self.board.model.get_index(unit.row, unit.column)].remove(unit)
+        unit.row = row
+        unit.column = column
+        self.units_by_index.setdefault(self.board.model.get_index(row, column), []).append(unit)
+
+    def paint(self, painter, option, widget = None):
+
+        exposed = option.exposedRect
+        half = self.unit_size / 2
+
+        # the exposed units per pixmap, each pixmap is drawn once for all its units
+        fragments = {}
+        for unit in self.units:
+            if exposed.left() - half <= unit.x <= exposed.right() + half and exposed.top() - half <= unit.y <= exposed.bottom() + half:
+                key = unit.pixmap.cacheKey()
+                if key not in fragments:
+                    fragments[key] = (unit.pixmap, [])
+
+                fragments[key][1].append(QtGui.QPainter.PixmapFragment.create(QtCore.QPointF(unit.x, unit.y), QtCore.QRectF(unit.pixmap.rect())))
+
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        for pixmap, pixmap_fragments in fragments.values():
+            painter.drawPixmapFragments(pixmap_fragments, pixmap)
@@ -0,0 +1,238 @@
+"""
+Field of view over the board models of pyqtgameboards.core
+
+Symmetric shadowcasting: the area around the origin is split in sectors, 4 quadrants on a
+rectangle grid and 6 sextants on a hexagon grid, which are scanned row by row outwards.
+Tiles of a blocking overlay cast a shadow over the rows behind them.
+A tile is visible from the origin exactly when the origin is visible from the tile.
+Like core this module does not import Qt.
+
+    get_field_of_view(grid, [10, 10], radius = 8)
+
+    vision = Vision(grid)
+    changed = vision.set_source("scout", [10, 10], radius = 8)
+"""
+
+import array
+
+from pyqtgameboards import core
+
+
+# cube directions of a hexagon in order around it, each is 60 degrees from the previous
+HEXAGON_DIRECTIONS = [(1, 0, -1), (1, -1, 0), (0, -1, 1), (-1, 0, 1), (-1, 1, 0), (0, 1, -1)]
+
+
+def get_field_of_view(model, origin, radius, blocking = ("block",)):
+    """
+    Returns the set of indices of the tiles visible from the origin coordinates within radius steps.
+    Blocking tiles themselves are visible, tiles outside of the board block the view.
+
+    Slopes are kept as whole numerators and denominators and compared by cross multiplication,
+    the scan is pure Python on purpose (like core it needs no numpy), a tile costs a few integer operations.
+    """
+
+    origin_index = model.get_index(origin[0], origin[1])
+    if origin_index == None:
+        return set()
+
+    if model.overlay_index != None:
+        blocking_mask = model.overlay_index.get_layer_mask(blocking)
+        masks = model.overlay_index.masks
+    else:
+        blocking_mask = 0
+        masks = None
+
+    if isinstance(model, core.HexagonGrid):
+        sectors = get_hexagon_sectors(model, origin)
+        first_slope = 0
+    elif isinstance(model, core.RectangleGrid):
+        sectors = get_rectangle_sectors(origin)
+        first_slope = -1
+    else:
+        return NotImplemented
+
+    visible = {origin_index}
+
+    for sector in sectors:
+
+        # rows still to scan as depth, start slope and end slope, a slope is numerator / denominator
+        rows = [(1, first_slope, 1, 1, 1)]
+        while len(rows) > 0:
+            depth, start_numerator, start_denominator, end_numerator, end_denominator = rows.pop()
+            if depth > radius:
+                continue
+
+            previous_blocked = None
+            first_position = round_up(depth * start_numerator, start_denominator)
+            last_position = round_down(depth * end_numerator, end_denominator)
+
+            for position in range(first_position, last_position + 1):
+                row, column = sector(depth, position)
+                index = model.get_index(row, column)
+
+                blocked = index == None or (masks != None and masks[index] & blocking_mask != 0)
+
+                # only tiles whose center is within the scanned slopes are visible, which keeps the view symmetric
+                if index != None and (blocked or (position * start_denominator >= depth * start_numerator and position * end_denominator <= depth * end_numerator)):
+                    visible.add(index)
+
+                # the slope through the edge before this tile
+                if previous_blocked == True and not blocked:
+                    start_numerator, start_denominator = 2 * position - 1, 2 * depth
+
+                if previous_blocked == False and blocked:
+                    rows.append((depth + 1, start_numerator, start_denominator, 2 * position - 1, 2 * depth))
+
+                previous_blocked = blocked
+
+            if previous_blocked == False:
+                rows.append((depth + 1, start_numerator, start_denominator, end_numerator, end_denominator))
+
+    return visible
+
+
+def get_rectangle_sectors(origin):
+    """
+    Returns the 4 quadrants around the origin as functions of depth and position to coordinates
+    """
+
+    row, column = origin
+
+    return [
+        lambda depth, position: (row - depth, column + position), # top
+        lambda depth, position: (row + depth, column + position), # down
+        lambda depth, position: (row + position, column - depth), # left
+        lambda depth, position: (row + position, column + depth), # right
+    ]
+
+
+def get_hexagon_sectors(model, origin):
+    """
+    Returns the 6 sextants around the origin as functions of depth and position to coordinates.
+    The tiles at a depth form one side of the hexagon ring around the origin, from one corner
+    (position 0) to the next (position depth), so slopes behave like on a rectangle grid.
+    """
+
+    q, r, s = model.get_cube_coordinates(origin[0], origin[1])
+
+    sectors = []
+    for number, corner in enumerate(HEXAGON_DIRECTIONS):
+        side = HEXAGON_DIRECTIONS[(number + 2) % 6]
+
+        def sector(depth, position, corner = corner, side = side):
+            return model.get_grid_coordinates(q + corner[0] * depth + side[0] * position, r + corner[1] * depth + side[1] * position)
+
+        sectors.append(sector)
+
+    return sectors
+
+
+def round_up(numerator, denominator):
+    # rounds numerator / denominator (denominator above 0) with halves up
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def round_down(numerator, denominator):
+    # rounds numerator / denominator (denominator above 0) with halves down
+    return -((denominator - 2 * numerator) // (2 * denominator))
+
+
+class Vision(object):
+    """
+    What one faction sees of a board, the fields of view of its sources (like units) together.
+
+    Per tile a count of the sources that see it, so moving one source only changes the tiles
+    that enter or leave its own field of view, and a bit array of the tiles that were ever seen.
+    Memory per tile is 2 bytes for the counts and 1 bit for the explored tiles.
+    """
+
+    def __init__(self, model, blocking = ("block",)):
+
+        self.model = model
+        self.blocking = blocking
+
+        self.counts = array.array("H", [0]) * model.count
+        self.explored = bytearray((model.count + 7) // 8)
+
+        # origin, radius and the set of visible indices per source
+        self.sources = {}
+
+    def set_source(self, key, origin, radius):
+        """
+        Moves or adds a source of sight to the origin coordinates with a sight radius,
+        returns the indices of the tiles that became visible or hidden
+        """
+
+        indices = get_field_of_view(self.model, origin, radius, self.blocking)
+        if indices == NotImplemented:
+            return NotImplemented
+
+        return self.set_source_indices(key, indices, origin, radius)
+
+    def set_source_indices(self, key, indices, origin = None, radius = None):
+        """
+        Sets the visible indices of a source directly, returns the indices of the tiles that became visible or hidden
+        """
+
+        previous = self.sources[key][2] if key in self.sources else set()
+        indices = set(indices)
+        counts = self.counts
+
+        changed = []
+        for index in previous - indices:
+            counts[index] -= 1
+            if counts[index] == 0:
+                changed.append(index)
+
+        for index in indices - previous:
+            if counts[index] == 0:
+                changed.append(index)
+                self.explored[index >> 3] |= 1 << (index & 7)
+            counts[index] += 1
+
+        self.sources[key] = (origin, radius, indices)
+
+        return changed
+
+    def remove_source(self, key):
+        """
+        Removes a source of sight, returns the indices of the tiles that became hidden
+        """
+
+        if key not in self.sources:
+            return []
+
+        changed = self.set_source_indices(key, ())
+        del self.sources[key]
+
+        return changed
+
+    def refresh(self):
+        """
+        Calculates the fields of view of all sources again, after blocking overlays changed,
+        returns the indices of the tiles that became visible or hidden
+        """
+
+        changed = set()
+        for key, (origin, radius, indices) in list(self.sources.items()):
+            if origin != None:
+                changed.update(self.set_source(key, origin, radius))
+
+        return changed
+
+    def is_visible(self, index):
+        return self.counts[index] > 0
+
+    def is_explored(self, index):
+        return self.explored[index >> 3] & (1 << (index & 7)) != 0
+
+    def explore(self, indices):
+        """
+        Marks tiles as explored without seeing them, like the map of a saved game
+        """
+
+        for index in indices:
+            self.explored[index >> 3] |= 1 << (index & 7)
+
+    def get_visible_indices(self):
+        return [index for index, count in enumerate(self.counts) if count > 0]
@@ -5,7 +5,7 @@ with open("README.md", "r") as fh:
 
 setuptools.setup(
     name="pyqt-gameboard",
-    version="0.2.6",
+    version="0.3.0",
     author="Michael-Yongshi",
     author_email="4registration@outlook.com",
     description="A gameboard widget for pyqt gui's package",
@@ -16,6 +16,9 @@ setuptools.setup(
     install_requires=[
         'PyQt5',
     ],
+    extras_require={
+        'heatmap': ['numpy'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)",
@@ -0,0 +1,50 @@
+"""
+Shared fixtures of the tests, boards are created without a display
+
+    QT_QPA_PLATFORM=offscreen python -m pytest -q
+"""
+
+import os
+
+# before Qt is imported anywhere
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+@pytest.fixture(scope = "session")
+def app():
+
+    # one application for all tests, Qt does not allow a second one
+    application = QtWidgets.QApplication.instance()
+    if application == None:
+        application = QtWidgets.QApplication([])
+
+    return application
+
+
+def click(board, row = None, column = None):
+    """
+    Clicks the tile at row and column of a board, or outside of the board without them,
+    and applies the repaints of the click
+    """
+
+    if row != None:
+        point = board.mapFromScene(board.get_shape_rect(row, column).center())
+    else:
+        point = board.mapFromScene(board.get_area_rect(1, board.rows, 1, board.columns).topLeft() - QtCore.QPointF(20, 20))
+
+    event = QtGui.QMouseEvent(QtCore.QEvent.MouseButtonPress, QtCore.QPointF(point), QtCore.Qt.LeftButton, QtCore.Qt.LeftButton, QtCore.Qt.NoModifier)
+    board.mousePressEvent(event)
+    board.flush_repaints()
+
+
+def delete_board(board):
+    """
+    Deletes a board and its scene now instead of on the next turn of the event loop
+    """
+
+    board.deleteLater()
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
@@ -0,0 +1,123 @@
+import pytest
+
+from PyQt5 import QtCore, QtGui
+
+from pyqtgameboards import core
+from pyqtgameboards.geometry import RectangleGeometry, HexagonGeometry
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard, SELECT_RECT, SELECT_LASSO
+
+from conftest import delete_board
+
+
+def create_geometries():
+
+    return [
+        RectangleGeometry(8, 9, 40, 30, 10, 20),
+        HexagonGeometry(core.HexagonGrid(8, 9), 20, 60, 17, 30, 0, 0),
+        HexagonGeometry(core.HexagonGrid(8, 9, horizontal = False), 20, 17, 60, 30, 0, 0),
+    ]
+
+
+def get_indices_in_polygon(geometry, points):
+
+    # every tile center checked on its own
+    polygon = QtGui.QPolygonF([QtCore.QPointF(x, y) for x, y in points])
+    indices = []
+    for row in range(1, geometry.rows + 1):
+        for column in range(1, geometry.columns + 1):
+            x, y = geometry.get_position(row, column)
+            if polygon.containsPoint(QtCore.QPointF(x, y), QtCore.Qt.OddEvenFill):
+                indices.append((row - 1) * geometry.columns + column - 1)
+
+    return indices
+
+
+def drag(board, points):
+
+    # press at the first point, move through the others and release at the last one
+    positions = [QtCore.QPointF(board.mapFromScene(QtCore.QPointF(*point))) for point in points]
+
+    board.mousePressEvent(QtGui.QMouseEvent(QtCore.QEvent.MouseButtonPress, positions[0], QtCore.Qt.LeftButton, QtCore.Qt.LeftButton, QtCore.Qt.NoModifier))
+    for position in positions[1:]:
+        board.mouseMoveEvent(QtGui.QMouseEvent(QtCore.QEvent.MouseMove, position, QtCore.Qt.NoButton, QtCore.Qt.LeftButton, QtCore.Qt.NoModifier))
+    board.mouseReleaseEvent(QtGui.QMouseEvent(QtCore.QEvent.MouseButtonRelease, positions[-1], QtCore.Qt.LeftButton, QtCore.Qt.NoButton, QtCore.Qt.NoModifier))
+
+
+@pytest.mark.parametrize("geometry", create_geometries())
+def test_spans_in_polygon(geometry):
+
+    points = [(37.0, 41.0), (251.0, 63.0), (188.0, 233.0), (93.0, 187.0)]
+    indices = core.get_span_indices(geometry.get_spans_in_polygon(points))
+
+    assert sorted(indices) == get_indices_in_polygon(geometry, points)
+    assert len(indices) == len(set(indices))
+
+
+@pytest.mark.parametrize("geometry", create_geometries())
+def test_spans_in_rect(geometry):
+
+    indices = core.get_span_indices(geometry.get_spans_in_rect(51.0, 47.0, 173.0, 139.0))
+
+    assert sorted(indices) == get_indices_in_polygon(geometry, [(51.0, 47.0), (173.0, 47.0), (173.0, 139.0), (51.0, 139.0)])
+
+
+def test_spans_of_a_block_of_tiles():
+
+    model = core.RectangleGrid(5, 6)
+
+    assert model.get_spans(2, 3, 4, 9) == [(9, 12, 1), (15, 18, 1)]
+    assert core.get_span_indices(model.get_spans(0, 1, 1, 2)) == [0, 1]
+    assert model.get_spans(1, 5, 7, 9) == []
+
+
+@pytest.mark.parametrize("batched, chunked", [(False, False), (True, False), (False, True)])
+def test_painted_area(app, batched, chunked):
+
+    board = QHexagonboard(rows = 8, columns = 8, size = 4, batched = batched, chunked = chunked)
+    board.resize(800, 600)
+    board.update_chunks()
+
+    areas = []
+    board.area_selected.connect(areas.append)
+
+    spans = board.select_grid_area(2, 3, 3, 5)
+    assert areas == [spans]
+    assert board.get_area_indices() == [board.model.get_index(row, column) for row in [2, 3] for column in [3, 4, 5]]
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+    board.paint_area(brush = red)
+
+    assert board.get_tile_brush(board.model.get_index(3, 5)) == red
+    assert board.get_tile_brush(board.model.get_index(4, 5)) != red
+
+    board.clear_area()
+    assert board.get_area_indices() == []
+    assert board.area_shape == None
+
+    delete_board(board)
+
+
+@pytest.mark.parametrize("selection_mode", [SELECT_RECT, SELECT_LASSO])
+def test_dragged_area(app, selection_mode):
+
+    board = QRectangleboard(rows = 8, columns = 8, size = 4, batched = True)
+    board.resize(800, 600)
+    board.selection_mode = selection_mode
+
+    areas = []
+    board.area_selected.connect(areas.append)
+
+    # a rect from the center of tile 2, 2 to the center of tile 4, 5, the lasso goes along its corners
+    first = board.get_shape_rect(2, 2).center()
+    last = board.get_shape_rect(4, 5).center()
+    corners = [(first.x() - 1, first.y() - 1), (last.x() + 1, first.y() - 1), (last.x() + 1, last.y() + 1), (first.x() - 1, last.y() + 1)]
+    drag(board, [corners[0], corners[2]] if selection_mode == SELECT_RECT else corners)
+
+    assert len(areas) == 1
+    assert board.area_points == None
+    assert board.get_area_indices() == [board.model.get_index(row, column) for row in range(2, 5) for column in range(2, 6)]
+
+    # dragging selects no tile
+    assert board.selected_tile == None
+
+    delete_board(board)
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from PyQt5 import QtGui, QtWidgets
+
+from pyqtgameboards.gameboard import QHexagonboard
+
+from conftest import click, delete_board
+
+
+def create_overlays():
+
+    brush = QtGui.QBrush(QtGui.QColor(255,0,0,100))
+    return [{"Name": "enemy", "Brush": brush, "Pen": "", "Positions": [[row, 3] for row in range(1, 31)]}]
+
+
+def wait_until_ready(board):
+
+    deadline = time.perf_counter() + 10
+    while board.ready == False and time.perf_counter() < deadline:
+        QtWidgets.QApplication.processEvents()
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_asynchronous_build(app, batched):
+
+    board = QHexagonboard(rows = 30, columns = 30, size = 4, overlays = create_overlays(), batched = batched, asynchronous = True)
+    progress = []
+    board.build_progress.connect(lambda done, total: progress.append((done, total)))
+
+    assert board.ready == False
+
+    wait_until_ready(board)
+
+    assert board.ready == True
+    assert progress[-1][0] == progress[-1][1]
+    assert board.model.overlay_index is board.overlay_index
+    assert len(board.overlay_index.get_indices(["enemy"])) == 30
+    assert board.get_tile_brush(board.model.get_index(5, 3)) == create_overlays()[0]["Brush"]
+
+    delete_board(board)
+
+
+def test_overlay_index_is_set_in_the_thread_of_the_board(app):
+
+    board = QHexagonboard(rows = 30, columns = 30, size = 4, overlays = create_overlays(), asynchronous = True)
+
+    # the worker only builds the index, the board and its model keep none until the build takes it over
+    board.build_future.result()
+    assert board.overlay_index == None
+    assert board.model.overlay_index == None
+
+    wait_until_ready(board)
+    assert board.model.overlay_index is board.overlay_index
+
+    delete_board(board)
+
+
+def test_overlays_can_not_change_while_building(app):
+
+    board = QHexagonboard(rows = 30, columns = 30, size = 4, overlays = create_overlays(), asynchronous = True)
+    board.enable_history()
+
+    for change in [lambda: board.add_overlay_positions("enemy", [[1, 1]]),
+                   lambda: board.remove_overlay_positions("enemy", [[1, 3]]),
+                   lambda: board.apply_overlay_deltas([("enemy", [1, 1], True)]),
+                   board.rebuild_overlays,
+                   lambda: board.set_spans_style([(0, 10, 1)], brush = QtGui.QBrush(QtGui.QColor(0,0,255))),
+                   lambda: board.paint_area(brush = QtGui.QBrush(QtGui.QColor(0,0,255))),
+                   board.undo,
+                   board.redo]:
+        with pytest.raises(RuntimeError):
+            change()
+
+    # clicks are ignored and queued deltas wait
+    click(board, 2, 2)
+    assert board.selected_tile == None
+
+    board.queue_overlay_deltas([("enemy", [1, 1], True)])
+    wait_until_ready(board)
+
+    deadline = time.perf_counter() + 5
+    while len(board.pending_deltas) > 0 and time.perf_counter() < deadline:
+        QtWidgets.QApplication.processEvents()
+
+    assert board.model.get_index(1, 1) in board.overlay_index.get_indices(["enemy"])
+
+    board.add_overlay_positions("enemy", [[2, 2]])
+    assert board.undo() != None
+
+    delete_board(board)
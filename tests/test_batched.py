@@ -0,0 +1,52 @@
+import pytest
+
+from pyqtgameboards import core
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard, QBoardItem, QBoardTile
+
+from conftest import click, delete_board
+
+
+@pytest.fixture(params = [QHexagonboard, QRectangleboard])
+def board(request, app):
+
+    board = request.param(rows = 8, columns = 10, size = 4, batched = True)
+    board.resize(800, 600)
+    yield board
+    delete_board(board)
+
+
+def test_batched_board_has_one_item(board):
+
+    items = board.scene.items()
+
+    assert len(items) == 1
+    assert isinstance(items[0], QBoardItem)
+
+
+def test_batched_tiles_are_handles(board):
+
+    tile = board.get_tile(3, 4)
+
+    assert isinstance(tile, QBoardTile)
+    assert board.get_tile_grid_location(tile) == [3, 4]
+    assert board.get_tile_index(tile) == board.model.get_index(3, 4)
+
+
+def test_batched_click_cycle(board):
+
+    # select, target, retarget and deselect, every click repaints tiles of the previous one
+    click(board, 3, 4)
+    assert board.get_tile_grid_location(board.selected_tile) == [3, 4]
+    assert board.model.has_state(board.model.get_index(3, 4), core.SELECTED)
+
+    click(board, 6, 8)
+    assert board.get_tile_grid_location(board.target_tile) == [6, 8]
+
+    click(board, 2, 9)
+    assert board.get_tile_grid_location(board.target_tile) == [2, 9]
+    assert not board.model.has_state(board.model.get_index(6, 8), core.TARGET)
+
+    click(board)
+    assert board.selected_tile == None
+    assert board.target_tile == None
+    assert not any(board.model.state)
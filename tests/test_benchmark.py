@@ -0,0 +1,44 @@
+import os
+import sys
+import json
+
+# benchmark.py is a script next to the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+
+
+def test_run_small_boards(app):
+
+    results = benchmark.run([5], [0, 10], ["hexagon"], ["items", "batched"], 1)
+
+    assert {result["mode"] for result in results} == {"items", "batched"}
+    assert {result["overlay_positions"] for result in results} == {0, 10}
+    assert all(result["seconds"] >= 0 for result in results)
+
+
+def test_compare_finds_regressions():
+
+    previous = [{"board": "hexagon", "mode": "items", "rows": 5, "columns": 5, "overlay_positions": 0, "benchmark": "build", "seconds": 1.0}]
+    slower = [dict(previous[0], seconds = 2.0)]
+    faster = [dict(previous[0], seconds = 0.5)]
+
+    assert benchmark.compare(slower, previous, 1.5) == slower
+    assert benchmark.compare(faster, previous, 1.5) == []
+
+
+def test_results_go_to_the_output(app, tmp_path):
+
+    path = tmp_path / "results.json"
+    benchmark.main(["--sizes", "5", "--overlays", "0", "--modes", "batched", "--repeat", "1", "--output", str(path)])
+
+    assert len(json.loads(path.read_text())["results"]) > 0
+
+
+def test_results_directory_by_default(app, tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    benchmark.main(["--sizes", "5", "--overlays", "0", "--boards", "rectangle", "--modes", "batched", "--repeat", "1"])
+
+    assert os.listdir(tmp_path) == [benchmark.RESULTS_DIRECTORY]
+    assert len(os.listdir(tmp_path / benchmark.RESULTS_DIRECTORY)) == 1
@@ -0,0 +1,107 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards import core, boardfile
+from pyqtgameboards.gameboard import QRectangleboard, open_board_file
+
+from conftest import delete_board
+
+
+def create_grid():
+
+    grid = core.HexagonGrid(rows = 6, columns = 7, horizontal = False)
+    grid.build_overlays([
+        {"Name": "block", "Brush": {"color": "#ff000000", "style": 1}, "Pen": "", "Positions": [[1, 1], [6, 7]]},
+        {"Name": "cover", "Brush": "", "Pen": {"color": "#ff000000", "width": 3.0, "style": 2}, "Positions": [[1, 1], [3, 4]]},
+    ])
+
+    return grid
+
+
+def test_round_trip(tmp_path):
+
+    path = str(tmp_path / "map.pqgb")
+    grid = create_grid()
+    boardfile.save_board_file(path, grid)
+
+    board_file = boardfile.load_board_file(path)
+    model = board_file.create_model()
+
+    assert isinstance(model, core.HexagonGrid)
+    assert (model.rows, model.columns, model.horizontal) == (6, 7, False)
+    assert model.overlay_index.names == ["block", "cover"]
+    assert list(model.overlay_index.masks) == list(grid.overlay_index.masks)
+    assert model.overlay_index.get_indices(["cover"]) == grid.overlay_index.get_indices(["cover"])
+    assert model.overlay_index.styles == grid.overlay_index.styles
+
+    board_file.close()
+
+
+def test_changes_stay_in_memory(tmp_path):
+
+    path = str(tmp_path / "map.pqgb")
+    boardfile.save_board_file(path, create_grid())
+
+    board_file = boardfile.load_board_file(path)
+    model = board_file.create_model()
+    model.overlay_index.add_positions("block", [10])
+    board_file.close()
+
+    board_file = boardfile.load_board_file(path)
+    assert board_file.masks[10] == 0
+    board_file.close()
+
+
+def test_not_a_board_file(tmp_path):
+
+    path = tmp_path / "other.pqgb"
+    path.write_bytes(b"not a board" * 4)
+
+    with pytest.raises(ValueError):
+        boardfile.load_board_file(str(path))
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_board_round_trip(app, tmp_path, batched):
+
+    path = str(tmp_path / "board.pqgb")
+    brush = QtGui.QBrush(QtGui.QColor(255,0,0,100))
+    board = QRectangleboard(rows = 5, columns = 4, size = 4, batched = batched, overlays = [{"Name": "enemy", "Brush": brush, "Pen": "", "Positions": [[2, 3], [5, 4]]}])
+    board.save_board_file(path)
+
+    opened = open_board_file(path, batched = batched)
+
+    assert isinstance(opened, QRectangleboard)
+    assert (opened.rows, opened.columns) == (5, 4)
+    assert opened.overlay_index.get_indices(["enemy"]) == {opened.model.get_index(2, 3), opened.model.get_index(5, 4)}
+    assert opened.get_tile_brush(opened.model.get_index(2, 3)).color() == brush.color()
+
+    board_file = opened.board_file
+    delete_board(opened)
+    delete_board(board)
+    board_file.close()
+
+
+def test_rebuilt_board_file_overlays_are_repainted(app, tmp_path):
+
+    path = str(tmp_path / "board.pqgb")
+    brush = QtGui.QBrush(QtGui.QColor(255,0,0,100))
+    board = QRectangleboard(rows = 5, columns = 4, size = 4, batched = True, overlays = [{"Name": "enemy", "Brush": brush, "Pen": "", "Positions": [[2, 3]]}])
+    board.save_board_file(path)
+
+    opened = open_board_file(path, batched = True)
+    index = opened.model.get_index(4, 4)
+
+    # the masks of the file change without a repaint, like a game loading a saved state into them
+    opened.overlay_index.set_masks([index], [1])
+    assert opened.get_tile_brush(index).color() != brush.color()
+
+    opened.rebuild_overlays()
+    opened.flush_repaints()
+    assert opened.get_tile_brush(index).color() == brush.color()
+
+    board_file = opened.board_file
+    delete_board(opened)
+    delete_board(board)
+    board_file.close()
@@ -0,0 +1,61 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard, QBoardChunk, QBoardTile
+
+from conftest import click, delete_board
+
+
+@pytest.fixture(params = [QHexagonboard, QRectangleboard])
+def board(request, app):
+
+    board = request.param(rows = 200, columns = 200, size = 4, chunked = True)
+    board.resize(400, 300)
+    board.update_chunks()
+    yield board
+    delete_board(board)
+
+
+def test_only_chunks_in_view_exist(board):
+
+    chunks = board.board_item.chunks
+    total = board.board_item.chunk_rows * board.board_item.chunk_columns
+
+    assert 0 < len(chunks) < total
+    assert all(isinstance(item, QBoardChunk) for item in board.scene.items())
+
+
+def test_chunks_follow_the_view(board):
+
+    board.centerOn(board.get_shape_rect(200, 200).center())
+    board.update_chunks()
+
+    last_key = (board.board_item.chunk_rows - 1, board.board_item.chunk_columns - 1)
+    assert last_key in board.board_item.chunks
+    assert (0, 0) not in board.board_item.chunks
+
+
+def test_tiles_out_of_view_keep_their_style(board):
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+
+    # the chunk of the tile does not exist
+    tile = board.get_tile(200, 1)
+    assert isinstance(tile, QBoardTile)
+    assert board.board_item.get_chunk_key(tile.index) not in board.board_item.chunks
+
+    board.paint_graphic_item(tile, brush = red)
+    board.flush_repaints()
+
+    assert board.get_tile_brush(tile.index) == red
+
+
+def test_chunked_click_cycle(board):
+
+    click(board, 2, 2)
+    click(board, 3, 4)
+    assert board.get_tile_grid_location(board.target_tile) == [3, 4]
+
+    click(board)
+    assert not any(board.model.state)
@@ -0,0 +1,62 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from pyqtgameboards import core
+
+
+def test_core_does_not_import_qt():
+
+    # a new interpreter, this one already imported Qt for the other tests
+    code = "import sys; from pyqtgameboards import core, pathfinding, visibility, geometry, boardfile, history; print('PyQt5' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output = True, text = True, check = True)
+
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize("horizontal", [True, False])
+def test_hexagon_adjacent_tiles_are_one_step_apart(horizontal):
+
+    grid = core.HexagonGrid(rows = 9, columns = 9, horizontal = horizontal)
+
+    for row, column in [[4, 4], [5, 5], [4, 5], [5, 4]]:
+        adjacent = grid.get_adjacent([row, column])
+
+        assert len(adjacent) == 6
+        for coordinates in adjacent:
+            assert grid.get_distance([row, column], coordinates) == 1
+            assert [row, column] in grid.get_adjacent(coordinates)
+
+
+@pytest.mark.parametrize("horizontal", [True, False])
+def test_hexagon_cube_coordinates_round_trip(horizontal):
+
+    grid = core.HexagonGrid(rows = 6, columns = 6, horizontal = horizontal)
+
+    for index in range(grid.count):
+        row, column = grid.get_coordinates(index)
+        q, r, s = grid.get_cube_coordinates(row, column)
+
+        assert q + r + s == 0
+        assert grid.get_grid_coordinates(q, r) == [row, column]
+
+
+def test_rectangle_adjacent_tiles_stay_on_the_board():
+
+    grid = core.RectangleGrid(rows = 3, columns = 3)
+
+    assert sorted(grid.get_adjacent([1, 1])) == [[1, 2], [2, 1]]
+    assert sorted(grid.get_adjacent([2, 2])) == [[1, 2], [2, 1], [2, 3], [3, 2]]
+    assert sorted(grid.get_adjacent_indices(4)) == [1, 3, 5, 7]
+
+
+def test_build_overlays_without_qt():
+
+    grid = core.HexagonGrid(rows = 5, columns = 5)
+    overlay_index = grid.build_overlays([{"Name": "block", "Brush": "black", "Pen": "", "Positions": [[2, 2], [3, 3]]}])
+
+    assert grid.overlay_index is overlay_index
+    assert overlay_index.get_indices(["block"]) == {grid.get_index(2, 2), grid.get_index(3, 3)}
+    assert overlay_index.get_style(grid.get_index(2, 2)) == (None, "black")
@@ -0,0 +1,76 @@
+import time
+import threading
+
+from PyQt5 import QtGui, QtWidgets
+
+from pyqtgameboards import core
+from pyqtgameboards.gameboard import QRectangleboard
+
+from conftest import click, delete_board
+
+
+def test_last_delta_of_a_tile_counts():
+
+    overlay_index = core.OverlayIndex(10, None, None)
+    overlay_index.add_layer("ally")
+
+    changed, changed_names = overlay_index.apply_deltas([("ally", 1, True), ("ally", 1, False), ("ally", 2, True), ("enemy", 3, True), ("ally", 4, False)])
+
+    assert changed == {2, 3}
+    assert changed_names == {"ally", "enemy"}
+    assert overlay_index.get_indices(["ally"]) == {2}
+
+    # layers of new names are added without a style
+    assert overlay_index.styles[overlay_index.layer_by_name["enemy"]] == (None, None)
+
+
+def test_deltas_repaint_only_changed_tiles(app):
+
+    brush = QtGui.QBrush(QtGui.QColor(255,0,0))
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, overlays = [{"Name": "enemy", "Brush": brush, "Pen": "", "Positions": [[1, 1]]}])
+    board.flush_repaints()
+
+    repaint_count = board.repaint_count
+    board.apply_overlay_deltas([("enemy", [1, 1], True), ("enemy", [2, 2], True), ("enemy", [9, 9], True)])
+    board.flush_repaints()
+
+    assert board.repaint_count == repaint_count + 1
+    assert board.get_tile(2, 2).brush() == brush
+
+    delete_board(board)
+
+
+def test_queued_deltas_from_another_thread(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, overlays = [{"Name": "enemy", "Brush": "", "Pen": "", "Positions": []}])
+    board.delta_window = 0
+
+    thread = threading.Thread(target = board.overlay_deltas.emit, args = ([("enemy", [3, 3], True), ("enemy", [4, 4], True)],))
+    thread.start()
+    thread.join()
+
+    # the signal is queued to the thread of the board, then the deltas wait for the delta timer
+    expected = {board.model.get_index(3, 3), board.model.get_index(4, 4)}
+    deadline = time.perf_counter() + 5
+    while board.overlay_index.get_indices(["enemy"]) != expected and time.perf_counter() < deadline:
+        QtWidgets.QApplication.processEvents()
+
+    assert board.overlay_index.get_indices(["enemy"]) == expected
+
+    delete_board(board)
+
+
+def test_blocking_delta_refreshes_the_line_of_sight(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, overlays = [{"Name": "block", "Brush": "", "Pen": "", "Positions": []}])
+    board.resize(800, 600)
+
+    click(board, 3, 1)
+    click(board, 3, 5)
+    assert len(board.line_of_sight) == 5
+
+    board.apply_overlay_deltas([("block", [3, 3], True)])
+
+    assert [board.get_tile_grid_location(tile) for tile in board.line_of_sight] == [[3, 1], [3, 2], [3, 3]]
+
+    delete_board(board)
@@ -0,0 +1,70 @@
+import pytest
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from pyqtgameboards.gameboard import QHexagonboard, DETAIL_FILL, DETAIL_SIMPLE, DETAIL_FULL
+
+from conftest import click, delete_board
+
+
+def zoom(board, factor):
+
+    board.scale(factor, factor)
+    board.update_detail_level()
+
+
+@pytest.mark.parametrize("factor, detail_level", [(0.04, DETAIL_FILL), (0.2, DETAIL_SIMPLE), (1, DETAIL_FULL)])
+def test_detail_level_by_tile_size(app, factor, detail_level):
+
+    # tiles are 40 scene units wide
+    board = QHexagonboard(rows = 5, columns = 5, size = 4, batched = True)
+    zoom(board, factor)
+
+    assert board.detail_level == detail_level
+    assert (board.board_item.cacheMode() == QtWidgets.QGraphicsItem.NoCache) == (detail_level == DETAIL_FULL)
+
+    delete_board(board)
+
+
+def test_detail_pens(app):
+
+    board = QHexagonboard(rows = 2, columns = 2, size = 4)
+    pen = QtGui.QPen(QtGui.QColor(255,0,0), 3, QtCore.Qt.DashLine)
+
+    assert board.get_detail_pen(pen, DETAIL_FULL) == pen
+    assert board.get_detail_pen(pen, DETAIL_FILL).style() == QtCore.Qt.NoPen
+
+    simple = board.get_detail_pen(pen, DETAIL_SIMPLE)
+    assert simple.style() == QtCore.Qt.SolidLine
+    assert simple.isCosmetic()
+    assert simple.color() == pen.color()
+
+    delete_board(board)
+
+
+def test_per_item_tiles_follow_the_detail_level(app):
+
+    cover = QtGui.QPen(QtGui.QColor(0,0,0), 3, QtCore.Qt.DashLine)
+    board = QHexagonboard(rows = 5, columns = 5, size = 4, overlays = [{"Name": "cover", "Brush": "", "Pen": cover, "Positions": [[2, 2]]}])
+    board.resize(800, 600)
+
+    zoom(board, 0.04)
+    assert board.item_detail_level == DETAIL_FILL
+    assert all(item.pen().style() == QtCore.Qt.NoPen for item in board.model.items)
+
+    zoom(board, 5)
+    assert board.item_detail_level == DETAIL_SIMPLE
+    assert board.get_tile(2, 2).pen().style() == QtCore.Qt.SolidLine
+
+    # repainted tiles get the pen of the level too
+    click(board, 2, 2)
+    click(board)
+    assert board.get_tile(2, 2).pen().isCosmetic()
+
+    zoom(board, 5)
+    assert board.item_detail_level == DETAIL_FULL
+    assert board.get_tile(2, 2).pen() == cover
+    assert board.get_tile(1, 1).pen().style() == QtCore.Qt.SolidLine
+
+    delete_board(board)
+
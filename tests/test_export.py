@@ -0,0 +1,97 @@
+import xml.etree.ElementTree
+
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards import core, boardfile, export
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+
+from conftest import delete_board
+
+
+def create_board(chunked = False):
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+    return QRectangleboard(rows = 12, columns = 10, size = 4, chunked = chunked, overlays = [{"Name": "enemy", "Brush": red, "Pen": "", "Positions": [[2, 3], [11, 8]]}])
+
+
+def get_tile_pixel(board, image, row, column, scale):
+
+    # the center of the tile in the image
+    center = board.get_shape_rect(row, column).center() - export.get_export_rect(board).topLeft()
+    return QtGui.QColor(image.pixel(int(center.x() * scale), int(center.y() * scale)))
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_png(app, tmp_path, chunked):
+
+    board = create_board(chunked)
+    path = str(tmp_path / "board.png")
+
+    size = board.export_png(path, scale = 0.5, background = QtGui.QColor(0,0,0))
+    image = QtGui.QImage(path)
+
+    assert (image.width(), image.height()) == (size.width(), size.height())
+    assert get_tile_pixel(board, image, 2, 3, 0.5) == QtGui.QColor(255,0,0)
+    assert get_tile_pixel(board, image, 5, 5, 0.5) != QtGui.QColor(255,0,0)
+
+    # the longest side fits the image size
+    size = board.export_png(path, image_size = 64)
+    assert max(size.width(), size.height()) == 64
+
+    delete_board(board)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_png_in_strips(app, tmp_path, chunked):
+
+    board = create_board(chunked)
+    board.resize(200, 150)
+    board.update_chunks()
+    chunks = len(board.board_item.chunks) if chunked == True else None
+
+    path = str(tmp_path / "board.png")
+    size = export.export_png(board, path, scale = 0.5, strip_pixels = 1000)
+    image = QtGui.QImage(path)
+
+    assert size.height() > 1000 // size.width()
+    assert (image.width(), image.height()) == (size.width(), size.height())
+    assert get_tile_pixel(board, image, 2, 3, 0.5) == QtGui.QColor(255,0,0)
+    assert get_tile_pixel(board, image, 11, 8, 0.5) == QtGui.QColor(255,0,0)
+
+    # only the chunks in view are kept afterwards
+    if chunked == True:
+        assert len(board.board_item.chunks) == chunks
+
+    delete_board(board)
+
+
+def test_svg(app, tmp_path):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4, chunked = True)
+    path = str(tmp_path / "board.svg")
+
+    size = board.export_svg(path)
+    root = xml.etree.ElementTree.parse(path).getroot()
+
+    assert root.get("viewBox") == f"0 0 {size.width()} {size.height()}"
+    assert root.find("{http://www.w3.org/2000/svg}title").text == "board"
+
+    delete_board(board)
+
+
+def test_board_files(tmp_path):
+
+    grid = core.RectangleGrid(rows = 8, columns = 8)
+    grid.build_overlays([{"Name": "enemy", "Brush": {"color": "#ffff0000", "style": 1}, "Pen": "", "Positions": [[1, 1]]}])
+    path = str(tmp_path / "map.pqgb")
+    boardfile.save_board_file(path, grid)
+
+    missing = str(tmp_path / "missing.pqgb")
+    output_directory = str(tmp_path / "images")
+    results = dict(export.export_board_files([path, missing], output_directory, formats = ("png", "svg"), image_size = 32, processes = 1))
+
+    assert results[path] == [str(tmp_path / "images" / "map.png"), str(tmp_path / "images" / "map.svg")]
+    assert QtGui.QImage(results[path][0]).width() == 32
+    assert isinstance(results[missing], Exception)
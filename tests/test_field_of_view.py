@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from pyqtgameboards import core
+from pyqtgameboards.pathfinding import Pathfinder
+from pyqtgameboards.visibility import get_field_of_view, round_up, round_down
+from pyqtgameboards.gameboard import QHexagonboard
+
+from conftest import click, delete_board
+
+
+def create_grid(grid_class, seed):
+
+    generator = random.Random(seed)
+    grid = grid_class(rows = 15, columns = 15)
+    grid.build_overlays([{"Name": "block", "Positions": [[generator.randint(1, 15), generator.randint(1, 15)] for _ in range(40)]}])
+
+    return grid
+
+
+def test_rounding_of_halves():
+
+    assert [round_up(numerator, 2) for numerator in [-3, -1, 1, 3]] == [-1, 0, 1, 2]
+    assert [round_down(numerator, 2) for numerator in [-3, -1, 1, 3]] == [-2, -1, 0, 1]
+    assert round_up(7, 3) == 2
+    assert round_down(-7, 3) == -2
+
+
+@pytest.mark.parametrize("grid_class", [core.RectangleGrid, core.HexagonGrid])
+def test_open_field_of_view_is_the_radius(grid_class):
+
+    grid = grid_class(rows = 15, columns = 15)
+    visible = get_field_of_view(grid, [8, 8], 3)
+
+    # without blocking tiles every tile within the radius is visible on a hexagon grid,
+    # on a rectangle grid the view is the square around the origin
+    for index in range(grid.count):
+        coordinates = grid.get_coordinates(index)
+
+        if grid_class == core.HexagonGrid:
+            assert (index in visible) == (grid.get_distance([8, 8], coordinates) <= 3)
+        else:
+            assert (index in visible) == (max(abs(coordinates[0] - 8), abs(coordinates[1] - 8)) <= 3)
+
+
+@pytest.mark.parametrize("grid_class", [core.RectangleGrid, core.HexagonGrid])
+def test_field_of_view_is_symmetric(grid_class):
+
+    for seed in range(3):
+        grid = create_grid(grid_class, seed)
+        fields = {}
+
+        for index in range(0, grid.count, 7):
+            if grid.overlay_index.masks[index] == 0:
+                fields[index] = get_field_of_view(grid, grid.get_coordinates(index), 20)
+
+        for origin, visible in fields.items():
+            for target in fields:
+                assert (target in visible) == (origin in fields[target])
+
+
+def test_blocking_tile_casts_a_shadow():
+
+    grid = core.RectangleGrid(rows = 9, columns = 9)
+    grid.build_overlays([{"Name": "block", "Positions": [[5, 6]]}])
+
+    visible = get_field_of_view(grid, [5, 5], 4)
+
+    assert grid.get_index(5, 6) in visible
+    assert grid.get_index(5, 7) not in visible
+    assert grid.get_index(5, 4) in visible
+
+
+def test_field_of_view_outside_of_board():
+
+    assert get_field_of_view(core.RectangleGrid(rows = 3, columns = 3), [0, 0], 2) == set()
+
+
+@pytest.mark.parametrize("grid_class", [core.RectangleGrid, core.HexagonGrid])
+def test_reachable_tiles_match_the_distances(grid_class):
+
+    grid = create_grid(grid_class, 5)
+    pathfinder = Pathfinder(grid)
+
+    for movement_points in [0, 1, 4]:
+        assert pathfinder.get_reachable([8, 8], movement_points) == set(pathfinder.get_distances([8, 8], movement_points))
+
+
+def test_selection_paints_ranges(app):
+
+    board = QHexagonboard(rows = 10, columns = 10, size = 4, batched = True)
+    board.resize(800, 600)
+    board.movement_points = 2
+    board.sight_radius = 3
+
+    click(board, 5, 5)
+
+    # the ranges without the selected tile
+    assert len(board.reachable_tiles) == len(board.pathfinder.get_reachable([5, 5], 2)) - 1
+    assert len(board.visible_tiles) == len(get_field_of_view(board.model, [5, 5], 3)) - 1
+    assert set(board.model.get_indices_with_state(core.REACHABLE)) == {board.get_tile_index(tile) for tile in board.reachable_tiles}
+
+    click(board)
+
+    assert board.model.get_indices_with_state(core.REACHABLE | core.VISIBLE) == []
+
+    delete_board(board)
@@ -0,0 +1,78 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+from pyqtgameboards.fog import QFogLayer
+from pyqtgameboards.units import QUnitLayer
+
+from conftest import delete_board
+
+
+def get_alpha(fog, row, column):
+
+    x, y = fog.pixel_grid.get_tile_pixel(row, column)
+    return QtGui.qAlpha(fog.mask.pixel(x, y))
+
+
+@pytest.mark.parametrize("board_class, horizontal", [(QRectangleboard, True), (QHexagonboard, True), (QHexagonboard, False)])
+def test_fog_follows_the_source(app, board_class, horizontal):
+
+    board = board_class(rows = 12, columns = 12, size = 4, horizontal = horizontal)
+    fog = QFogLayer(board, faction = "blue")
+
+    assert (fog.mask.width(), fog.mask.height()) == (fog.pixel_grid.width, fog.pixel_grid.height)
+    assert get_alpha(fog, 3, 3) == fog.unexplored_alpha
+
+    fog.set_source("blue", "scout", 3, 3, radius = 2)
+    assert get_alpha(fog, 3, 3) == 0
+    assert get_alpha(fog, 12, 12) == fog.unexplored_alpha
+
+    # the tiles left behind stay explored
+    fog.set_source("blue", "scout", 10, 10, radius = 2)
+    assert get_alpha(fog, 3, 3) == fog.explored_alpha
+    assert get_alpha(fog, 10, 10) == 0
+
+    # sources of other factions do not clear the shown fog
+    fog.set_source("red", "scout", 6, 6, radius = 2)
+    assert get_alpha(fog, 6, 6) == fog.unexplored_alpha
+
+    fog.show_faction("red")
+    assert get_alpha(fog, 6, 6) == 0
+    assert get_alpha(fog, 10, 10) == fog.unexplored_alpha
+
+    delete_board(board)
+
+
+def test_blocking_tiles_hide_the_tiles_behind(app):
+
+    board = QRectangleboard(rows = 5, columns = 9, size = 4, overlays = [{"Name": "block", "Brush": "", "Pen": "", "Positions": [[1, 3], [2, 3], [3, 3], [4, 3], [5, 3]]}])
+    fog = QFogLayer(board, faction = "blue")
+
+    fog.set_source("blue", "scout", 3, 1, radius = 8)
+    assert get_alpha(fog, 3, 2) == 0
+    assert get_alpha(fog, 3, 5) == fog.unexplored_alpha
+
+    fog.remove_source("blue", "scout")
+    assert get_alpha(fog, 3, 2) == fog.explored_alpha
+
+    delete_board(board)
+
+
+def test_units_are_sources_of_sight(app):
+
+    board = QRectangleboard(rows = 8, columns = 8, size = 4)
+    units = QUnitLayer(board)
+    fog = QFogLayer(board, faction = "blue")
+
+    scout = units.add_unit(2, 2, data = {"faction": "blue"})
+    fog.track_units(units, lambda unit: unit.data["faction"], radius = 1)
+    assert get_alpha(fog, 2, 3) == 0
+
+    units.add_unit(7, 7, data = {"faction": "blue"})
+    assert get_alpha(fog, 7, 7) == 0
+
+    units.remove_unit(scout)
+    assert get_alpha(fog, 2, 2) == fog.explored_alpha
+
+    delete_board(board)
@@ -0,0 +1,103 @@
+import pytest
+
+from pyqtgameboards import core
+from pyqtgameboards.geometry import RectangleGeometry, HexagonGeometry
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+
+from conftest import delete_board
+
+
+def create_geometries():
+
+    return [
+        RectangleGeometry(4, 5, 40, 30, 10, 20),
+        HexagonGeometry(core.HexagonGrid(6, 5), 20, 60, 17, 30, 0, 0),
+        HexagonGeometry(core.HexagonGrid(6, 5, horizontal = False), 20, 17, 60, 30, 0, 0),
+    ]
+
+
+@pytest.mark.parametrize("geometry", create_geometries())
+def test_positions_of_all_tiles(geometry):
+
+    xs, ys = geometry.get_positions()
+    positions = [geometry.get_position(row, column) for row in range(1, geometry.rows + 1) for column in range(1, geometry.columns + 1)]
+
+    assert list(zip(xs, ys)) == positions
+
+    xs, ys = geometry.get_positions(2, 3, 2, 4)
+    assert list(zip(xs, ys)) == [geometry.get_position(row, column) for row in [2, 3] for column in [2, 3, 4]]
+
+
+@pytest.mark.parametrize("geometry", create_geometries())
+def test_tile_centers_convert_back(geometry):
+
+    for row in range(1, geometry.rows + 1):
+        for column in range(1, geometry.columns + 1):
+            x, y = geometry.get_position(row, column)
+
+            assert geometry.contains(row, column, x, y)
+            assert geometry.get_grid_location(x, y) == [row, column]
+
+
+@pytest.mark.parametrize("geometry", create_geometries())
+def test_grid_range_covers_the_intersecting_tiles(geometry):
+
+    left, top, right, bottom = 35.0, 25.0, 95.0, 70.0
+    first_row, last_row, first_column, last_column = geometry.get_grid_range(left, top, right, bottom)
+
+    for row in range(1, geometry.rows + 1):
+        for column in range(1, geometry.columns + 1):
+            x, y, width, height = geometry.get_rect(row, column)
+
+            if x < right and x + width > left and y < bottom and y + height > top:
+                assert first_row <= row <= last_row
+                assert first_column <= column <= last_column
+
+
+def test_rectangle_edges():
+
+    geometry = RectangleGeometry(4, 5, 40, 30, 10, 20)
+
+    # tile 1, 1 is centered on the origin plus a tile and spans half a tile to both sides
+    assert geometry.get_rect(1, 1) == (30, 35, 40, 30)
+    assert geometry.get_grid_location(30, 35) == [1, 1]
+    assert geometry.get_grid_location(29.9, 35) == None
+
+
+@pytest.mark.parametrize("board_class", [QHexagonboard, QRectangleboard])
+def test_tiles_are_placed_by_the_geometry(app, board_class):
+
+    board = board_class(rows = 4, columns = 4, size = 4)
+
+    for index, item in enumerate(board.model.items):
+        row, column = board.model.get_coordinates(index)
+        shape = item.polygon().boundingRect() if hasattr(item, "polygon") else item.rect()
+        center = item.mapToScene(shape.center())
+
+        assert (round(center.x(), 6), round(center.y(), 6)) == tuple(round(value, 6) for value in board.grid_geometry.get_position(row, column))
+
+    delete_board(board)
+
+
+@pytest.mark.parametrize("geometry", create_geometries())
+def test_pixel_grid_covers_the_tiles(geometry):
+
+    pixel_grid = geometry.get_pixel_grid()
+    left, top, width, height = pixel_grid.get_rect()
+
+    pixels = set()
+    for row in range(1, geometry.rows + 1):
+        for column in range(1, geometry.columns + 1):
+            x, y = pixel_grid.get_tile_pixel(row, column)
+
+            # the pixels of a tile are at its center and no other tile has them
+            center_x, center_y = geometry.get_position(row, column)
+            assert abs(left + (x + pixel_grid.x_pixels / 2) * pixel_grid.pixel_width - center_x) < 1e-9
+            assert abs(top + (y + pixel_grid.y_pixels / 2) * pixel_grid.pixel_height - center_y) < 1e-9
+
+            tile_pixels = {(x + dx, y + dy) for dx in range(pixel_grid.x_pixels) for dy in range(pixel_grid.y_pixels)}
+            assert len(pixels & tile_pixels) == 0
+            assert all(0 <= px < pixel_grid.width and 0 <= py < pixel_grid.height for px, py in tile_pixels)
+            pixels |= tile_pixels
+
+    assert (width, height) == (pixel_grid.width * pixel_grid.pixel_width, pixel_grid.height * pixel_grid.pixel_height)
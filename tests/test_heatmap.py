@@ -0,0 +1,88 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+from pyqtgameboards.heatmap import QHeatmapLayer, write_shifted
+
+from conftest import delete_board
+
+
+def get_tile_colors(heatmap, row, column):
+
+    # the colors of all pixels of the tile
+    x, y = heatmap.pixel_grid.get_tile_pixel(row, column)
+    return heatmap.buffer[y:y + heatmap.pixel_grid.y_pixels, x:x + heatmap.pixel_grid.x_pixels].ravel().tolist()
+
+
+@pytest.mark.parametrize("board_class, horizontal", [(QRectangleboard, True), (QHexagonboard, True), (QHexagonboard, False)])
+def test_tiles_get_the_colors_of_their_values(app, board_class, horizontal):
+
+    board = board_class(rows = 7, columns = 6, size = 4, horizontal = horizontal)
+    heatmap = QHeatmapLayer(board, minimum = 0, maximum = 41)
+
+    values = numpy.arange(42, dtype = numpy.float32).reshape(7, 6)
+    heatmap.set_values(values)
+
+    assert heatmap.buffer.shape == (heatmap.pixel_grid.height, heatmap.pixel_grid.width)
+    for row in range(1, 8):
+        for column in range(1, 7):
+            color = int(heatmap.get_colors(values[row - 1, column - 1]))
+            assert get_tile_colors(heatmap, row, column) == [color] * (heatmap.pixel_grid.x_pixels * heatmap.pixel_grid.y_pixels)
+
+    # only the given tiles change
+    heatmap.set_values(numpy.full((2, 3), numpy.nan), row = 3, column = 2)
+    assert get_tile_colors(heatmap, 3, 2) == [0] * (heatmap.pixel_grid.x_pixels * heatmap.pixel_grid.y_pixels)
+    assert get_tile_colors(heatmap, 4, 4)[0] == 0
+    assert get_tile_colors(heatmap, 4, 5)[0] == int(heatmap.get_colors(values[3, 4]))
+
+    heatmap.clear()
+    assert not heatmap.buffer.any()
+
+    delete_board(board)
+
+
+def test_values_outside_the_range_get_the_colors_of_its_ends(app):
+
+    board = QRectangleboard(rows = 2, columns = 2, size = 4)
+    heatmap = QHeatmapLayer(board, minimum = 0, maximum = 10)
+    heatmap.set_values([[-5, 0], [10, 50]])
+
+    assert get_tile_colors(heatmap, 1, 1) == get_tile_colors(heatmap, 1, 2) == [int(heatmap.color_table[1])]
+    assert get_tile_colors(heatmap, 2, 1) == get_tile_colors(heatmap, 2, 2) == [int(heatmap.color_table[255])]
+
+    heatmap.set_range(-10, 50)
+    assert get_tile_colors(heatmap, 1, 1) != get_tile_colors(heatmap, 1, 2)
+    assert get_tile_colors(heatmap, 2, 2) == [int(heatmap.color_table[255])]
+
+    delete_board(board)
+
+
+def test_values_have_to_fit_on_the_board(app):
+
+    board = QRectangleboard(rows = 3, columns = 3, size = 4)
+    heatmap = QHeatmapLayer(board)
+
+    with pytest.raises(ValueError):
+        heatmap.set_values(numpy.zeros((2, 2)), row = 3, column = 1)
+
+    with pytest.raises(ValueError):
+        heatmap.set_values(numpy.zeros(3))
+
+    delete_board(board)
+
+
+def test_write_shifted():
+
+    buffer = numpy.zeros((4, 7), dtype = numpy.uint32)
+    colors = numpy.array([[1, 2], [3, 4], [5, 6]], dtype = numpy.uint32)
+
+    # lines 1 to 3, tiles 1 and 2, the even line is shifted by a pixel
+    write_shifted(buffer, colors, 1, 1)
+
+    assert buffer.tolist() == [
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 2, 2, 0],
+        [0, 0, 0, 3, 3, 4, 4],
+        [0, 0, 5, 5, 6, 6, 0],
+    ]
@@ -0,0 +1,186 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards import core, history
+from pyqtgameboards.gameboard import QRectangleboard
+
+from conftest import delete_board
+
+
+def create_overlay_index():
+
+    overlay_index = core.OverlayIndex(20, None, None)
+    overlay_index.add_layer("forest")
+    overlay_index.add_layer("river")
+
+    return overlay_index
+
+
+def test_step_keeps_the_changed_tiles():
+
+    overlay_index = create_overlay_index()
+    edit_history = history.EditHistory(overlay_index)
+
+    # edits outside of a transaction are not recorded
+    overlay_index.add_positions("river", [0])
+    assert edit_history.can_undo() == False
+
+    with edit_history.transaction("forest"):
+        overlay_index.add_positions("forest", [5, 3, 4])
+        with edit_history.transaction():
+            overlay_index.add_positions("river", [3])
+
+        # changed back within the step
+        overlay_index.remove_positions("forest", [4])
+
+    step = edit_history.undo_steps[-1]
+    assert step.name == "forest"
+    assert list(step.indices) == [3, 5]
+    assert list(step.before) == [0, 0]
+    assert list(step.after) == [3, 1]
+    assert step.mask == 3
+
+
+def test_undo_and_redo():
+
+    overlay_index = create_overlay_index()
+    edit_history = history.EditHistory(overlay_index)
+
+    with edit_history.transaction():
+        overlay_index.add_positions("forest", [1, 2])
+    with edit_history.transaction():
+        overlay_index.remove_positions("forest", [2])
+
+    versions = overlay_index.get_versions(["forest"])
+
+    assert list(edit_history.undo().indices) == [2]
+    assert overlay_index.get_indices(["forest"]) == {1, 2}
+    assert overlay_index.get_versions(["forest"]) != versions
+
+    edit_history.undo()
+    assert overlay_index.get_indices(["forest"]) == set()
+    assert edit_history.undo() == None
+
+    edit_history.redo()
+    assert overlay_index.get_indices(["forest"]) == {1, 2}
+
+    # a new step drops the steps to redo
+    with edit_history.transaction():
+        overlay_index.add_positions("river", [7])
+    assert edit_history.can_redo() == False
+
+
+def test_rollback_when_the_transaction_raises():
+
+    overlay_index = create_overlay_index()
+    edit_history = history.EditHistory(overlay_index)
+
+    with pytest.raises(ValueError):
+        with edit_history.transaction():
+            overlay_index.add_positions("forest", [1, 2])
+            raise ValueError()
+
+    assert overlay_index.get_indices(["forest"]) == set()
+    assert edit_history.can_undo() == False
+    assert edit_history.depth == 0
+
+
+def test_rollback_of_a_nested_transaction_keeps_the_outer_step():
+
+    overlay_index = create_overlay_index()
+    edit_history = history.EditHistory(overlay_index)
+
+    with edit_history.transaction("wave"):
+        overlay_index.add_positions("forest", [1])
+
+        with pytest.raises(ValueError):
+            with edit_history.transaction():
+                overlay_index.add_positions("forest", [1, 2])
+                overlay_index.add_positions("river", [1])
+                raise ValueError()
+
+        overlay_index.add_positions("river", [3])
+
+    assert overlay_index.get_indices(["forest"]) == {1}
+    assert overlay_index.get_indices(["river"]) == {3}
+
+    step = edit_history.undo_steps[-1]
+    assert step.name == "wave"
+    assert list(step.indices) == [1, 3]
+
+    # 4 bytes per index and 8 per mask before and after
+    assert step.indices.itemsize + step.before.itemsize + step.after.itemsize == 20
+
+
+def test_only_the_last_steps_are_kept():
+
+    overlay_index = create_overlay_index()
+    edit_history = history.EditHistory(overlay_index, limit = 3)
+
+    for index in range(5):
+        with edit_history.transaction():
+            overlay_index.add_positions("forest", [index])
+
+    assert [list(step.indices) for step in edit_history.undo_steps] == [[2], [3], [4]]
+
+
+def test_set_masks_returns_the_changed_layers():
+
+    overlay_index = create_overlay_index()
+    overlay_index.add_positions("forest", [1])
+    versions = list(overlay_index.versions)
+
+    assert overlay_index.set_masks([1, 2], [1, 2]) == 2
+    assert overlay_index.get_indices(["river"]) == {2}
+    assert overlay_index.versions == [versions[0], versions[1] + 1]
+
+    assert overlay_index.set_masks([1, 2], [0, 2]) == 1
+    assert overlay_index.get_indices(["forest"]) == set()
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_board_undo_repaints_the_step(app, batched):
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, batched = batched, overlays = [{"Name": "enemy", "Brush": red, "Pen": "", "Positions": []}])
+    board.enable_history()
+
+    index = board.model.get_index(2, 3)
+    board.add_overlay_positions("enemy", [[2, 3]])
+    board.flush_repaints()
+    assert board.get_tile_brush(index) == red
+
+    step = board.undo()
+    board.flush_repaints()
+    assert list(step.indices) == [index]
+    assert board.get_tile_brush(index) != red
+
+    board.redo()
+    board.flush_repaints()
+    assert board.get_tile_brush(index) == red
+
+    delete_board(board)
+
+
+def test_board_edit_is_one_step_and_rolls_back(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, overlays = [{"Name": "enemy", "Brush": "", "Pen": "", "Positions": []}])
+    board.enable_history()
+
+    with board.edit("wave"):
+        board.add_overlay_positions("enemy", [[1, 1]])
+        board.add_overlay_positions("enemy", [[1, 2]])
+
+    assert len(board.history.undo_steps) == 1
+    assert board.history.undo_steps[-1].name == "wave"
+
+    with pytest.raises(KeyError):
+        with board.edit():
+            board.add_overlay_positions("enemy", [[3, 3]])
+            raise KeyError()
+
+    assert board.overlay_index.get_indices(["enemy"]) == {board.model.get_index(1, 1), board.model.get_index(1, 2)}
+    assert len(board.history.undo_steps) == 1
+
+    delete_board(board)
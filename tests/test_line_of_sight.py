@@ -0,0 +1,75 @@
+import pytest
+
+from pyqtgameboards import core
+from pyqtgameboards.gameboard import QRectangleboard
+
+from conftest import click, delete_board
+
+
+def test_rectangle_straight_line():
+
+    grid = core.RectangleGrid(rows = 5, columns = 5)
+
+    assert grid.get_grid_line([2, 1], [2, 4]) == [[2, 1], [2, 2], [2, 3], [2, 4]]
+
+
+def test_rectangle_line_through_corners():
+
+    grid = core.RectangleGrid(rows = 5, columns = 5)
+    line = grid.get_grid_line([1, 1], [3, 3])
+
+    # both rectangles beside every corner are touched
+    assert line == [[1, 1], [2, 1], [1, 2], [2, 2], [3, 2], [2, 3], [3, 3]]
+
+
+@pytest.mark.parametrize("horizontal", [True, False])
+def test_hexagon_line_steps_between_adjacent_tiles(horizontal):
+
+    grid = core.HexagonGrid(rows = 12, columns = 12, horizontal = horizontal)
+
+    for origin, target in [([1, 1], [12, 12]), ([6, 2], [3, 11]), ([12, 1], [1, 5])]:
+        line = grid.get_grid_line(origin, target)
+
+        assert line[0] == origin
+        assert line[-1] == target
+        assert len(line) == grid.get_distance(origin, target) + 1
+
+        for previous, following in zip(line, line[1:]):
+            assert following in grid.get_adjacent(previous)
+
+
+def test_line_of_sight_stops_at_blocking_tile():
+
+    grid = core.RectangleGrid(rows = 5, columns = 5)
+    grid.build_overlays([{"Name": "block", "Positions": [[3, 3]]}])
+
+    assert grid.get_line_of_sight([3, 1], [3, 5]) == [[3, 1], [3, 2], [3, 3]]
+    assert grid.get_line_of_sight([1, 1], [1, 5]) == [[1, 1], [1, 2], [1, 3], [1, 4], [1, 5]]
+
+    # other overlays do not block
+    assert grid.get_line_of_sight([3, 1], [3, 5], blocking = ("wall",))[-1] == [3, 5]
+
+
+def test_line_of_sight_from_a_blocking_tile():
+
+    grid = core.RectangleGrid(rows = 5, columns = 5)
+    grid.build_overlays([{"Name": "block", "Positions": [[1, 1]]}])
+
+    # the tile of the origin does not block, also for an origin given as a tuple
+    assert grid.get_line_of_sight([1, 1], [1, 4]) == [[1, 1], [1, 2], [1, 3], [1, 4]]
+    assert grid.get_line_of_sight((1, 1), (1, 4)) == [[1, 1], [1, 2], [1, 3], [1, 4]]
+
+
+def test_target_paints_line_of_sight(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4)
+    board.resize(800, 600)
+
+    click(board, 3, 1)
+    click(board, 3, 5)
+
+    sight = [board.get_tile_grid_location(tile) for tile in board.line_of_sight]
+    assert sight == [[3, 1], [3, 2], [3, 3], [3, 4], [3, 5]]
+    assert board.model.get_indices_with_state(core.SIGHT) == board.model.get_indices([[3, 2], [3, 3], [3, 4]])
+
+    delete_board(board)
@@ -0,0 +1,71 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards.gameboard import QRectangleboard
+from pyqtgameboards.minimap import QMinimap
+
+from conftest import delete_board
+
+
+def render(minimap):
+
+    minimap.show()
+    while len(minimap.dirty_regions) > 0:
+        minimap.render_regions()
+
+
+@pytest.fixture
+def board(app):
+
+    board = QRectangleboard(rows = 80, columns = 80, size = 4, batched = True)
+    board.resize(400, 300)
+    yield board
+    delete_board(board)
+
+
+def test_image_shows_the_tiles(board):
+
+    minimap = QMinimap(board, image_size = 160)
+    render(minimap)
+
+    assert max(minimap.image.width(), minimap.image.height()) == 160
+    assert QtGui.QColor(minimap.image.pixel(80, 80)) == QtGui.QColor(255,255,255)
+
+
+def test_repainted_tiles_mark_their_region(board):
+
+    minimap = QMinimap(board, image_size = 160)
+    render(minimap)
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+    board.paint_graphic_item(board.get_tile(80, 80), brush = red)
+    board.flush_repaints()
+
+    last_region = ((80 - 1) // minimap.region_size, (80 - 1) // minimap.region_size)
+    assert list(minimap.dirty_regions) == [last_region]
+
+    render(minimap)
+
+    position = minimap.map_from_scene(board.get_shape_rect(80, 80).center()) - minimap.get_image_offset()
+    assert QtGui.QColor(minimap.image.pixel(position.toPoint())) == QtGui.QColor(255,0,0)
+
+
+def test_positions_map_both_ways(board):
+
+    minimap = QMinimap(board, image_size = 160)
+    center = board.get_shape_rect(40, 20).center()
+    mapped = minimap.map_to_scene(minimap.map_from_scene(center))
+
+    assert abs(mapped.x() - center.x()) < 1e-6
+    assert abs(mapped.y() - center.y()) < 1e-6
+
+
+def test_one_tile_per_pixel_on_large_boards(app):
+
+    board = QRectangleboard(rows = 1000, columns = 1000, size = 4, chunked = True)
+    minimap = QMinimap(board, image_size = 100)
+
+    assert minimap.step == 10
+
+    delete_board(board)
@@ -0,0 +1,69 @@
+import pytest
+
+from pyqtgameboards import core
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+
+from conftest import delete_board
+
+
+def test_index_and_coordinates_round_trip():
+
+    model = core.BoardModel(rows = 4, columns = 7)
+
+    for index in range(model.count):
+        row, column = model.get_coordinates(index)
+        assert model.get_index(row, column) == index
+
+    assert model.get_index(1, 1) == 0
+    assert model.get_index(2, 1) == 7
+    assert model.get_index(4, 7) == model.count - 1
+
+
+@pytest.mark.parametrize("row, column", [(0, 1), (1, 0), (5, 1), (1, 8), (-1, -1)])
+def test_index_outside_of_board(row, column):
+
+    model = core.BoardModel(rows = 4, columns = 7)
+
+    assert model.get_index(row, column) == None
+
+
+def test_items_by_index():
+
+    model = core.BoardModel(rows = 2, columns = 2)
+    item = object()
+
+    assert model.get_item(0) == None
+    assert model.get_item_index(item) == None
+
+    model.set_item(3, item)
+
+    assert model.get_item(3) is item
+    assert model.get_item_index(item) == 3
+    assert model.get_item(None) == None
+
+
+def test_state_flags():
+
+    model = core.BoardModel(rows = 3, columns = 3)
+
+    model.set_state([1, 4], core.SELECTED | core.TARGET)
+    model.set_state([4], core.TARGET, False)
+
+    assert model.has_state(1, core.TARGET)
+    assert model.has_state(4, core.SELECTED)
+    assert not model.has_state(4, core.TARGET)
+    assert model.get_indices_with_state(core.SELECTED) == [1, 4]
+
+
+@pytest.mark.parametrize("board_class", [QHexagonboard, QRectangleboard])
+def test_per_item_board_stores_its_items(app, board_class):
+
+    board = board_class(rows = 5, columns = 6, size = 4)
+
+    assert len(board.model.items) == 30
+
+    for index, item in enumerate(board.model.items):
+        assert board.get_tile_index(item) == index
+        assert board.get_tile(*board.model.get_coordinates(index)) is item
+
+    delete_board(board)
@@ -0,0 +1,92 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards import core
+from pyqtgameboards.gameboard import QRectangleboard
+
+from conftest import click, delete_board
+
+
+def create_index():
+
+    overlay_index = core.OverlayIndex(20, "pen", "brush")
+    overlay_index.add_layer("block", brush = "black")
+    overlay_index.add_layer("cover", pen = "dashed")
+    overlay_index.add_layer("enemy", brush = "red")
+
+    return overlay_index
+
+
+def test_positions_and_masks():
+
+    overlay_index = create_index()
+
+    assert overlay_index.add_positions("block", [2, 3, 2]) == [2, 3]
+    assert overlay_index.add_positions("cover", [3, 7]) == [3, 7]
+    assert overlay_index.remove_positions("block", [2, 9]) == [2]
+
+    assert overlay_index.masks[3] == 0b11
+    assert overlay_index.get_indices(["block", "cover"]) == {3, 7}
+    assert overlay_index.get_masked_indices() == [3, 7]
+    assert overlay_index.get_masked_indices(overlay_index.get_layer_mask(["cover"])) == [3, 7]
+    assert overlay_index.get_layer_mask(["enemy", "unknown"]) == 0b100
+
+
+def test_later_layers_paint_over_earlier_ones():
+
+    overlay_index = create_index()
+    overlay_index.add_positions("block", [1])
+    overlay_index.add_positions("cover", [1])
+    overlay_index.add_positions("enemy", [1, 2])
+
+    assert overlay_index.get_style(0) == ("pen", "brush")
+    assert overlay_index.get_style(1) == ("dashed", "red")
+    assert overlay_index.get_style(2) == ("pen", "red")
+
+
+def test_versions_change_with_their_layer():
+
+    overlay_index = create_index()
+
+    versions = overlay_index.get_versions(["block"])
+    overlay_index.add_positions("cover", [4])
+    assert overlay_index.get_versions(["block"]) == versions
+
+    overlay_index.add_positions("block", [4])
+    assert overlay_index.get_versions(["block"]) != versions
+
+    # nothing changes, nothing is raised
+    versions = overlay_index.get_versions(["block"])
+    overlay_index.add_positions("block", [4])
+    assert overlay_index.get_versions(["block"]) == versions
+
+
+def test_layer_limits():
+
+    overlay_index = core.OverlayIndex(4, None, None)
+    overlay_index.add_layer("block")
+
+    with pytest.raises(ValueError):
+        overlay_index.add_layer("block")
+
+    for number in range(63):
+        overlay_index.add_layer(number)
+
+    with pytest.raises(ValueError):
+        overlay_index.add_layer("one too many")
+
+
+def test_deselected_tile_gets_overlay_brush_back(app):
+
+    brush = QtGui.QBrush(QtGui.QColor(255,0,0,100))
+    board = QRectangleboard(rows = 4, columns = 4, size = 4, overlays = [{"Name": "enemy", "Brush": brush, "Pen": "", "Positions": [[2, 2]]}])
+    board.resize(800, 600)
+
+    click(board, 2, 2)
+    assert board.get_tile(2, 2).brush() != brush
+
+    click(board)
+    assert board.get_tile(2, 2).brush() == brush
+
+    delete_board(board)
@@ -0,0 +1,109 @@
+import pytest
+
+from pyqtgameboards import core
+from pyqtgameboards.pathfinding import Pathfinder, INFINITE
+
+
+def create_grid():
+
+    # a wall over column 3 with a gap in row 5, and a swamp on row 1
+    grid = core.RectangleGrid(rows = 5, columns = 5)
+    grid.build_overlays([
+        {"Name": "block", "Positions": [[1, 3], [2, 3], [3, 3], [4, 3]]},
+        {"Name": "swamp", "Positions": [[1, 4], [1, 5]]},
+    ])
+
+    return grid
+
+
+def test_path_goes_around_blocking_tiles():
+
+    pathfinder = Pathfinder(create_grid())
+    path = pathfinder.find_path([1, 1], [1, 5])
+
+    assert path[0] == [1, 1]
+    assert path[-1] == [1, 5]
+    assert [5, 3] in path
+    assert len(path) == 13
+
+
+def test_costs_make_paths_avoid_tiles():
+
+    grid = core.RectangleGrid(rows = 3, columns = 3)
+    grid.build_overlays([{"Name": "swamp", "Positions": [[2, 2]]}])
+
+    assert Pathfinder(grid, {}).find_path([2, 1], [2, 3]) == [[2, 1], [2, 2], [2, 3]]
+    assert [2, 2] not in Pathfinder(grid, {"swamp": 5}).find_path([2, 1], [2, 3])
+
+
+@pytest.mark.parametrize("origin, target", [([0, 1], [1, 1]), ([1, 1], [9, 9]), ([1, 1], [2, 3])])
+def test_no_path_outside_of_board_or_into_blocking_tile(origin, target):
+
+    pathfinder = Pathfinder(create_grid())
+
+    assert pathfinder.find_path(origin, target) == None
+    assert pathfinder.follow_flow_field(origin, target) == None
+
+
+def test_flow_field_follows_the_cheapest_path():
+
+    grid = create_grid()
+    pathfinder = Pathfinder(grid, {"block": None, "swamp": 4})
+
+    path = pathfinder.follow_flow_field([3, 1], [1, 5])
+    distances = pathfinder.get_distance_field([1, 5])
+
+    # paths of the same cost may differ, entering a tile costs the cost of the tile
+    def get_path_cost(path):
+        return sum(pathfinder.get_cost(grid.get_index(*step)) for step in path[1:])
+
+    assert path[0] == [3, 1]
+    assert path[-1] == [1, 5]
+    assert get_path_cost(path) == get_path_cost(pathfinder.find_path([3, 1], [1, 5]))
+    assert distances[grid.get_index(3, 1)] == get_path_cost(path)
+    assert pathfinder.get_flow_field([1, 5])[grid.get_index(1, 5)] == -1
+
+
+def test_fields_of_goal_outside_of_board():
+
+    pathfinder = Pathfinder(create_grid())
+
+    with pytest.raises(ValueError):
+        pathfinder.get_fields([6, 1])
+
+
+def test_fields_are_cached_until_a_cost_overlay_changes():
+
+    grid = create_grid()
+    pathfinder = Pathfinder(grid)
+
+    fields = pathfinder.get_fields([5, 5])
+    assert pathfinder.get_fields([5, 5]) is fields
+
+    grid.overlay_index.add_positions("block", [grid.get_index(5, 3)])
+    assert pathfinder.get_fields([5, 5]) is not fields
+    assert pathfinder.get_distance_field([5, 5])[grid.get_index(1, 1)] == INFINITE
+    assert pathfinder.follow_flow_field([1, 1], [5, 5]) == None
+
+
+def test_distances_up_to_a_maximum():
+
+    grid = core.RectangleGrid(rows = 5, columns = 5)
+    distances = Pathfinder(grid).get_distances([3, 3], 2)
+
+    assert len(distances) == 13
+    assert max(distances.values()) == 2
+    assert Pathfinder(grid).get_distances([0, 0]) == {}
+
+
+@pytest.mark.parametrize("cost", [float("inf"), float("nan")])
+def test_reachable_with_a_cost_that_is_not_finite(cost):
+
+    pathfinder = Pathfinder(create_grid(), {"block": None, "swamp": cost})
+    reachable = pathfinder.get_reachable([1, 1], 3)
+
+    assert reachable == set(pathfinder.get_distances([1, 1], 3))
+    assert create_grid().get_index(1, 4) not in reachable
+    assert create_grid().get_index(2, 2) in reachable
+
+    assert pathfinder.get_reachable([1, 1], float("inf")) == set(pathfinder.get_distances([1, 1]))
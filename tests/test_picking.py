@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from PyQt5 import QtCore
+
+from pyqtgameboards.gameboard import QHexagonboard, QRectangleboard
+
+from conftest import delete_board
+
+
+BOARDS = [
+    (QHexagonboard, True),
+    (QHexagonboard, False),
+    (QRectangleboard, True),
+]
+
+
+@pytest.fixture(params = BOARDS, ids = ["hexagon", "vertical hexagon", "rectangle"])
+def board(request, app):
+
+    board_class, horizontal = request.param
+    board = board_class(rows = 7, columns = 9, size = 4, horizontal = horizontal)
+    yield board
+    delete_board(board)
+
+
+def contains(item, point):
+
+    # the shape of an item includes the width of its pen, the tile is the polygon or rect itself
+    point = item.mapFromScene(point)
+
+    if hasattr(item, "polygon"):
+        return item.polygon().containsPoint(point, QtCore.Qt.OddEvenFill)
+
+    return item.rect().contains(point)
+
+
+def test_tile_centers(board):
+
+    for row in range(1, board.rows + 1):
+        for column in range(1, board.columns + 1):
+            center = board.get_shape_rect(row, column).center()
+            assert board.get_grid_location_at(center) == [row, column]
+
+
+def test_outside_of_board(board):
+
+    rect = board.get_area_rect(1, board.rows, 1, board.columns)
+
+    assert board.get_tile_at(rect.topLeft() - QtCore.QPointF(10, 10)) == None
+    assert board.get_tile_at(rect.bottomRight() + QtCore.QPointF(10, 10)) == None
+
+
+def test_same_tile_as_the_scene(board):
+
+    # the analytic conversion picks the item whose shape contains the point
+    rect = board.get_area_rect(1, board.rows, 1, board.columns)
+    generator = random.Random(3)
+
+    for _ in range(500):
+        point = QtCore.QPointF(generator.uniform(rect.left(), rect.right()), generator.uniform(rect.top(), rect.bottom()))
+        items = [item for item in board.scene.items(point) if contains(item, point)]
+
+        # points on the edge of two tiles may go either way
+        if len(items) != 1:
+            continue
+
+        assert board.get_tile_at(point) is items[0]
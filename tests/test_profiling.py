@@ -0,0 +1,76 @@
+from PyQt5 import QtWidgets
+
+from pyqtgameboards import profiling
+from pyqtgameboards.gameboard import QHexagonboard
+
+from conftest import click, delete_board
+
+
+def paint(board):
+
+    board.resize(400, 300)
+    board.show()
+    board.viewport().update()
+    QtWidgets.QApplication.processEvents()
+
+
+def test_phases_and_frames_are_timed(app):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4, batched = True)
+    stats = board.enable_profiling()
+
+    click(board, 2, 2)
+    click(board, 4, 4)
+    paint(board)
+
+    assert stats.phases["selection_new"].calls == 1
+    assert stats.phases["target_new"].calls == 1
+    assert stats.phases["flush_repaints"].calls >= 2
+    assert stats.frames >= 1
+    assert sum(stats.repainted_tiles_per_frame) > 0
+
+    delete_board(board)
+
+
+def test_disabled_board_runs_untimed(app):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4, batched = True)
+    stats = board.enable_profiling()
+    board.disable_profiling()
+
+    # the timed methods and the event filter are gone, painting is not overridden at all
+    assert all(name not in board.__dict__ for name in profiling.PHASES)
+    assert all("paintEvent" not in vars(board_class) for board_class in type(board).__mro__ if board_class.__module__ == "pyqtgameboards.gameboard")
+
+    click(board, 2, 2)
+    paint(board)
+
+    assert stats.frames == 0
+    assert len(stats.phases) == 0
+
+    delete_board(board)
+
+
+def test_stats_are_reported(app):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4, chunked = True)
+    board.resize(400, 300)
+    board.update_chunks()
+    board.enable_profiling(interval = 10)
+
+    reports = []
+    board.stats_updated.connect(reports.append)
+    board.profiler.report()
+
+    assert reports[0].chunks > 0
+    assert reports[0].scene_items == reports[0].chunks
+    assert "frame" in str(reports[0])
+
+    delete_board(board)
+
+
+def test_only_the_profiler_filters_events():
+
+    # the stats are plain data, the frames are timed by the event filter of the profiler
+    assert not hasattr(profiling.BoardStats, "eventFilter")
+    assert "eventFilter" in vars(profiling.BoardProfiler)
@@ -0,0 +1,54 @@
+import pytest
+
+from PyQt5 import QtGui
+
+from pyqtgameboards.gameboard import QHexagonboard
+
+from conftest import delete_board
+
+
+@pytest.fixture(params = [False, True], ids = ["per item", "batched"])
+def board(request, app):
+
+    board = QHexagonboard(rows = 4, columns = 4, size = 4, batched = request.param)
+    yield board
+    delete_board(board)
+
+
+def test_repaints_wait_for_the_flush(board):
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+    tile = board.get_tile(2, 2)
+    brush = board.get_tile_brush(board.get_tile_index(tile))
+
+    board.paint_graphic_item(tile, brush = red)
+
+    assert board.repaint_timer.isActive()
+    assert board.get_tile_brush(board.get_tile_index(tile)) == brush
+
+    board.flush_repaints()
+
+    assert not board.repaint_timer.isActive()
+    assert board.get_tile_brush(board.get_tile_index(tile)) == red
+    assert board.pending_repaints == {}
+
+
+def test_last_repaint_of_a_tile_wins(board):
+
+    red = QtGui.QBrush(QtGui.QColor(255,0,0))
+    blue = QtGui.QBrush(QtGui.QColor(0,0,255))
+    pen = QtGui.QPen(QtGui.QColor(0,255,0), 3)
+    tile = board.get_tile(3, 1)
+
+    board.paint_graphic_item(tile, brush = red)
+    board.paint_graphic_item(tile, pen = pen)
+    board.paint_graphic_item(tile, brush = blue)
+
+    assert board.coalesced_repaint_count == 2
+    assert len(board.pending_repaints) == 1
+
+    repaint_count = board.repaint_count
+    board.flush_repaints()
+
+    assert board.repaint_count == repaint_count + 1
+    assert board.get_tile_brush(board.get_tile_index(tile)) == blue
@@ -0,0 +1,92 @@
+import time
+
+from PyQt5 import QtGui
+
+from pyqtgameboards.gameboard import QRectangleboard
+from pyqtgameboards.units import QUnitLayer
+
+from conftest import delete_board
+
+
+def advance(units, steps):
+
+    # the next frame comes the time of a number of steps after the last one
+    units.last_tick = time.perf_counter() - steps / units.speed
+    units.animate()
+
+
+def test_units_share_pixmaps(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, batched = True)
+    units = QUnitLayer(board)
+
+    first = units.add_unit(1, 1, QtGui.QColor(255,0,0))
+    second = units.add_unit(1, 1, QtGui.QColor(255,0,0))
+    third = units.add_unit(2, 2, QtGui.QColor(0,0,255))
+
+    assert first.pixmap.cacheKey() == second.pixmap.cacheKey()
+    assert third.pixmap.cacheKey() != first.pixmap.cacheKey()
+    assert units.get_units_at(1, 1) == [first, second]
+
+    units.remove_unit(first)
+    assert units.get_units_at(1, 1) == [second]
+
+    delete_board(board)
+
+
+def test_unit_follows_its_path(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, batched = True)
+    units = QUnitLayer(board)
+    unit = units.add_unit(1, 1)
+
+    moved = []
+    arrived = []
+    units.unit_moved.connect(lambda unit: moved.append([unit.row, unit.column]))
+    units.unit_arrived.connect(arrived.append)
+
+    units.move_unit(unit, [[1, 1], [1, 2], [1, 3], [2, 3]])
+    assert units.animation_timer.isActive()
+
+    # half way to the next tile
+    advance(units, 0.5)
+    start, end = units.get_center(1, 1), units.get_center(1, 2)
+    assert abs(unit.x - (start.x() + end.x()) / 2) < 1
+    assert units.get_units_at(1, 1) == [unit]
+
+    # two tiles in one frame are reported once
+    advance(units, 2)
+    assert [unit.row, unit.column] == [1, 3]
+    assert moved == [[1, 3]]
+
+    advance(units, 1)
+    assert arrived == [unit]
+    assert unit.is_moving() == False
+    assert (unit.x, unit.y) == (units.get_center(2, 3).x(), units.get_center(2, 3).y())
+    assert units.animation_timer.isActive() == False
+
+    delete_board(board)
+
+
+def test_slots_can_move_other_units(app):
+
+    board = QRectangleboard(rows = 5, columns = 5, size = 4, batched = True)
+    units = QUnitLayer(board)
+    scout = units.add_unit(1, 1)
+    knight = units.add_unit(5, 5)
+
+    # the knight follows when the scout enters a tile, and again when it arrives
+    units.unit_moved.connect(lambda unit: units.move_unit_to(knight, 3, 5) if unit is scout else None)
+    units.unit_arrived.connect(lambda unit: units.move_unit_to(scout, 1, 1) if unit is scout else None)
+
+    units.move_unit(scout, [[1, 2]])
+    advance(units, 1)
+
+    assert [scout.row, scout.column] == [1, 2]
+    assert units.moving_units == {scout, knight}
+
+    advance(units, 1)
+    assert [knight.row, knight.column] == [4, 5]
+    assert [scout.row, scout.column] == [1, 1]
+
+    delete_board(board)
@@ -0,0 +1,91 @@
+import gc
+import weakref
+
+import pytest
+
+from PyQt5 import QtWidgets
+
+from pyqtgameboards import core
+from pyqtgameboards.gameboard import QHexagonboard, DETAIL_FILL, DETAIL_FULL
+
+from conftest import click, delete_board
+
+
+def zoom(board, factor):
+
+    board.scale(factor, factor)
+    board.update_detail_level()
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_views_share_overlays_and_selection(app, batched):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4, batched = batched, overlays = [{"Name": "enemy", "Brush": "", "Pen": "", "Positions": []}])
+    view = board.create_view()
+
+    assert list(board.views) == [board, view]
+    assert view.overlay_index is board.overlay_index
+
+    view.add_overlay_positions("enemy", [[2, 2]])
+    assert board.model.get_index(2, 2) in board.overlay_index.get_indices(["enemy"])
+
+    # the state of a tile combines the selections of all views
+    click(board, 1, 1)
+    click(view, 3, 3)
+    assert board.model.state[board.model.get_index(1, 1)] & core.SELECTED
+    assert board.model.state[board.model.get_index(3, 3)] & core.SELECTED
+
+    delete_board(view)
+    delete_board(board)
+
+
+def test_deleted_view_is_removed_with_its_selection(app):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4)
+    view = board.create_view()
+    click(view, 3, 3)
+
+    delete_board(view)
+
+    assert list(board.views) == [board]
+    assert board.model.state[board.model.get_index(3, 3)] & core.SELECTED == 0
+
+    delete_board(board)
+
+
+def test_unused_view_is_collected(app):
+
+    board = QHexagonboard(rows = 6, columns = 6, size = 4, chunked = True)
+    view = board.create_view()
+    click(view, 3, 3)
+
+    reference = weakref.ref(view)
+    del view
+    gc.collect()
+    QtWidgets.QApplication.sendPostedEvents()
+
+    assert reference() == None
+    assert list(board.views) == [board]
+    assert board.model.state[board.model.get_index(3, 3)] & core.SELECTED == 0
+
+    delete_board(board)
+
+
+def test_per_item_tiles_follow_the_most_detailed_view(app):
+
+    board = QHexagonboard(rows = 5, columns = 5, size = 4)
+    zoom(board, 0.04)
+    assert board.item_detail_level == DETAIL_FILL
+
+    view = board.create_view()
+    zoom(view, 1)
+    assert board.item_detail_level == DETAIL_FULL
+
+    zoom(view, 0.04)
+    assert board.item_detail_level == DETAIL_FILL
+
+    zoom(view, 25)
+    delete_board(view)
+    assert board.item_detail_level == DETAIL_FILL
+
+    delete_board(board)